@@ -0,0 +1,217 @@
+"""
+Application Writer Agent
+Role: Produce the customized CV and the cover letter for one application, either as two calls
+(sequential or concurrent) or as one combined call that sends the profile and job analysis only once.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+from agents.cover_letter_generator import CoverLetterGenerator
+from agents.cv_customizer import CVCustomizer
+from utils.deepseek_client import DeepSeekClient
+from utils.stage_timer import StageTimer
+
+GENERATION_MODES = ("sequential", "parallel", "combined")
+
+
+class ApplicationWriter:
+    """
+    Generates both application documents with a configurable call strategy.
+
+    Modes:
+        sequential: CVCustomizer, then CoverLetterGenerator (two calls, one after the other)
+        parallel:   the same two calls issued concurrently
+        combined:   one structured call returning {"cv": {...}, "cover_letter": "..."}
+    """
+
+    def __init__(
+        self,
+        cv_customizer: CVCustomizer,
+        cover_letter_generator: CoverLetterGenerator,
+        client: Optional[DeepSeekClient] = None,
+        mode: Optional[str] = None,
+        stream_cover_letter: Optional[bool] = None
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            cv_customizer: Agent used in the two-call modes (and as a fallback)
+            cover_letter_generator: Agent used in the two-call modes (and as a fallback)
+            client: LLM client for the combined call (required for 'combined')
+            mode: 'sequential', 'parallel' or 'combined' (default: APPLICATION_MODE or 'sequential')
+            stream_cover_letter: Stream a single cover letter straight into the caller's
+                                 document sink (default: COVER_LETTER_STREAM or false)
+        """
+        self.cv_customizer = cv_customizer
+        self.cover_letter_generator = cover_letter_generator
+        self.client = client
+        self.mode = (mode or os.getenv("APPLICATION_MODE", "sequential")).lower()
+        if self.mode not in GENERATION_MODES:
+            raise ValueError(f"Unknown application mode '{self.mode}' (expected one of {', '.join(GENERATION_MODES)})")
+        if self.mode == "combined" and client is None:
+            raise ValueError("The combined application mode needs an LLM client")
+        if stream_cover_letter is None:
+            stream_cover_letter = os.getenv("COVER_LETTER_STREAM", "false").lower() in ("1", "true", "yes")
+        self.stream_cover_letter = stream_cover_letter
+        self.system_instruction = """
+        You are an expert Career Coach, Professional Resume Writer and Copywriter.
+        You tailor CVs for ATS compliance using the STAR method and write compelling, personalized cover letters
+        that avoid generic clichés.
+        Return raw JSON only.
+        """
+
+    @classmethod
+    def from_router(
+        cls,
+        router: Any,
+        cv_customizer: CVCustomizer,
+        cover_letter_generator: CoverLetterGenerator,
+        mode: Optional[str] = None,
+        stream_cover_letter: Optional[bool] = None
+    ) -> "ApplicationWriter":
+        """Build a writer whose combined-call client (if needed) comes from the 'application_writer' route."""
+        mode = (mode or os.getenv("APPLICATION_MODE", "sequential")).lower()
+        client = router.get_client("application_writer") if mode == "combined" else None
+        return cls(cv_customizer, cover_letter_generator, client=client, mode=mode,
+                   stream_cover_letter=stream_cover_letter)
+
+    def generate(
+        self,
+        profile: Dict[str, Any],
+        job_analysis: Dict[str, Any],
+        relevant_snippets: List[Dict[str, Any]] = None,
+        timer: Optional[StageTimer] = None,
+        cover_letter_sink: Optional[Callable[[Iterator[str]], str]] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Generate the customized CV and the cover letter body (or bodies).
+
+        Args:
+            profile: Candidate's master profile
+            job_analysis: Analyzed job requirements
+            relevant_snippets: (Optional) High-relevance snippets retrieved via RAG
+            timer: Optional stage timer ('customize' and 'cover_letter' stages in
+                   sequential mode, a single 'generate' stage otherwise)
+            cover_letter_sink: Optional renderer for the first letter, e.g.
+                               DocumentBuilder.create_cover_letter_streaming bound to a
+                               path; it receives the streamed deltas when streaming is on
+                               (single variant, two-call modes), the finished text otherwise
+
+        Returns:
+            (customized CV dictionary, cover letter variants); one variant unless the
+            cover letter generator is configured for more (COVER_LETTER_VARIANTS)
+        """
+        def stage(name: str):
+            return timer.stage(name) if timer is not None else nullcontext()
+
+        def write_letters() -> List[str]:
+            if cover_letter_sink is not None and self.stream_cover_letter and self.cover_letter_generator.variants == 1:
+                # Paragraphs are rendered while the letter is still being generated
+                return [cover_letter_sink(self.cover_letter_generator.generate_stream(profile, job_analysis))]
+            cover_letters = self.cover_letter_generator.generate_variants(profile, job_analysis)
+            if cover_letter_sink is not None:
+                cover_letter_sink(iter([cover_letters[0]]))
+            return cover_letters
+
+        if self.mode == "sequential":
+            with stage("customize"):
+                customized_cv = self.cv_customizer.customize(profile, job_analysis, relevant_snippets)
+            with stage("cover_letter"):
+                cover_letters = write_letters()
+            return customized_cv, cover_letters
+
+        with stage("generate"):
+            if self.mode == "parallel":
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    cv_future = pool.submit(self.cv_customizer.customize, profile, job_analysis, relevant_snippets)
+                    letter_future = pool.submit(write_letters)
+                    return cv_future.result(), letter_future.result()
+            customized_cv, cover_letter = self.generate_combined(profile, job_analysis, relevant_snippets)
+            cover_letters = [cover_letter]
+            extra = self.cover_letter_generator.variants - 1
+            if extra > 0:
+                # The combined call yields one letter; further variants share one n-completion request
+                cover_letters += self.cover_letter_generator.generate_variants(profile, job_analysis, extra)
+            if cover_letter_sink is not None:
+                cover_letter_sink(iter([cover_letter]))
+            return customized_cv, cover_letters
+
+    def generate_combined(
+        self,
+        profile: Dict[str, Any],
+        job_analysis: Dict[str, Any],
+        relevant_snippets: List[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Generate both documents in one call.
+
+        A part missing from the response is regenerated with its own agent.
+
+        Returns:
+            (customized CV dictionary, cover letter text)
+        """
+        print("📝 Writing tailored CV and cover letter in one call...")
+
+        rag_context = ""
+        if relevant_snippets:
+            rag_context = "\nPRIORITY CONTEXT (Top Relevant Experience):\n" + json.dumps(relevant_snippets, indent=2)
+
+        # Instructions and profile first, job analysis last (cacheable prefix)
+        prompt = f"""
+        COMBINED APPLICATION
+        Produce BOTH a tailored CV and a cover letter body for the job described at the end of this message.
+
+        CV TASK:
+        1. Rewrite the "Professional Summary" for THIS job (2-3 sentences only, no repetition).
+        2. Reorder and filter "Core Skills" to prioritize the job's "must_have_skills". Remove duplicates.
+        3. Select ONLY the top 3-4 most relevant "Work Experience" entries.
+        4. For each selected role keep the 3-4 most impactful achievements, rewritten with job keywords
+           and the STAR method (Situation, Task, Action, Result).
+        5. Include ALL education entries, each only once.
+        6. Do NOT invent experiences. Only reframe existing ones.
+
+        COVER LETTER TASK:
+        Paragraph 1 (Opening): Strong hook + excitement about the specific role/company.
+        Paragraph 2 (The Match): Connect the company's mission/needs to the candidate's background.
+        Paragraph 3 (The Proof): The most relevant achievement from the profile, with metrics.
+        Paragraph 4 (Closing): Call to action, availability, and professional sign-off.
+        250-350 words, professional and confident, body only (no addresses), paragraphs separated by a blank line.
+
+        OUTPUT FORMAT (JSON):
+        {{
+            "cv": {{
+                "personal_info": {{ ...keep original... }},
+                "summary": "Tailored summary...",
+                "skills": {{"Technical": ["..."], "Soft Skills": ["..."]}},
+                "experience": [
+                    {{"company": "...", "title": "...", "dates": "...", "achievements": ["..."]}}
+                ],
+                "education": [ ...keep original... ]
+            }},
+            "cover_letter": "Paragraph 1...\\n\\nParagraph 2..."
+        }}
+
+        CANDIDATE BASE PROFILE:
+        {json.dumps(profile, indent=2)}
+        {rag_context}
+
+        JOB ANALYSIS:
+        {json.dumps(job_analysis, indent=2)}
+        """
+
+        result = self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.6)
+        customized_cv = result.get('cv') if isinstance(result, dict) else None
+        cover_letter = result.get('cover_letter') if isinstance(result, dict) else None
+
+        if not isinstance(customized_cv, dict) or not isinstance(customized_cv.get('experience'), list):
+            print("⚠️ Combined response had no usable CV; generating it separately.")
+            customized_cv = self.cv_customizer.customize(profile, job_analysis, relevant_snippets)
+        if not isinstance(cover_letter, str) or not cover_letter.strip():
+            print("⚠️ Combined response had no cover letter; generating it separately.")
+            cover_letter = self.cover_letter_generator.generate(profile, job_analysis)
+        return customized_cv, cover_letter
@@ -0,0 +1,287 @@
+"""
+ATS Optimizer Agent
+Role: Lift the match score of a customized CV by re-prompting only its weakest sections with small,
+targeted prompts, re-scoring locally after each round until a target score or iteration cap is reached.
+"""
+
+import copy
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from utils.deepseek_client import DeepSeekClient
+from utils.match_calculator import MatchCalculator
+from utils.profile_index import ProfileIndex
+
+# Words of profile text and job terms ("node.js", "c++", "ci/cd" stay whole)
+_WORD = re.compile(r"[\w+#./-]+")
+_WORD_EDGES = ".,;:/-"
+
+
+class ATSOptimizer:
+    """
+    Closed-loop optimizer that runs after CVCustomizer.customize().
+
+    Each round computes the missing job terms locally, picks the sections where the
+    master profile actually supports those terms (skills list, one experience entry,
+    or the summary), rewrites just those sections, and keeps the result only if the
+    score does not drop.
+    """
+
+    def __init__(
+        self,
+        client: DeepSeekClient,
+        match_calculator: Optional[MatchCalculator] = None,
+        target_score: Optional[float] = None,
+        max_iterations: Optional[int] = None,
+        sections_per_iteration: int = 2
+    ):
+        """
+        Initialize the optimizer.
+
+        Args:
+            client: LLM client for the targeted rewrites
+            match_calculator: Scoring engine (shared with the rest of the pipeline)
+            target_score: Stop once the CV reaches this overall score (default: ATS_TARGET_SCORE or 80)
+            max_iterations: Maximum rewrite rounds (default: ATS_MAX_ITERATIONS or 2)
+            sections_per_iteration: Sections rewritten (concurrently) per round
+        """
+        self.client = client
+        self.match_calculator = match_calculator or MatchCalculator()
+        self.target_score = target_score if target_score is not None else float(os.getenv("ATS_TARGET_SCORE", "80"))
+        self.max_iterations = max_iterations if max_iterations is not None else int(os.getenv("ATS_MAX_ITERATIONS", "2"))
+        self.sections_per_iteration = sections_per_iteration
+        self.system_instruction = """
+        You are an expert Resume Writer specializing in ATS optimization.
+        You make minimal, truthful edits to one CV section at a time.
+        Return raw JSON only.
+        """
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether the optimization loop is switched on (ATS_OPTIMIZE=true)."""
+        return os.getenv("ATS_OPTIMIZE", "false").lower() in ("1", "true", "yes")
+
+    def optimize(
+        self,
+        customized_cv: Dict[str, Any],
+        job_analysis: Dict[str, Any],
+        profile: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Improve a customized CV until it reaches the target score or the iteration cap.
+
+        Args:
+            customized_cv: Output of CVCustomizer.customize
+            job_analysis: Analyzed job requirements
+            profile: Master profile, used as evidence for which terms may be added
+                     (defaults to the CV itself)
+
+        Returns:
+            (optimized CV, report with initial/final scores and per-round details)
+        """
+        cv = copy.deepcopy(customized_cv)
+        evidence_profile = profile or customized_cv
+        score = self.match_calculator.calculate_match_score(cv, job_analysis)['overall_score']
+        report: Dict[str, Any] = {
+            'initial_score': score,
+            'final_score': score,
+            'target_score': self.target_score,
+            'iterations': [],
+            'llm_calls': 0
+        }
+
+        for iteration in range(1, self.max_iterations + 1):
+            if score >= self.target_score:
+                break
+
+            missing = self.match_calculator.missing_terms(cv, job_analysis)
+            targets = self._select_sections(cv, missing, evidence_profile)
+            if not targets:
+                print("ℹ️  ATS: No remaining keywords are supported by the profile; stopping.")
+                break
+
+            print(f"🔁 ATS round {iteration}: score {score} < {self.target_score}, "
+                  f"rewriting {', '.join(self._label(target) for target in targets)}...")
+            candidate = copy.deepcopy(cv)
+            with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+                rewrites = list(pool.map(lambda target: self._rewrite(candidate, target, evidence_profile), targets))
+            report['llm_calls'] += len(targets)
+
+            for target, rewrite in zip(targets, rewrites):
+                if rewrite is not None:
+                    self._apply(candidate, target, rewrite)
+
+            new_score = self.match_calculator.calculate_match_score(candidate, job_analysis)['overall_score']
+            # Only an improvement is kept: an unchanged score would pick the same targets again
+            accepted = new_score > score
+            report['iterations'].append({
+                'iteration': iteration,
+                'sections': [self._label(target) for target in targets],
+                'score_before': score,
+                'score_after': new_score,
+                'accepted': accepted
+            })
+            if not accepted:
+                print(f"⚠️  ATS round {iteration} did not improve the score ({score} → {new_score}); keeping previous version.")
+                break
+            cv, score = candidate, new_score
+
+        report['final_score'] = score
+        print(f"✅ ATS optimization: {report['initial_score']} → {score} ({report['llm_calls']} targeted calls)")
+        return cv, report
+
+    def _select_sections(
+        self,
+        cv: Dict[str, Any],
+        missing: Dict[str, List[str]],
+        profile: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank sections by how many missing terms the master profile supports there.
+
+        Returns:
+            Up to sections_per_iteration targets: {'kind', 'index', 'terms'}
+        """
+        missing_skills = missing['required'] + missing['nice_to_have']
+        all_missing = list(dict.fromkeys(missing_skills + missing['keywords']))
+        profile_index = ProfileIndex.for_profile(profile)
+        profile_words = self._text_words(profile)
+
+        candidates = []
+
+        # Skills list: missing skills the candidate demonstrably has
+        skill_terms = [
+            term for term in missing_skills
+            if profile_index.skills_index.matches(term, self.match_calculator.similarity_threshold)
+            or self._has_words(term, profile_words)
+        ]
+        if skill_terms:
+            candidates.append({'kind': 'skills', 'index': None, 'terms': skill_terms})
+
+        # Experience entries: missing terms present in the matching master-profile role
+        master_roles = {
+            ProfileIndex.experience_key(role): role for role in profile.get('experience', []) or []
+        }
+        for i, role in enumerate(cv.get('experience', []) or []):
+            source = master_roles.get(ProfileIndex.experience_key(role), role)
+            role_words = self._text_words(ProfileIndex._role_items(source) + ProfileIndex._role_items(role))
+            terms = [term for term in all_missing if self._has_words(term, role_words)]
+            if terms:
+                candidates.append({'kind': 'experience', 'index': i, 'terms': terms})
+
+        # Summary: keywords supported anywhere in the profile
+        summary_terms = [term for term in missing['keywords'] if self._has_words(term, profile_words)]
+        if summary_terms:
+            candidates.append({'kind': 'summary', 'index': None, 'terms': summary_terms})
+
+        candidates.sort(key=lambda target: len(target['terms']), reverse=True)
+        return candidates[:self.sections_per_iteration]
+
+    @staticmethod
+    def _words(text: str) -> List[str]:
+        """Lower-cased words of a text, without surrounding punctuation."""
+        words = (word.strip(_WORD_EDGES) for word in _WORD.findall(text.lower()))
+        return [word for word in words if word]
+
+    @classmethod
+    def _text_words(cls, value: Any) -> Set[str]:
+        """Words of every string value (never the keys) in a profile fragment."""
+        words: Set[str] = set()
+        stack = [value]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                words.update(cls._words(item))
+            elif isinstance(item, dict):
+                stack.extend(item.values())
+            elif isinstance(item, list):
+                stack.extend(item)
+        return words
+
+    @classmethod
+    def _has_words(cls, term: str, words: Set[str]) -> bool:
+        """Whether every word of a term occurs as a whole word ("go" is not found in "google")."""
+        term_words = cls._words(term)
+        return bool(term_words) and all(word in words for word in term_words)
+
+    def _rewrite(
+        self,
+        cv: Dict[str, Any],
+        target: Dict[str, Any],
+        profile: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Send one small targeted prompt for a section; None if the response is unusable."""
+        kind = target['kind']
+        if kind == 'experience':
+            role = cv['experience'][target['index']]
+            master_roles = {ProfileIndex.experience_key(r): r for r in profile.get('experience', []) or []}
+            source = master_roles.get(ProfileIndex.experience_key(role), role)
+            current = {"title": role.get('title', ''), "company": role.get('company', ''),
+                       "achievements": role.get('achievements', [])}
+            source_material = {"achievements": ProfileIndex._role_items(source)}
+            output_format = '{"achievements": ["..."]}'
+        elif kind == 'skills':
+            current = cv.get('skills', {})
+            source_material = {"skills": profile.get('skills', {})}
+            output_format = '{"skills": {"Category": ["..."]}}'
+        else:
+            current = {"summary": cv.get('summary', '')}
+            source_material = {"summary": profile.get('summary', ''), "skills": profile.get('skills', {})}
+            output_format = '{"summary": "..."}'
+
+        # Instructions first, section-specific data last (cacheable prefix)
+        prompt = f"""
+        TARGETED SECTION REWRITE
+        Rewrite ONE section of a tailored CV so it covers the missing job keywords listed at the end.
+
+        RULES:
+        1. Only work in keywords that the SOURCE MATERIAL supports. Never invent experience, tools or metrics.
+        2. Keep the same facts, tone and roughly the same length.
+        3. Use the exact keyword spelling given.
+        4. Return raw JSON only in this format: {output_format}
+
+        SECTION TYPE: {kind}
+
+        SOURCE MATERIAL:
+        {json.dumps(source_material, indent=2, ensure_ascii=False)}
+
+        CURRENT SECTION:
+        {json.dumps(current, indent=2, ensure_ascii=False)}
+
+        MISSING KEYWORDS:
+        {json.dumps(target['terms'], ensure_ascii=False)}
+        """
+
+        try:
+            result = self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.3)
+        except Exception as e:
+            print(f"⚠️ ATS rewrite of {self._label(target)} failed: {e}")
+            return None
+        if not isinstance(result, dict):
+            return None
+        if kind == 'experience' and isinstance(result.get('achievements'), list) and result['achievements']:
+            return result
+        if kind == 'skills' and isinstance(result.get('skills'), (dict, list)) and result['skills']:
+            return result
+        if kind == 'summary' and isinstance(result.get('summary'), str) and result['summary'].strip():
+            return result
+        return None
+
+    @staticmethod
+    def _apply(cv: Dict[str, Any], target: Dict[str, Any], rewrite: Dict[str, Any]) -> None:
+        """Write a validated rewrite back into the CV."""
+        if target['kind'] == 'experience':
+            cv['experience'][target['index']]['achievements'] = rewrite['achievements']
+        elif target['kind'] == 'skills':
+            cv['skills'] = rewrite['skills']
+        else:
+            cv['summary'] = rewrite['summary']
+
+    @staticmethod
+    def _label(target: Dict[str, Any]) -> str:
+        if target['kind'] == 'experience':
+            return f"experience[{target['index']}]"
+        return target['kind']
@@ -4,7 +4,8 @@ Role: Generate personalized, compelling cover letters matching the job and candi
 """
 
 import json
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Iterator, List, Optional
 from utils.deepseek_client import DeepSeekClient
 
 class CoverLetterGenerator:
@@ -12,8 +13,19 @@ class CoverLetterGenerator:
     Agent responsible for writing cover letters.
     """
     
-    def __init__(self, client: DeepSeekClient):
+    def __init__(self, client: DeepSeekClient, variants: Optional[int] = None):
+        """
+        Initialize the generator.
+
+        Args:
+            client: LLM client for the cover_letter_generator route
+            variants: Letters produced per application by generate_variants()
+                      (default: COVER_LETTER_VARIANTS or 1)
+        """
         self.client = client
+        self.variants = variants if variants is not None else int(os.getenv("COVER_LETTER_VARIANTS", "1"))
+        if self.variants < 1:
+            raise ValueError("The number of cover letter variants must be at least 1")
         self.system_instruction = """
         You are an expert Career Coach and Copywriter specializing in cover letters.
         Your goal is to write compelling, personalized letters that connect the candidate's unique value to the company's needs.
@@ -33,15 +45,68 @@ class CoverLetterGenerator:
             The body of the cover letter text.
         """
         print("✍️  Writing cover letter...")
-        
-        prompt = f"""
-        Create a compelling cover letter for this job application.
 
-        CANDIDATE PROFILE:
-        {json.dumps(profile, indent=2)}
+        # Temperature 0.7 for creativity/personality
+        return self.client.generate_content(
+            self._build_prompt(profile, job_analysis), 
+            system_instruction=self.system_instruction, 
+            config={"temperature": 0.7}
+        )
 
-        JOB ANALYSIS:
-        {json.dumps(job_analysis, indent=2)}
+    def generate_stream(self, profile: Dict[str, Any], job_analysis: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream a cover letter as it is generated.
+
+        Args:
+            profile: Candidate's master profile
+            job_analysis: Analyzed job requirements
+
+        Returns:
+            Iterator over text deltas of the letter body (see DocumentBuilder.create_cover_letter_streaming)
+        """
+        print("✍️  Streaming cover letter...")
+        return self.client.stream_content(
+            self._build_prompt(profile, job_analysis),
+            system_instruction=self.system_instruction,
+            config={"temperature": 0.7}
+        )
+
+    def generate_variants(
+        self,
+        profile: Dict[str, Any],
+        job_analysis: Dict[str, Any],
+        n: Optional[int] = None
+    ) -> List[str]:
+        """
+        Generate several alternative cover letters in one request (the prompt is processed once).
+
+        Args:
+            profile: Candidate's master profile
+            job_analysis: Analyzed job requirements
+            n: Number of variants (default: self.variants)
+
+        Returns:
+            Letter bodies; a single-item list (one plain call) when n is 1
+        """
+        n = n or self.variants
+        if n == 1:
+            return [self.generate(profile, job_analysis)]
+
+        print(f"✍️  Writing {n} cover letter variants...")
+        # Higher temperature so the variants actually differ
+        return self.client.generate_variants(
+            self._build_prompt(profile, job_analysis),
+            n,
+            system_instruction=self.system_instruction,
+            config={"temperature": 0.9}
+        )
+
+    def _build_prompt(self, profile: Dict[str, Any], job_analysis: Dict[str, Any]) -> str:
+        """Cover letter prompt shared by single and multi-variant generation."""
+        # Stable parts (instructions, rules, profile) first and the job analysis last,
+        # keeping the prompt prefix cacheable across applications.
+        return f"""
+        Create a compelling cover letter for the job application described at the end of this message.
 
         STRUCTURE:
         Paragraph 1 (Opening): Strong hook + excitement about the specific role/company.
@@ -55,11 +120,10 @@ class CoverLetterGenerator:
         3. Do NOT include placeholder addresses (header will be handled separately). Just the body.
         4. Use specific keywords from the job analysis.
         5. "Show, don't just tell" - use metrics from the profile.
-        """
 
-        # Temperature 0.7 for creativity/personality
-        return self.client.generate_content(
-            prompt, 
-            system_instruction=self.system_instruction, 
-            config={"temperature": 0.7}
-        )
+        CANDIDATE PROFILE:
+        {json.dumps(profile, indent=2)}
+
+        JOB ANALYSIS:
+        {json.dumps(job_analysis, indent=2)}
+        """
@@ -3,17 +3,61 @@ CV Customizer Agent
 Role: Tailor the master profile to match specific job requirements.
 """
 
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple
+from utils.bullet_cache import BulletRewriteCache
+from utils.cv_edit_script import ProfileCatalog, EditScriptError, unique_education
 from utils.deepseek_client import DeepSeekClient
+from utils.match_calculator import MatchCalculator
+from utils.profile_index import ProfileIndex, TermSet
+from utils.skill_taxonomy import get_taxonomy
 import json
+import os
+
+CUSTOMIZER_MODES = ("single", "parallel", "edits")
+
+# Bump whenever the bullet rewrite prompt changes so cached rewrites are not reused
+BULLET_PROMPT_VERSION = 1
 
 class CVCustomizer:
     """
     Agent responsible for rewriting CV content to target a specific job.
     """
 
-    def __init__(self, client: DeepSeekClient):
+    def __init__(
+        self,
+        client: DeepSeekClient,
+        mode: Optional[str] = None,
+        max_roles: int = 4,
+        max_bullets: int = 4,
+        match_calculator: Optional[MatchCalculator] = None,
+        bullet_cache: Optional[BulletRewriteCache] = None
+    ):
+        """
+        Initialize the customizer.
+
+        Args:
+            client: LLM client for the cv_customizer route
+            mode: 'single' (one call rewrites the whole CV), 'parallel' (roles selected
+                  locally, then summary, skills and each role rewritten by concurrent
+                  small calls) or 'edits' (one call returning only edit operations on
+                  ID-tagged profile elements); default CV_CUSTOMIZER_MODE or 'single'
+            max_roles: Roles kept in parallel mode
+            max_bullets: Bullets kept per role in parallel mode
+            match_calculator: Scoring engine used to rank roles locally
+            bullet_cache: Cache of bullet rewrites, used in parallel mode only
+                          (default: BULLET_CACHE_PATH, disabled when unset)
+        """
         self.client = client
+        self.mode = (mode or os.getenv("CV_CUSTOMIZER_MODE", "single")).lower()
+        if self.mode not in CUSTOMIZER_MODES:
+            raise ValueError(f"Unknown CV customizer mode '{self.mode}' (expected one of {', '.join(CUSTOMIZER_MODES)})")
+        self.max_roles = max_roles
+        self.max_bullets = max_bullets
+        self.match_calculator = match_calculator or MatchCalculator()
+        self.bullet_cache = bullet_cache if bullet_cache is not None else BulletRewriteCache.from_env()
+        if self.bullet_cache is not None and self.mode != "parallel":
+            print(f"⚠️  Bullet cache is only used with CV_CUSTOMIZER_MODE=parallel ('{self.mode}' rewrites the CV in one call).")
         self.system_instruction = """
         You are an expert Career Coach and Professional Resume Writer.
         Your goal is to rewrite candidate profiles to perfectly align with target job descriptions.
@@ -34,6 +78,20 @@ class CVCustomizer:
         Returns:
             Customized profile dictionary ready for document generation
         """
+        if self.mode == "parallel":
+            return self.customize_parallel(profile, job_analysis, relevant_snippets)
+        if self.mode == "edits":
+            return self.customize_edits(profile, job_analysis, relevant_snippets)
+        return self._customize_single(profile, job_analysis, relevant_snippets)
+
+    def _customize_single(
+        self,
+        profile: Dict[str, Any],
+        job_analysis: Dict[str, Any],
+        relevant_snippets: List[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """One call that re-emits the whole customized CV."""
+
         print("🎨 Customizing candidate profile using RAG contexts...")
         
         # Format snippets for prompt
@@ -41,15 +99,11 @@ class CVCustomizer:
         if relevant_snippets:
             rag_context = "\nPRIORITY CONTEXT (Top Relevant Experience):\n" + json.dumps(relevant_snippets, indent=2)
 
+        # Stable parts (instructions, rules, profile) form the prompt prefix so it is
+        # identical across applications and hits the provider's prefix cache; the
+        # per-job analysis and RAG context come last.
         prompt = f"""
-        Tailor this candidate's profile to match the job requirements perfectly.
-        {rag_context}
-
-        CANDIDATE BASE PROFILE:
-        {json.dumps(profile, indent=2)}
-
-        JOB ANALYSIS:
-        {json.dumps(job_analysis, indent=2)}
+        Tailor this candidate's profile to match the job requirements given at the end of this message.
 
         TASK:
         1. Rewrite the "Professional Summary" to highlight relevant experience for THIS job (2-3 sentences only, no repetition).
@@ -95,7 +149,343 @@ class CVCustomizer:
         6. NO DUPLICATES: If the same experience/education appears multiple times in input, include it only once.
         7. BE CONCISE: Summary should be 2-3 sentences, not repeating what's in experience section.
         8. FILTER WISELY: Only include experiences that are relevant to the job. Skip irrelevant ones.
+
+        CANDIDATE BASE PROFILE:
+        {json.dumps(profile, indent=2)}
+        {rag_context}
+
+        JOB ANALYSIS:
+        {json.dumps(job_analysis, indent=2)}
         """
 
         # Temperature 0.5 for a balance of creativity and adherence to facts
         return self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.5)
+
+
+    def customize_edits(
+        self,
+        profile: Dict[str, Any],
+        job_analysis: Dict[str, Any],
+        relevant_snippets: List[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Customize the profile from a compact edit script instead of a re-emitted CV.
+
+        Profile elements are tagged with stable IDs; the model only returns operations
+        (new summary, selected roles, skill order, selected and replaced bullets), and
+        the full CV is rebuilt locally. Unchanged content (personal info, education,
+        kept bullets) costs no output tokens.
+
+        Args:
+            profile: Candidates base profile
+            job_analysis: Structured analysis of the target job
+            relevant_snippets: (Optional) High-relevance snippets retrieved via RAG
+
+        Returns:
+            Customized profile dictionary in the same schema as customize(); falls back
+            to the single-call mode if the script references unknown IDs
+        """
+        print("🎨 Customizing candidate profile via edit script...")
+        catalog = ProfileCatalog(profile)
+
+        rag_context = ""
+        if relevant_snippets:
+            rag_context = "\nPRIORITY CONTEXT (Top Relevant Experience):\n" + json.dumps(
+                [snippet.get('content') for snippet in relevant_snippets], indent=2, ensure_ascii=False
+            )
+
+        prompt = f"""
+        CV EDIT SCRIPT
+        Tailor this candidate's profile to the job given at the end of this message by returning EDIT OPERATIONS
+        on the ID-tagged profile below. Do NOT repeat unchanged content.
+
+        OPERATIONS (JSON objects in an "operations" list):
+        - {{"op": "set_summary", "text": "..."}}: new 2-3 sentence professional summary
+        - {{"op": "select_roles", "ids": ["r2", "r1"]}}: the 3-4 most relevant roles, in display order
+        - {{"op": "order_skills", "ids": ["s5", "s1"]}}: skills to keep, job must-haves first, no duplicates
+        - {{"op": "select_bullets", "ids": ["r2.b3", "r2.b1"]}}: the 3-4 most impactful bullets per selected role
+        - {{"op": "replace_bullet", "id": "r2.b3", "text": "..."}}: rewrite a selected bullet (STAR method, job vocabulary)
+
+        CRITICAL RULES:
+        1. Only reference IDs that appear in the profile below.
+        2. Do NOT invent experiences. Only reframe existing ones.
+        3. Only emit replace_bullet when the wording actually changes.
+
+        OUTPUT FORMAT (JSON):
+        {{"operations": [ ... ]}}
+
+        ID-TAGGED PROFILE:
+        {catalog.render()}
+        {rag_context}
+
+        JOB ANALYSIS:
+        {json.dumps(job_analysis, indent=2)}
+        """
+
+        script = self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.5)
+        try:
+            return catalog.apply(script)
+        except EditScriptError as e:
+            print(f"⚠️ Invalid edit script ({e}); falling back to full CV generation.")
+            return self._customize_single(profile, job_analysis, relevant_snippets)
+
+    def customize_parallel(
+        self,
+        profile: Dict[str, Any],
+        job_analysis: Dict[str, Any],
+        relevant_snippets: List[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Customize the profile with concurrent, section-sized calls instead of one large one.
+
+        Roles and their strongest bullets are selected locally; the summary, the skills
+        list and each selected role's bullets are then rewritten in parallel, so latency
+        is bounded by the slowest small output rather than the whole CV.
+
+        Args:
+            profile: Candidates base profile
+            job_analysis: Structured analysis of the target job
+            relevant_snippets: (Optional) RAG snippets, used to boost the roles they came from
+
+        Returns:
+            Customized profile dictionary in the same schema as customize()
+        """
+        roles = self.select_roles(profile, job_analysis, relevant_snippets)
+        job_context = self._job_context(job_analysis)
+        job_terms = set().union(*self.match_calculator.extract_job_requirements(job_analysis))
+        selected = [(role, self.select_bullets(role, job_analysis)) for role in roles]
+        print(f"🎨 Customizing CV in parallel: summary, skills and {len(selected)} roles...")
+
+        with ThreadPoolExecutor(max_workers=2 + len(selected)) as pool:
+            summary_future = pool.submit(self._rewrite_summary, profile, roles, job_context)
+            skills_future = pool.submit(self._rewrite_skills, profile, job_context)
+            bullet_futures = [
+                pool.submit(self.rewrite_bullets, role, bullets, self.target_keywords(bullets, job_terms))
+                if bullets else None
+                for role, bullets in selected
+            ]
+            summary = summary_future.result()
+            skills = skills_future.result()
+            experience = [
+                {
+                    "company": role.get('company', ''),
+                    "title": role.get('title', ''),
+                    "dates": role.get('dates', ''),
+                    "achievements": future.result() if future is not None else []
+                }
+                for (role, _), future in zip(selected, bullet_futures)
+            ]
+
+        if self.bullet_cache is not None:
+            self.bullet_cache.flush()
+
+        return {
+            "personal_info": profile.get('personal_info', {}),
+            "summary": summary,
+            "skills": skills,
+            "experience": experience,
+            "education": unique_education(profile)
+        }
+
+    def select_roles(
+        self,
+        profile: Dict[str, Any],
+        job_analysis: Dict[str, Any],
+        relevant_snippets: List[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Pick the most relevant roles locally, keeping their original (chronological) order.
+
+        Roles are ranked by required skill matches (weighted x2), nice-to-have and keyword
+        matches, plus one point per retrieved RAG snippet from the same role.
+        """
+        experience = profile.get('experience', []) or []
+        if len(experience) <= self.max_roles:
+            return list(experience)
+
+        required, nice_to_have, keywords = self.match_calculator.extract_job_requirements(job_analysis)
+        required_terms, nice_terms, keyword_terms = TermSet(required), TermSet(nice_to_have), TermSet(keywords)
+        threshold = self.match_calculator.similarity_threshold
+        # sections_for() yields summary, skills, then one section per experience entry
+        role_sections = ProfileIndex.sections_for(profile)[2:]
+
+        snippet_hits: Dict[Tuple[str, str], int] = {}
+        for snippet in relevant_snippets or []:
+            metadata = snippet.get('metadata', {})
+            if metadata.get('type') == 'experience':
+                key = (metadata.get('company'), metadata.get('title'))
+                snippet_hits[key] = snippet_hits.get(key, 0) + 1
+
+        scored = []
+        for i, (role, section) in enumerate(zip(experience, role_sections)):
+            score = (
+                2 * len(section.find_matches('skills', required_terms, threshold))
+                + len(section.find_matches('skills', nice_terms, threshold))
+                + len(section.find_matches('keywords', keyword_terms, threshold))
+                + snippet_hits.get((role.get('company', 'Unknown'), role.get('title', 'Position')), 0)
+            )
+            scored.append((-score, i))
+
+        # Ties go to the earlier (more recent) role
+        keep = sorted(i for _, i in sorted(scored)[:self.max_roles])
+        return [experience[i] for i in keep]
+
+    def select_bullets(self, role: Dict[str, Any], job_analysis: Dict[str, Any]) -> List[str]:
+        """Keep the role's max_bullets bullets that mention the most job terms, in original order."""
+        bullets = ProfileIndex._role_items(role)
+        if len(bullets) <= self.max_bullets:
+            return bullets
+
+        job_terms = set().union(*self.match_calculator.extract_job_requirements(job_analysis))
+        scored = [(-len(self._supported_terms(bullet, job_terms)), i) for i, bullet in enumerate(bullets)]
+        keep = sorted(i for _, i in sorted(scored)[:self.max_bullets])
+        return [bullets[i] for i in keep]
+
+    def target_keywords(self, bullets: List[str], job_terms: Set[str]) -> List[str]:
+        """
+        Canonical job terms a role's bullets can legitimately be rewritten toward.
+
+        Only terms the bullets already support are targeted, which keeps rewrites truthful
+        and makes the keyword set (and so the bullet cache key) stable across similar jobs.
+        """
+        supported: Set[str] = set()
+        for bullet in bullets:
+            supported |= self._supported_terms(bullet, job_terms)
+        canonicalize = get_taxonomy().canonicalize
+        return sorted(canonicalize(term) for term in supported)
+
+    @staticmethod
+    def _supported_terms(text: str, job_terms: Set[str]) -> Set[str]:
+        """Normalized job terms mentioned in a text (taxonomy skills or literal keywords)."""
+        lowered = text.lower()
+        found = {skill.lower() for skill in get_taxonomy().extract(text)} & job_terms
+        return found | {term for term in job_terms - found if term in lowered}
+
+    def rewrite_bullets(self, role: Dict[str, Any], bullets: List[str], keywords: List[str]) -> List[str]:
+        """
+        Rewrite one role's bullets 1:1 (same count and order) toward the target keywords.
+
+        Bullets with a cached rewrite for the same keywords, model and prompt version are
+        reused; only the rest are sent to the LLM.
+
+        Returns:
+            Rewritten bullets; the originals for any the LLM did not rewrite cleanly
+        """
+        label = f"{role.get('title', '')} at {role.get('company', '')}"
+        results: List[Optional[str]] = [None] * len(bullets)
+        keys: List[Optional[str]] = [None] * len(bullets)
+        if self.bullet_cache is not None:
+            model = getattr(self.client, 'model_name', getattr(self.client, 'provider', ''))
+            for i, bullet in enumerate(bullets):
+                keys[i] = BulletRewriteCache.make_key(f"{label}: {bullet}", keywords, model, BULLET_PROMPT_VERSION)
+                results[i] = self.bullet_cache.get(keys[i])
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        pending_bullets = [bullets[i] for i in pending]
+        prompt = f"""
+        ROLE BULLET REWRITE
+        Rewrite each bullet point of ONE work experience entry toward the target keywords given at the end of this message.
+
+        RULES:
+        1. Return exactly one rewritten bullet per input bullet, in the same order.
+        2. Do NOT invent experiences, tools or metrics. Only reframe what the bullet says.
+        3. Use the EXACT spelling of the target keywords where the bullet supports them.
+        4. Use the STAR method and keep each bullet to one sentence.
+        5. Return raw JSON only in this format: {{"achievements": ["..."]}}
+
+        ROLE: {label}
+
+        BULLETS:
+        {json.dumps(pending_bullets, indent=2, ensure_ascii=False)}
+
+        TARGET KEYWORDS:
+        {json.dumps(keywords, ensure_ascii=False)}
+        """
+        try:
+            result = self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.5)
+            rewritten = result.get('achievements') if isinstance(result, dict) else None
+        except Exception as e:
+            print(f"⚠️ Bullet rewrite for {label} failed, keeping original bullets: {e}")
+            rewritten = None
+
+        if not isinstance(rewritten, list) or len(rewritten) != len(pending) \
+                or not all(isinstance(item, str) and item.strip() for item in rewritten):
+            if rewritten is not None:
+                print(f"⚠️ Bullet rewrite for {label} was not 1:1, keeping original bullets.")
+            rewritten = pending_bullets
+        elif self.bullet_cache is not None:
+            for i, text in zip(pending, rewritten):
+                self.bullet_cache.put(keys[i], text)
+
+        for i, text in zip(pending, rewritten):
+            results[i] = text
+        return results
+
+    def _rewrite_summary(self, profile: Dict[str, Any], roles: List[Dict[str, Any]], job_context: Dict[str, Any]) -> str:
+        """Rewrite the professional summary (falls back to the original)."""
+        original = profile.get('summary', '') or ''
+        prompt = f"""
+        SUMMARY REWRITE
+        Rewrite the candidate's professional summary for the job given at the end of this message.
+
+        RULES:
+        1. 2-3 sentences, no repetition of individual bullet points.
+        2. Do NOT invent experience; use only the summary and roles below.
+        3. Return raw JSON only in this format: {{"summary": "..."}}
+
+        CURRENT SUMMARY:
+        {json.dumps(original, ensure_ascii=False)}
+
+        SELECTED ROLES:
+        {json.dumps([f"{r.get('title', '')} at {r.get('company', '')}" for r in roles], ensure_ascii=False)}
+
+        JOB:
+        {json.dumps(job_context, indent=2, ensure_ascii=False)}
+        """
+        try:
+            result = self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.5)
+        except Exception as e:
+            print(f"⚠️ Summary rewrite failed, keeping original summary: {e}")
+            return original
+        summary = result.get('summary') if isinstance(result, dict) else None
+        return summary if isinstance(summary, str) and summary.strip() else original
+
+    def _rewrite_skills(self, profile: Dict[str, Any], job_context: Dict[str, Any]) -> Any:
+        """Reorder and filter the skills list (falls back to the original)."""
+        original = profile.get('skills', {})
+        prompt = f"""
+        SKILLS SELECTION
+        Reorder and filter the candidate's skills for the job given at the end of this message.
+
+        RULES:
+        1. Put the job's must-have skills first, then nice-to-have, then the rest that are relevant.
+        2. Only use skills from CURRENT SKILLS (exact job spelling is allowed). Remove duplicates.
+        3. Keep the category names.
+        4. Return raw JSON only in this format: {{"skills": {{"Technical": ["..."], "Soft Skills": ["..."]}}}}
+
+        CURRENT SKILLS:
+        {json.dumps(original, indent=2, ensure_ascii=False)}
+
+        JOB:
+        {json.dumps(job_context, indent=2, ensure_ascii=False)}
+        """
+        try:
+            result = self.client.generate_json(prompt, system_instruction=self.system_instruction, temperature=0.3)
+        except Exception as e:
+            print(f"⚠️ Skills selection failed, keeping original skills: {e}")
+            return original
+        skills = result.get('skills') if isinstance(result, dict) else None
+        return skills if isinstance(skills, (dict, list)) and skills else original
+
+    @staticmethod
+    def _job_context(job_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """The slice of the job analysis the section prompts need."""
+        requirements = job_analysis.get('requirements', {})
+        return {
+            "title": job_analysis.get('role_info', {}).get('title', ''),
+            "must_have_skills": requirements.get('must_have_skills', []),
+            "nice_to_have_skills": requirements.get('nice_to_have_skills', []),
+            "ats_keywords": job_analysis.get('keywords', {}).get('ats_keywords', [])
+        }
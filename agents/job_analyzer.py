@@ -62,11 +62,10 @@ class JobAnalyzer:
         """
         print(f"🔍 Analyzing job description ({len(job_description)} chars)...")
 
+        # Stable instructions first, variable job description last, so the prompt
+        # prefix is identical across calls and served from the provider's prefix cache.
         prompt = f"""
-        Analyze this job description and extract comprehensive information:
-
-        JOB DESCRIPTION:
-        {job_description}
+        Analyze the job description at the end of this message and extract comprehensive information.
 
         Extract and return a JSON object with this EXACT structure:
         {{
@@ -96,6 +95,9 @@ class JobAnalyzer:
         4. If information not provided, use null or empty array
         5. Be objective - don't make assumptions
         6. Return ONLY valid JSON
+
+        JOB DESCRIPTION:
+        {job_description}
         """
 
         # Temperature 0.1 for structured extraction
@@ -3,28 +3,75 @@ FastAPI Server for AI Job Agent
 Role: Expose the agentic workflow as a scalable API with file downloads.
 """
 
-import os
+import io
+import threading
+import time
 import uuid
-from typing import Dict, Any
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
 # Import components
-from utils.deepseek_client import DeepSeekClient
-from utils.document_builder import DocumentBuilder
+from utils.model_router import ModelRouter
+from utils.artifact_store import ArtifactStore, content_disposition
+from utils.document_builder import DocumentBuilder, FORMAT_MEDIA_TYPES
 from utils.rag_engine import RAGEngine
+from utils.render_service import RenderService, RenderServiceBusy
+from utils.run_store import RunStore, RUN_DOCUMENTS, render_run
+from utils.stage_timer import StageTimer, peak_rss_mb
 from agents.job_analyzer import JobAnalyzer
 from agents.cv_customizer import CVCustomizer
+from agents.ats_optimizer import ATSOptimizer
 from agents.cover_letter_generator import CoverLetterGenerator
+from agents.application_writer import ApplicationWriter
 
 # Load config
 load_dotenv()
 
-app = FastAPI(title="AI Job Application Agent API")
+# Engines, stores and the optional DOCX render pool (RENDER_WORKERS) are created with the server
+# rather than at import: render workers are spawned processes that import this module again
+# (as __mp_main__ under `python api.py`) and only need what RenderService's initializer builds.
+router: Optional[ModelRouter] = None
+rag_engine: Optional[RAGEngine] = None
+job_analyzer: Optional[JobAnalyzer] = None
+cv_customizer: Optional[CVCustomizer] = None
+ats_optimizer: Optional[ATSOptimizer] = None
+cover_letter_generator: Optional[CoverLetterGenerator] = None
+application_writer: Optional[ApplicationWriter] = None
+doc_builder: Optional[DocumentBuilder] = None
+artifact_store: Optional[ArtifactStore] = None
+run_store: Optional[RunStore] = None
+render_service: Optional[RenderService] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global router, rag_engine, job_analyzer, cv_customizer, ats_optimizer, cover_letter_generator
+    global application_writer, doc_builder, artifact_store, run_store, render_service
+    router = ModelRouter.from_env()
+    rag_engine = RAGEngine()
+    job_analyzer = JobAnalyzer(router.get_client("job_analyzer"))
+    cv_customizer = CVCustomizer(router.get_client("cv_customizer"))
+    ats_optimizer = ATSOptimizer(router.get_client("ats_optimizer"))
+    cover_letter_generator = CoverLetterGenerator(router.get_client("cover_letter_generator"))
+    application_writer = ApplicationWriter.from_router(router, cv_customizer, cover_letter_generator)
+    # Stateless builder: each render creates its own document, so requests can share it
+    doc_builder = DocumentBuilder.from_env()
+    # Generated documents are served from here (ARTIFACT_STORE, ARTIFACT_TTL_SECONDS), not from output/
+    artifact_store = ArtifactStore.from_env()
+    # Intermediate results of every run, for re-rendering without the LLM (only when RUN_STORE_DIR is set)
+    run_store = RunStore.from_env()
+    render_service = RenderService.from_env()
+    yield
+    if render_service is not None:
+        render_service.shutdown()
+
+app = FastAPI(title="AI Job Application Agent API", lifespan=lifespan)
 
 # Add CORS middleware to allow requests from web interface
 app.add_middleware(
@@ -35,95 +82,203 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Ensure output directory exists
-OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-# Initialize global engines
-api_key = os.getenv("DEEPSEEK_API_KEY")
-client = DeepSeekClient(api_key=api_key)
-rag_engine = RAGEngine()
-job_analyzer = JobAnalyzer(client)
-cv_customizer = CVCustomizer(client)
-cover_letter_generator = CoverLetterGenerator(client)
-doc_builder = DocumentBuilder()
+# Cover letter variants of recent applications, rendered on demand without another LLM call
+MAX_RECENT_APPLICATIONS = 100
+recent_applications: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+recent_applications_lock = threading.Lock()
 
 class JobRequest(BaseModel):
     job_description: str
 
+class RenderRequest(BaseModel):
+    documents: List[str] = list(RUN_DOCUMENTS)
+    format: str = "docx"
+    font_name: Optional[str] = None
+    font_size: Optional[float] = None
+    section_order: Optional[List[str]] = None
+    variant: int = 0
+
 @app.get("/")
 async def root():
     return {"status": "online", "message": "Agentic AI Job Platform API is healthy"}
 
+@app.get("/metrics")
+async def get_metrics():
+    """Per-route LLM latency and token metrics"""
+    return {
+        "routes": router.describe(),
+        "metrics": router.metrics.summary(),
+        "bullet_cache": cv_customizer.bullet_cache.stats() if cv_customizer.bullet_cache else None,
+        "artifacts": artifact_store.stats(),
+        "render_service": render_service.stats() if render_service else None,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+# Plain `def` endpoints: FastAPI runs the blocking LLM calls and DOCX rendering in its
+# thread pool instead of on the event loop
 @app.post("/apply")
-async def process_application(request: JobRequest):
+def process_application(request: JobRequest):
     """
     End-to-end application workflow:
     Analysis -> RAG Retrieval -> Customization -> Generation
     """
+    timer = StageTimer()
     try:
         # 1. Analyze
-        analysis = job_analyzer.analyze(request.job_description)
-        
-        # 2. RAG Retrieval (Strategic Improvement)
-        keywords = analysis.get("keywords", {}).get("ats_keywords", [])
-        relevant_snippets = rag_engine.retrieve_relevant_experience(keywords)
+        with timer.stage("analyze"):
+            analysis = job_analyzer.analyze(request.job_description)
         
-        # 3. Customize with RAG context
         import json
         with open("data/master_profile.json", "r") as f:
             profile = json.load(f)
-            
-        customized_cv = cv_customizer.customize(profile, analysis, relevant_snippets)
-        cover_letter = cover_letter_generator.generate(profile, analysis)
-
-        # 4. Generate Files with unique ID for download
+        
+        # 2. RAG Retrieval (Strategic Improvement) over the current profile's cached index
+        with timer.stage("retrieve"):
+            keywords = analysis.get("keywords", {}).get("ats_keywords", [])
+            relevant_snippets = rag_engine.retrieve_relevant_experience(keywords, profile=profile)
+        
+        # 3. Download names (artifacts themselves are keyed by content hash)
         import re
         def sanitize(name): return re.sub(r'[<>:"/\\|?*]', '', str(name)).strip().replace(' ', '_')
         
         role = sanitize(analysis.get('role_info', {}).get('title', 'Job'))
         company = sanitize(analysis.get('role_info', {}).get('company', 'Company'))
         
-        # Use unique ID to prevent file conflicts
         unique_id = str(uuid.uuid4())[:8]
         
-        cv_filename = f"CV_{company}_{role}_{unique_id}.docx"
-        cl_filename = f"CL_{company}_{role}_{unique_id}.docx"
+        cv_filename = f"CV_{company}_{role}.docx"
+        cl_filename = f"CL_{company}_{role}.docx"
         
-        cv_path = os.path.join(OUTPUT_DIR, cv_filename)
-        cl_path = os.path.join(OUTPUT_DIR, cl_filename)
-        
-        doc_builder.create_cv(customized_cv, cv_path)
-        doc_builder.create_cover_letter(cover_letter, profile, cl_path)
+        # 4. Customize with RAG context and write the cover letter (two calls or one combined call);
+        # the letter is rendered in memory as it arrives
+        cl_buffer = io.BytesIO()
+        customized_cv, cover_letters = application_writer.generate(
+            profile, analysis, relevant_snippets, timer=timer,
+            cover_letter_sink=lambda chunks: doc_builder.create_cover_letter_streaming(chunks, profile, cl_buffer)
+        )
+        ats_report = None
+        if ATSOptimizer.enabled():
+            with timer.stage("optimize"):
+                customized_cv, ats_report = ats_optimizer.optimize(customized_cv, analysis, profile)
+
+        # 5. Render the CV (the cover letter was already written by the generation step)
+        with timer.stage("documents"):
+            renderer = render_service or doc_builder
+            cv_artifact = artifact_store.put(renderer.render_cv(customized_cv), cv_filename)
+            cl_artifact = artifact_store.put(cl_buffer.getvalue(), cl_filename)
+
+        with recent_applications_lock:
+            recent_applications[unique_id] = {
+                "cover_letters": cover_letters,
+                "profile": profile,
+                "file_stem": f"CL_{company}_{role}"
+            }
+            while len(recent_applications) > MAX_RECENT_APPLICATIONS:
+                recent_applications.popitem(last=False)
+
+        if run_store is not None:
+            run_store.save(
+                unique_id, profile, analysis, customized_cv, cover_letters,
+                match={"ats_optimization": ats_report},
+                file_stems={"cv": f"CV_{company}_{role}", "cover_letter": f"CL_{company}_{role}"},
+                source="api"
+            )
 
         return {
             "success": True,
+            "application_id": unique_id,
+            "run_id": unique_id if run_store is not None else None,
             "analysis": analysis,
+            "cover_letter_variants": cover_letters,
+            "ats_optimization": ats_report,
+            "timings": timer.as_dict(),
             "files": {
                 "cv": cv_filename,
                 "cover_letter": cl_filename
             },
             "download_urls": {
-                "cv": f"/download/{cv_filename}",
-                "cover_letter": f"/download/{cl_filename}"
+                "cv": f"/download/{cv_artifact['key']}",
+                "cover_letter": f"/download/{cl_artifact['key']}"
             }
         }
+    except RenderServiceBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/download/{filename}")
-async def download_file(filename: str):
-    """Download generated CV or Cover Letter"""
-    file_path = os.path.join(OUTPUT_DIR, filename)
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
+@app.post("/cover-letter/{application_id}/{variant}")
+def render_cover_letter_variant(application_id: str, variant: int):
+    """Render another generated cover letter variant (no LLM call)"""
+    with recent_applications_lock:
+        application = recent_applications.get(application_id)
+    if application is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired application")
+    if not 0 <= variant < len(application["cover_letters"]):
+        raise HTTPException(status_code=404, detail=f"Variant {variant} does not exist")
+
+    cl_filename = f"{application['file_stem']}.docx" if variant == 0 else f"{application['file_stem']}_v{variant + 1}.docx"
+    renderer = render_service or doc_builder
+    try:
+        data = renderer.render_cover_letter(application["cover_letters"], application["profile"], variant=variant)
+    except RenderServiceBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    artifact = artifact_store.put(data, cl_filename)
+    return {
+        "success": True,
+        "variant": variant,
+        "files": {"cover_letter": cl_filename},
+        "download_urls": {"cover_letter": f"/download/{artifact['key']}"}
+    }
+
+@app.post("/runs/{run_id}/render")
+def rerender_run(run_id: str, request: Optional[RenderRequest] = None):
+    """Re-render a stored run's documents with other layout options or format (no LLM call)"""
+    request = request or RenderRequest()
+    if run_store is None:
+        raise HTTPException(status_code=404, detail="Run store is disabled (RUN_STORE_DIR)")
+    try:
+        record = run_store.load(run_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if record is None:
+        raise HTTPException(status_code=404, detail="Unknown run")
+
+    try:
+        start = time.perf_counter()
+        renderer = doc_builder.with_options(
+            font_name=request.font_name, font_size=request.font_size, section_order=request.section_order
+        )
+        rendered = render_run(record, renderer, request.documents, request.format, request.variant)
+        render_ms = (time.perf_counter() - start) * 1000
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    files, download_urls = {}, {}
+    for document, (filename, data) in rendered.items():
+        artifact = artifact_store.put(data, filename, FORMAT_MEDIA_TYPES[request.format])
+        files[document] = filename
+        download_urls[document] = f"/download/{artifact['key']}"
+    return {
+        "success": True,
+        "run_id": run_id,
+        "format": request.format,
+        "render_ms": round(render_ms, 2),
+        "files": files,
+        "download_urls": download_urls
+    }
+
+@app.get("/download/{key}")
+def download_file(key: str):
+    """Stream a generated CV or Cover Letter from the artifact store"""
+    opened = artifact_store.open(key)
+    if opened is None:
+        raise HTTPException(status_code=404, detail="File not found or expired")
     
-    return FileResponse(
-        path=file_path,
-        filename=filename,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    )
+    meta, chunks = opened
+    return StreamingResponse(chunks, media_type=meta["media_type"], headers={
+        "Content-Disposition": content_disposition(meta["filename"]),
+        "Content-Length": str(meta["size"])
+    })
 
 class LinkedInImportRequest(BaseModel):
     profile_text: str
@@ -138,7 +293,7 @@ async def import_linkedin_profile(request: LinkedInImportRequest):
         from utils.linkedin_scraper import import_from_linkedin_text
         
         # Parse and save the profile
-        profile = import_from_linkedin_text(request.profile_text, client)
+        profile = import_from_linkedin_text(request.profile_text, router.get_client("linkedin_scraper"))
         
         # Reinitialize RAG engine with new profile
         global rag_engine
@@ -3,12 +3,17 @@ Flask Web Application for AI-Powered Job Application Agent
 Run on localhost for web interface
 """
 
+import io
 import os
 import sys
 import json
 import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from typing import Tuple
-from flask import Flask, render_template, request, jsonify, send_file, flash
+from flask import Flask, Response, render_template, request, jsonify, flash
 from dotenv import load_dotenv
 
 # Fix Windows console encoding for emojis
@@ -20,14 +25,21 @@ if sys.platform == 'win32':
         pass
 
 # Import our modular components
-from utils.deepseek_client import DeepSeekClient
-from utils.document_builder import DocumentBuilder
+from utils.model_router import ModelRouter
+from utils.render_service import RenderService, RenderServiceBusy
+from utils.artifact_store import ArtifactStore, content_disposition
+from utils.document_builder import DocumentBuilder, FORMAT_MEDIA_TYPES
+from utils.run_store import RunStore, RUN_DOCUMENTS, render_run
 from utils.match_calculator import MatchCalculator
 from utils.profile_deduplicator import ProfileDeduplicator
+from utils.profile_index import ProfileIndex
 from utils.linkedin_importer import LinkedInImporter, import_linkedin_profile
+from utils.stage_timer import StageTimer, peak_rss_mb
 from agents.job_analyzer import JobAnalyzer
 from agents.cv_customizer import CVCustomizer
+from agents.ats_optimizer import ATSOptimizer
 from agents.cover_letter_generator import CoverLetterGenerator
+from agents.application_writer import ApplicationWriter
 
 # Load environment variables
 load_dotenv()
@@ -36,27 +48,49 @@ app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
 
 # Global variables for initialized components
-client = None
+router = None
 builder = None
 match_calculator = None
 job_analyzer = None
 cv_customizer = None
+ats_optimizer = None
 cover_letter_generator = None
+application_writer = None
+render_service = None
+
+# Rendered documents are kept in memory (or on disk / an object store) for download,
+# keyed by content hash and dropped after ARTIFACT_TTL_SECONDS
+artifact_store = ArtifactStore.from_env()
+
+# Intermediate results of every run, so documents can be re-rendered with other layout
+# options without calling the LLM. Opt-in: only kept when RUN_STORE_DIR is set.
+run_store = RunStore.from_env()
+
+# Cover letter variants of recent applications, so a different variant can be rendered
+# without another LLM call (application_id -> variants, profile, file stem)
+MAX_RECENT_APPLICATIONS = 100
+recent_applications: "OrderedDict[str, dict]" = OrderedDict()
+recent_applications_lock = threading.Lock()
 
 def initialize_components():
     """Initialize all AI components."""
-    global client, builder, match_calculator, job_analyzer, cv_customizer, cover_letter_generator
+    global router, builder, match_calculator, job_analyzer, cv_customizer, ats_optimizer, cover_letter_generator, application_writer, render_service
     
-    api_key = os.getenv("DEEPSEEK_API_KEY")
-    if not api_key:
-        raise ValueError("DEEPSEEK_API_KEY not found in environment variables")
+    router = ModelRouter.from_env()
+    missing_keys = router.missing_api_keys()
+    if missing_keys:
+        raise ValueError(f"{', '.join(missing_keys)} not found in environment variables")
     
-    client = DeepSeekClient(api_key=api_key)
-    builder = DocumentBuilder()
+    builder = DocumentBuilder.from_env()
     match_calculator = MatchCalculator()
-    job_analyzer = JobAnalyzer(client)
-    cv_customizer = CVCustomizer(client)
-    cover_letter_generator = CoverLetterGenerator(client)
+    job_analyzer = JobAnalyzer(router.get_client("job_analyzer"))
+    cv_customizer = CVCustomizer(router.get_client("cv_customizer"))
+    ats_optimizer = ATSOptimizer(router.get_client("ats_optimizer"), match_calculator)
+    cover_letter_generator = CoverLetterGenerator(router.get_client("cover_letter_generator"))
+    application_writer = ApplicationWriter.from_router(router, cv_customizer, cover_letter_generator)
+    # Optional process pool for DOCX rendering (RENDER_WORKERS); created once per process
+    if render_service is None:
+        render_service = RenderService.from_env()
 
 def load_profile(path: str = "data/master_profile.json") -> dict:
     """Load the master profile JSON file."""
@@ -210,6 +244,7 @@ def import_linkedin():
 @app.route('/api/process', methods=['POST'])
 def process_job():
     """Process job description and generate CV/cover letter."""
+    timer = StageTimer()
     try:
         data = request.json
         job_description = data.get('job_description', '').strip()
@@ -230,57 +265,101 @@ def process_job():
             }), 400
         
         # Initialize components if not already done
-        if client is None:
+        if router is None:
             initialize_components()
         
         # Load profile
-        profile = load_profile()
-        
-        # Deduplicate profile first
-        profile = ProfileDeduplicator.deduplicate_profile(profile)
+        with timer.stage("load_profile"):
+            profile = load_profile()
+            
+            # Deduplicate profile first (the index is reused by matching when nothing was removed)
+            profile = ProfileDeduplicator.deduplicate_profile(profile, ProfileIndex.for_profile(profile))
         
         # Analyze job
-        analysis = job_analyzer.analyze(job_description)
+        with timer.stage("analyze"):
+            analysis = job_analyzer.analyze(job_description)
         role_title = analysis.get('role_info', {}).get('title', 'Unknown Role')
         company = analysis.get('role_info', {}).get('company', 'Unknown Company')
         
         # Calculate match score
-        match_data = match_calculator.calculate_match_score(profile, analysis)
+        with timer.stage("match"):
+            match_data = match_calculator.calculate_match_score(profile, analysis)
+        
+        safe_title = sanitize_filename(role_title)
+        safe_company = sanitize_filename(company)
+        
+        cv_filename = f"CV_{safe_company}_{safe_title}.docx"
+        cl_filename = f"CL_{safe_company}_{safe_title}.docx"
         
-        # Customize CV
-        customized_cv = cv_customizer.customize(profile, analysis)
+        # Customize CV and write the cover letter (two calls or one combined call);
+        # the letter is rendered in memory, while it streams when COVER_LETTER_STREAM is on
+        cl_buffer = io.BytesIO()
+        customized_cv, cover_letters = application_writer.generate(
+            profile, analysis, timer=timer,
+            cover_letter_sink=lambda chunks: builder.create_cover_letter_streaming(chunks, profile, cl_buffer)
+        )
         
         # Remove any repetitive content
         customized_cv = ProfileDeduplicator.remove_repetitive_content(customized_cv)
         
-        # Generate cover letter
-        cover_letter_text = cover_letter_generator.generate(profile, analysis)
+        # Optionally lift the score by re-prompting only the weakest sections
+        ats_report = None
+        if ATSOptimizer.enabled():
+            with timer.stage("optimize"):
+                customized_cv, ats_report = ats_optimizer.optimize(customized_cv, analysis, profile)
         
-        # Generate documents
-        os.makedirs("output", exist_ok=True)
-        safe_title = sanitize_filename(role_title)
-        safe_company = sanitize_filename(company)
+        # Score the customized CV with the same engine (unchanged sections reuse cached tokens)
+        with timer.stage("match_cv"):
+            cv_match_data = match_calculator.calculate_match_score(customized_cv, analysis)
         
-        cv_filename = f"output/CV_{safe_company}_{safe_title}.docx"
-        cl_filename = f"output/CL_{safe_company}_{safe_title}.docx"
+        # Render the CV (the cover letter was already written by the generation step) and
+        # hand both documents to the artifact store
+        with timer.stage("documents"):
+            renderer = render_service or builder
+            cv_artifact = artifact_store.put(renderer.render_cv(customized_cv), cv_filename)
+            cl_artifact = artifact_store.put(cl_buffer.getvalue(), cl_filename)
         
-        # Create documents (reuse builder but create new instances for each)
-        cv_builder = DocumentBuilder()
-        cv_builder.create_cv(customized_cv, cv_filename)
+        application_id = uuid.uuid4().hex[:12]
+        with recent_applications_lock:
+            recent_applications[application_id] = {
+                'cover_letters': cover_letters,
+                'profile': profile,
+                'file_stem': f"CL_{safe_company}_{safe_title}"
+            }
+            while len(recent_applications) > MAX_RECENT_APPLICATIONS:
+                recent_applications.popitem(last=False)
         
-        cl_builder = DocumentBuilder()
-        cl_builder.create_cover_letter(cover_letter_text, profile, cl_filename)
+        if run_store is not None:
+            run_store.save(
+                application_id, profile, analysis, customized_cv, cover_letters,
+                match={'profile': match_data, 'cv': cv_match_data, 'ats_optimization': ats_report},
+                file_stems={'cv': f"CV_{safe_company}_{safe_title}", 'cover_letter': f"CL_{safe_company}_{safe_title}"},
+                source='flask'
+            )
         
         return jsonify({
             'success': True,
             'role_title': role_title,
             'company': company,
             'match_score': match_data,
+            'cv_match_score': cv_match_data,
+            'ats_optimization': ats_report,
             'cv_file': cv_filename,
             'cover_letter_file': cl_filename,
-            'analysis': analysis
+            'cv_url': f"/api/download/{cv_artifact['key']}",
+            'cover_letter_url': f"/api/download/{cl_artifact['key']}",
+            'application_id': application_id,
+            'run_id': application_id if run_store is not None else None,
+            'cover_letter_variants': cover_letters,
+            'analysis': analysis,
+            'timings': timer.as_dict()
         })
         
+    except RenderServiceBusy as e:
+        return jsonify({
+            'success': False,
+            'error': f'Server busy: {str(e)}'
+        }), 503
     except ValueError as e:
         return jsonify({
             'success': False,
@@ -292,21 +371,95 @@ def process_job():
             'error': f'Processing error: {str(e)}'
         }), 500
 
-@app.route('/api/download/<path:filename>')
-def download_file(filename):
-    """Download generated files."""
+@app.route('/api/cover-letter/<application_id>/<int:variant>', methods=['POST'])
+def render_cover_letter_variant(application_id, variant):
+    """Render another generated cover letter variant (no LLM call)."""
+    with recent_applications_lock:
+        application = recent_applications.get(application_id)
+    if application is None:
+        return jsonify({'success': False, 'error': 'Unknown or expired application'}), 404
+    if not 0 <= variant < len(application['cover_letters']):
+        return jsonify({'success': False, 'error': f'Variant {variant} does not exist'}), 404
+    
+    cl_filename = f"{application['file_stem']}.docx" if variant == 0 else f"{application['file_stem']}_v{variant + 1}.docx"
+    renderer = render_service or builder
     try:
-        # Security: only allow files from output directory
-        if not filename.startswith('output/'):
-            return jsonify({'error': 'Invalid file path'}), 403
-        
-        file_path = filename
-        if not os.path.exists(file_path):
-            return jsonify({'error': 'File not found'}), 404
-        
-        return send_file(file_path, as_attachment=True)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        data = renderer.render_cover_letter(application['cover_letters'], application['profile'], variant=variant)
+    except RenderServiceBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
+    artifact = artifact_store.put(data, cl_filename)
+    return jsonify({
+        'success': True,
+        'variant': variant,
+        'cover_letter_file': cl_filename,
+        'cover_letter_url': f"/api/download/{artifact['key']}"
+    })
+
+@app.route('/api/runs/<run_id>/render', methods=['POST'])
+def rerender_run(run_id):
+    """
+    Re-render a stored run's documents with other layout options (no LLM call).
+    
+    JSON body (all optional): documents (["cv", "cover_letter"]), format ("docx", "txt", "md"),
+    font_name, font_size, section_order (e.g. ["experience", "skills"]), variant.
+    """
+    if run_store is None:
+        return jsonify({'success': False, 'error': 'Run store is disabled (RUN_STORE_DIR)'}), 404
+    try:
+        record = run_store.load(run_id)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    if record is None:
+        return jsonify({'success': False, 'error': 'Unknown run'}), 404
+    
+    options = request.get_json(silent=True) or {}
+    fmt = options.get('format', 'docx')
+    try:
+        start = time.perf_counter()
+        renderer = (builder or DocumentBuilder.from_env()).with_options(
+            font_name=options.get('font_name'),
+            font_size=options.get('font_size'),
+            section_order=options.get('section_order')
+        )
+        rendered = render_run(record, renderer, options.get('documents', RUN_DOCUMENTS), fmt, int(options.get('variant', 0)))
+        render_ms = (time.perf_counter() - start) * 1000
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    result = {'success': True, 'run_id': run_id, 'format': fmt, 'render_ms': round(render_ms, 2)}
+    for document, (filename, data) in rendered.items():
+        artifact = artifact_store.put(data, filename, FORMAT_MEDIA_TYPES[fmt])
+        result[f'{document}_file'] = filename
+        result[f'{document}_url'] = f"/api/download/{artifact['key']}"
+    return jsonify(result)
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Per-route LLM latency and token metrics."""
+    if router is None:
+        return jsonify({'routes': {}, 'metrics': {}, 'artifacts': artifact_store.stats(), 'render_service': None,
+                        'peak_rss_mb': peak_rss_mb()})
+    return jsonify({
+        'routes': router.describe(),
+        'metrics': router.metrics.summary(),
+        'bullet_cache': cv_customizer.bullet_cache.stats() if cv_customizer.bullet_cache else None,
+        'artifacts': artifact_store.stats(),
+        'render_service': render_service.stats() if render_service else None,
+        'peak_rss_mb': peak_rss_mb()
+    })
+
+@app.route('/api/download/<key>')
+def download_file(key):
+    """Stream a generated document from the artifact store."""
+    opened = artifact_store.open(key)
+    if opened is None:
+        return jsonify({'error': 'File not found or expired'}), 404
+    
+    meta, chunks = opened
+    return Response(chunks, content_type=meta['media_type'], headers={
+        'Content-Disposition': content_disposition(meta['filename']),
+        'Content-Length': str(meta['size'])
+    })
 
 if __name__ == '__main__':
     # Initialize components on startup
@@ -315,7 +468,7 @@ if __name__ == '__main__':
         print("✅ All components initialized successfully")
     except Exception as e:
         print(f"⚠️  Warning: Could not initialize components: {e}")
-        print("💡 Make sure DEEPSEEK_API_KEY is set in .env file")
+        print("💡 Make sure the API key of each configured provider (e.g. DEEPSEEK_API_KEY) is set in .env file")
     
     print("\n🚀 Starting Flask web server...")
     print("📱 Open your browser and go to: http://localhost:5000")
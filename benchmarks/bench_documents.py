@@ -0,0 +1,83 @@
+"""
+DOCX Rendering Benchmark
+Role: Compare per-document render time of DocumentBuilder when it rebuilds Document() and its styles
+for every render (the previous behaviour), when it clones the process-wide pre-styled template, and
+with the direct OOXML writer (DOCUMENT_RENDERER=ooxml).
+
+Usage (from the project root):
+    python -m benchmarks.bench_documents
+    python -m benchmarks.bench_documents --roles 8 --min-time 2 --output benchmarks/results/documents.json
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from typing import Dict, Any, List
+
+from benchmarks.bench_local import measure
+from benchmarks.synthetic import make_profile
+from utils.document_builder import DocumentBuilder
+from utils.ooxml_writer import OOXMLDocumentBuilder, get_package
+
+STRATEGIES = {
+    "rebuild": lambda: DocumentBuilder(clone_template=False),
+    "template": DocumentBuilder,
+    "ooxml": OOXMLDocumentBuilder,
+}
+
+
+def run_benchmarks(n_roles: int, min_time: float) -> List[Dict[str, Any]]:
+    """
+    Time one CV and one cover letter render per strategy.
+
+    Returns:
+        One result row per (document, strategy)
+    """
+    profile = make_profile(n_roles=n_roles, seed=42)
+    letter = "\n\n".join(f"Paragraph {i}: " + "I bring measurable results to this role. " * 12 for i in range(4))
+    workdir = tempfile.mkdtemp(prefix="bench_documents_")
+    get_package()  # Template parsed (and split) once per process; not part of the per-document cost
+
+    results = []
+    for document in ("cv", "cover_letter"):
+        for strategy, make_builder in STRATEGIES.items():
+            builder = make_builder()
+            path = os.path.join(workdir, f"{document}_{strategy}.docx")
+            if document == "cv":
+                fn = lambda: builder.create_cv(profile, path)
+            else:
+                fn = lambda: builder.create_cover_letter(letter, profile, path)
+            stats = measure(fn, min_time=min_time)
+            results.append({"document": document, "strategy": strategy, **stats})
+    return results
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    """Print median render times and the template speedup per document type."""
+    print(f"\n{'document':<14}{'strategy':<10}{'median ms':>11}{'min ms':>9}{'peak KB':>10}{'speedup':>9}")
+    baselines = {r["document"]: r["median_s"] for r in results if r["strategy"] == "rebuild"}
+    for r in results:
+        speedup = baselines[r["document"]] / r["median_s"] if r["median_s"] else 0.0
+        print(f"{r['document']:<14}{r['strategy']:<10}{r['median_s'] * 1000:>11.2f}{r['min_s'] * 1000:>9.2f}"
+              f"{r['alloc_peak_kb']:>10}{speedup:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DOCX rendering: rebuild vs template clone vs direct OOXML")
+    parser.add_argument("--roles", type=int, default=8, help="Roles in the synthetic CV")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds spent timing each case")
+    parser.add_argument("--output", default=None, help="Save the results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.roles, args.min_time)
+    print_report(results)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+CV + Cover Letter Generation Benchmark
+Role: Compare the two-call (sequential), parallel two-call and combined single-call strategies of
+ApplicationWriter by wall-clock time and total tokens, so each deployment can pick its mode.
+
+Usage (from the project root):
+    python -m benchmarks.bench_generation                          # in-process stub server
+    python -m benchmarks.bench_generation --latency-ms 800 --tokens-per-second 60 --runs 5
+    python -m benchmarks.bench_generation --base-url https://api.deepseek.com --runs 2   # real provider (needs DEEPSEEK_API_KEY)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import time
+from typing import Dict, Any, List
+
+from agents.application_writer import ApplicationWriter, GENERATION_MODES
+from agents.cover_letter_generator import CoverLetterGenerator
+from agents.cv_customizer import CVCustomizer
+from benchmarks.synthetic import make_profile, make_job_analysis
+from utils.model_router import ModelRouter
+
+
+def run_mode(mode: str, profile: Dict[str, Any], job_analysis: Dict[str, Any], runs: int) -> Dict[str, Any]:
+    """
+    Generate both documents `runs` times with one strategy.
+
+    Returns:
+        Wall-clock percentiles, calls and token totals per application
+    """
+    router = ModelRouter.from_env()
+    writer = ApplicationWriter.from_router(
+        router,
+        CVCustomizer(router.get_client("cv_customizer"), mode="single"),
+        CoverLetterGenerator(router.get_client("cover_letter_generator")),
+        mode=mode
+    )
+
+    times: List[float] = []
+    sink = io.StringIO()
+    for _ in range(runs):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sink):
+            writer.generate(profile, job_analysis)
+        times.append(time.perf_counter() - start)
+
+    routes = router.metrics.summary().values()
+    calls = sum(route["calls"] for route in routes)
+    prompt_tokens = sum(route["prompt_tokens"] for route in routes)
+    completion_tokens = sum(route["completion_tokens"] for route in routes)
+    return {
+        "mode": mode,
+        "runs": runs,
+        "wall_s": {
+            "mean": round(statistics.mean(times), 3),
+            "median": round(statistics.median(times), 3),
+            "max": round(max(times), 3),
+        },
+        "calls_per_application": round(calls / runs, 2),
+        "prompt_tokens_per_application": round(prompt_tokens / runs),
+        "completion_tokens_per_application": round(completion_tokens / runs),
+        "total_tokens_per_application": round((prompt_tokens + completion_tokens) / runs),
+    }
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    """Print a comparison table relative to the sequential two-call mode."""
+    baseline = next((r for r in results if r["mode"] == "sequential"), results[0])
+    print(f"\n{'mode':<12}{'median s':>10}{'calls':>8}{'prompt tok':>12}{'compl tok':>11}{'total tok':>11}{'vs seq':>9}")
+    for r in results:
+        speedup = baseline["wall_s"]["median"] / r["wall_s"]["median"] if r["wall_s"]["median"] else 0.0
+        print(f"{r['mode']:<12}{r['wall_s']['median']:>10}{r['calls_per_application']:>8}"
+              f"{r['prompt_tokens_per_application']:>12}{r['completion_tokens_per_application']:>11}"
+              f"{r['total_tokens_per_application']:>11}{speedup:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CV + cover letter generation strategies")
+    parser.add_argument("--modes", default=",".join(GENERATION_MODES), help="Comma-separated modes to compare")
+    parser.add_argument("--runs", type=int, default=3, help="Applications generated per mode")
+    parser.add_argument("--roles", type=int, default=8, help="Roles in the synthetic profile")
+    parser.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint (default: in-process stub server)")
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="Stub time-to-first-token")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Stub output speed")
+    parser.add_argument("--output", default=None, help="Save the results as JSON")
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url:
+        os.environ["DEEPSEEK_BASE_URL"] = args.base_url
+    else:
+        from llm_stub_server import StubConfig, start_stub_server
+        server = start_stub_server(port=0, config=StubConfig(
+            latency_ms=args.latency_ms, latency_jitter_ms=0, latency_dist="fixed",
+            tokens_per_second=args.tokens_per_second, seed=0
+        ))
+        os.environ["DEEPSEEK_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+        os.environ.setdefault("DEEPSEEK_API_KEY", "stub")
+        os.environ.pop("LLM_CASSETTE", None)
+        print(f"🧪 Stub server on {os.environ['DEEPSEEK_BASE_URL']} "
+              f"({args.latency_ms:.0f} ms TTFT, {args.tokens_per_second:.0f} tok/s)")
+
+    profile = make_profile(n_roles=args.roles)
+    job_analysis = make_job_analysis()
+    results = []
+    try:
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            print(f"⏱️  {mode}...")
+            results.append(run_mode(mode, profile, job_analysis, args.runs))
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print_report(results)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
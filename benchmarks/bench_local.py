@@ -0,0 +1,194 @@
+"""
+Local Hot-Path Microbenchmarks
+Role: Time the non-LLM components (MatchCalculator, RAGEngine, ProfileDeduplicator, DocumentBuilder)
+on synthetic profiles from 5 roles up to 500 roles / 10k skills, and compare against stored baselines.
+
+Usage (from the project root):
+    python -m benchmarks.bench_local                       # all sizes, all operations
+    python -m benchmarks.bench_local --sizes small,medium --ops match,rag
+    python -m benchmarks.bench_local --save-baseline       # write benchmarks/baselines/local.json
+    python -m benchmarks.bench_local --compare             # compare against the stored baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Any, Callable, List, Optional
+
+from benchmarks.synthetic import make_profile, make_job_analysis
+from utils.match_calculator import MatchCalculator
+from utils.profile_deduplicator import ProfileDeduplicator
+from utils.rag_engine import RAGEngine
+
+SIZES = {
+    "small": {"n_roles": 5, "n_skills": 50},
+    "medium": {"n_roles": 50, "n_skills": 1000},
+    "large": {"n_roles": 500, "n_skills": 10000},
+}
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "local.json")
+
+
+def measure(
+    fn: Callable[[], Any],
+    setup: Optional[Callable[[], None]] = None,
+    min_time: float = 0.5,
+    max_runs: int = 200
+) -> Dict[str, float]:
+    """
+    Time an operation repeatedly and measure its allocations once.
+
+    Args:
+        fn: Operation to time (stdout is suppressed while it runs)
+        setup: Optional per-run setup excluded from timing
+        min_time: Keep repeating until this much time has been spent
+        max_runs: Upper bound on repetitions
+
+    Returns:
+        Timing (seconds) and allocation statistics
+    """
+    sink = io.StringIO()
+    times: List[float] = []
+    spent = 0.0
+    while spent < min_time and len(times) < max_runs:
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(sink):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        spent += elapsed
+        sink.seek(0)
+        sink.truncate()
+
+    # One extra run under tracemalloc for allocation figures (tracing skews timing)
+    if setup:
+        setup()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(sink):
+        fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks_after = sys.getallocatedblocks()
+
+    return {
+        "runs": len(times),
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "alloc_peak_kb": round(peak / 1024, 1),
+        "retained_blocks": blocks_after - blocks_before,
+    }
+
+
+def run_benchmarks(sizes: List[str], ops: List[str], min_time: float) -> Dict[str, Dict[str, Any]]:
+    """Run the selected operations for each profile size."""
+    results: Dict[str, Dict[str, Any]] = {}
+    workdir = tempfile.mkdtemp(prefix="bench_local_")
+
+    for size in sizes:
+        params = SIZES[size]
+        profile = make_profile(n_roles=params["n_roles"], n_skills=params["n_skills"], seed=42)
+        job = make_job_analysis(n_required=10, n_nice=6, n_keywords=20, vocabulary_size=params["n_skills"], seed=7)
+        keywords = job["keywords"]["ats_keywords"]
+
+        profile_path = os.path.join(workdir, f"profile_{size}.json")
+        with open(profile_path, 'w', encoding='utf-8') as f:
+            json.dump(profile, f)
+
+        calculator = MatchCalculator()
+        with contextlib.redirect_stdout(io.StringIO()):
+            rag_engine = RAGEngine(profile_path)
+
+        operations = {
+            "match": (lambda: calculator.calculate_match_score(profile, job), None),
+            "rag": (lambda: rag_engine.retrieve_relevant_experience(keywords), None),
+            "dedupe": (lambda: ProfileDeduplicator.deduplicate_profile(profile), None),
+        }
+        if "create_cv" in ops:
+            # Imported lazily so the pure-Python benchmarks run without python-docx
+            from utils.document_builder import DocumentBuilder
+            builder = DocumentBuilder()
+            cv_path = os.path.join(workdir, f"cv_{size}.docx")
+            operations["create_cv"] = (lambda: builder.create_cv(profile, cv_path), None)
+
+        for op in ops:
+            fn, setup = operations[op]
+            stats = measure(fn, setup, min_time=min_time)
+            results[f"{op}/{size}"] = stats
+            print(f"   {op:<10} {size:<7} median {stats['median_s'] * 1000:10.3f} ms | "
+                  f"min {stats['min_s'] * 1000:10.3f} ms | peak alloc {stats['alloc_peak_kb']:>10} KB | "
+                  f"runs {stats['runs']}")
+
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> bool:
+    """
+    Print speed-ups/regressions against a baseline.
+
+    Returns:
+        True if no benchmark regressed by more than the threshold
+    """
+    ok = True
+    print(f"\n🔁 Compared with baseline from {baseline.get('timestamp')}:")
+    for name, stats in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            print(f"   {name:<18} (no baseline)")
+            continue
+        ratio = stats["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        marker = "✅"
+        if ratio > 1 + threshold:
+            marker = "❌"
+            ok = False
+        print(f"   {marker} {name:<18} {old['median_s'] * 1000:10.3f} ms → {stats['median_s'] * 1000:10.3f} ms "
+              f"({ratio:.2f}x time) | peak alloc {old['alloc_peak_kb']} → {stats['alloc_peak_kb']} KB")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the local (non-LLM) hot paths")
+    parser.add_argument("--sizes", default="small,medium,large", help=f"Comma-separated: {', '.join(SIZES)}")
+    parser.add_argument("--ops", default="match,rag,dedupe,create_cv", help="Comma-separated operations")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds spent per benchmark")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="Store results as a baseline (default path: benchmarks/baselines/local.json)")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        help="Compare against a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    ops = [o.strip() for o in args.ops.split(",") if o.strip()]
+
+    print("⏱️  Running local microbenchmarks...")
+    results = run_benchmarks(sizes, ops, args.min_time)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.save_baseline) or ".", exist_ok=True)
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": sys.version.split()[0],
+                "results": results
+            }, f, indent=2)
+        print(f"💾 Baseline saved to: {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
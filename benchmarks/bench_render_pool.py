@@ -0,0 +1,113 @@
+"""
+Batch Rendering Benchmark
+Role: Measure DOCX throughput for a batch of CVs rendered on one thread, on a thread pool sharing one
+DocumentBuilder (GIL-bound), and on the RenderService process pool.
+
+Usage (from the project root):
+    python -m benchmarks.bench_render_pool
+    python -m benchmarks.bench_render_pool --documents 400 --workers 8 --renderer ooxml
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
+
+from benchmarks.synthetic import make_profile
+from utils.document_builder import DocumentBuilder, get_template
+from utils.render_service import RenderService
+
+
+def run_strategy(strategy: str, profiles: List[Dict[str, Any]], workers: int, renderer: str) -> Dict[str, Any]:
+    """
+    Render every profile as a CV with one strategy.
+
+    Returns:
+        Wall-clock seconds and documents per second (pool start-up excluded)
+    """
+    if renderer == "ooxml":
+        from utils.ooxml_writer import OOXMLDocumentBuilder, get_package
+        builder: DocumentBuilder = OOXMLDocumentBuilder()
+        get_package()
+    else:
+        builder = DocumentBuilder()
+        get_template()
+
+    service = RenderService(workers=workers, renderer=renderer, timeout=None) if strategy == "process_pool" else None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            if strategy == "single_thread":
+                outputs = [builder.render_cv(profile) for profile in profiles]
+            elif strategy == "thread_pool":
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    outputs = list(pool.map(builder.render_cv, profiles))
+            else:
+                futures = [service.submit("cv", {"cv_data": profile}) for profile in profiles]
+                outputs = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start
+    finally:
+        if service is not None:
+            service.shutdown()
+
+    return {
+        "strategy": strategy,
+        "documents": len(outputs),
+        "bytes": sum(len(data) for data in outputs),
+        "wall_s": round(elapsed, 3),
+        "docs_per_s": round(len(outputs) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def check_backpressure(workers: int, renderer: str) -> Dict[str, Any]:
+    """Flood a pool with max_pending=workers and timeout=0: excess jobs are rejected, not queued."""
+    profile = make_profile(n_roles=8, seed=1)
+    with RenderService(workers=workers, max_pending=workers, renderer=renderer, timeout=0) as service:
+        futures = []
+        for _ in range(workers * 10):
+            try:
+                futures.append(service.submit("cv", {"cv_data": profile}))
+            except RuntimeError:
+                pass
+        for future in futures:
+            future.result()
+        return service.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch DOCX rendering: threads vs process pool")
+    parser.add_argument("--documents", type=int, default=200, help="CVs rendered per strategy")
+    parser.add_argument("--roles", type=int, default=8, help="Roles per synthetic CV")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Threads / worker processes")
+    parser.add_argument("--renderer", default="docx", choices=["docx", "ooxml"], help="DocumentBuilder backend")
+    parser.add_argument("--output", default=None, help="Save the results as JSON")
+    args = parser.parse_args()
+
+    profiles = [make_profile(n_roles=args.roles, seed=i) for i in range(args.documents)]
+    results = []
+    for strategy in ("single_thread", "thread_pool", "process_pool"):
+        print(f"⏱️  {strategy}...")
+        results.append(run_strategy(strategy, profiles, args.workers, args.renderer))
+
+    baseline = results[0]["docs_per_s"]
+    print(f"\n{'strategy':<16}{'wall s':>9}{'docs/s':>9}{'speedup':>9}")
+    for r in results:
+        print(f"{r['strategy']:<16}{r['wall_s']:>9}{r['docs_per_s']:>9}{r['docs_per_s'] / baseline:>8.2f}x")
+
+    stats = check_backpressure(args.workers, args.renderer)
+    print(f"\n🚦 Backpressure (max_pending={stats['max_pending']}, no wait): "
+          f"{stats['completed']} rendered, {stats['rejected']} rejected")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"results": results, "backpressure": stats}, f, indent=2)
+        print(f"💾 Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
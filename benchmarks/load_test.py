@@ -0,0 +1,344 @@
+"""
+End-to-End Load Test Harness
+Role: Replay a corpus of job descriptions against /apply (FastAPI) or /api/process (Flask) and report
+throughput, latency percentiles per pipeline stage, error rates and peak memory.
+
+Usage (from the project root):
+    # Closed loop: 8 concurrent clients, 100 requests in total
+    python -m benchmarks.load_test --target api --url http://127.0.0.1:8000 --concurrency 8 --requests 100
+
+    # Open loop: Poisson arrivals at 2 req/s for 60 seconds, compared with an earlier run
+    python -m benchmarks.load_test --target flask --url http://127.0.0.1:5000 --rate 2 --duration 60 \\
+        --compare benchmarks/results/previous.json
+
+Run the servers against llm_stub_server.py (DEEPSEEK_BASE_URL) or a replay cassette (LLM_CASSETTE)
+to measure the application itself rather than the LLM provider.
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+import requests
+
+from utils.llm_metrics import percentile
+from utils.stage_timer import peak_rss_mb
+
+TARGETS = {
+    "api": {"endpoint": "/apply", "metrics": "/metrics"},
+    "flask": {"endpoint": "/api/process", "metrics": "/api/metrics"},
+}
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "corpus")
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def load_corpus(corpus_dir: str) -> List[str]:
+    """Read every .txt job description in the corpus directory."""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.txt"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+    if not texts:
+        raise FileNotFoundError(f"No job descriptions (*.txt) found in {corpus_dir}")
+    return texts
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Latency summary in seconds."""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "avg": round(sum(values) / len(values), 4),
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "p99": round(percentile(values, 99), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Current commit hash, so runs can be compared across commits."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+class LoadTest:
+    """
+    Drives requests against one server and collects per-request results.
+    """
+
+    def __init__(self, base_url: str, target: str, corpus: List[str], timeout: float = 300.0):
+        self.base_url = base_url.rstrip("/")
+        self.target = TARGETS[target]
+        self.target_name = target
+        self.corpus = corpus
+        self.timeout = timeout
+        self.results: List[Dict[str, Any]] = []
+        # Open-loop arrivals not sent because max_inflight requests were outstanding
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._issued = 0
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _next_job(self) -> str:
+        with self._lock:
+            job = self.corpus[self._issued % len(self.corpus)]
+            self._issued += 1
+            return job
+
+    def send_one(self, scheduled: Optional[float] = None) -> None:
+        """
+        Send one application request and record its outcome.
+
+        Args:
+            scheduled: perf_counter() time the request was due (open loop); latency is
+                       measured from it, so time spent waiting to be sent is included
+        """
+        job_description = self._next_job()
+        start = time.perf_counter()
+        result: Dict[str, Any] = {"started": time.time()}
+        try:
+            response = self._session().post(
+                self.base_url + self.target["endpoint"],
+                json={"job_description": job_description},
+                timeout=self.timeout
+            )
+            result["status"] = response.status_code
+            result["ok"] = response.status_code == 200
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            result["timings"] = body.get("timings", {}) if isinstance(body, dict) else {}
+            if not result["ok"]:
+                result["error"] = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            result["status"] = None
+            result["ok"] = False
+            result["error"] = type(e).__name__
+        end = time.perf_counter()
+        result["latency"] = end - (start if scheduled is None else scheduled)
+        result["service_time"] = end - start
+
+        with self._lock:
+            self.results.append(result)
+
+    def run_closed_loop(self, concurrency: int, total_requests: Optional[int], duration: Optional[float]) -> None:
+        """N workers each send the next request as soon as the previous one completes."""
+        deadline = time.perf_counter() + duration if duration else None
+        budget = {"remaining": total_requests}
+
+        def take_ticket() -> bool:
+            if deadline and time.perf_counter() >= deadline:
+                return False
+            with self._lock:
+                if budget["remaining"] is None:
+                    return True
+                if budget["remaining"] <= 0:
+                    return False
+                budget["remaining"] -= 1
+                return True
+
+        def worker():
+            while take_ticket():
+                self.send_one()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for _ in range(concurrency):
+                pool.submit(worker)
+
+    def run_open_loop(self, rate: float, total_requests: Optional[int], duration: Optional[float], max_inflight: int) -> None:
+        """
+        Poisson arrivals at a fixed rate, independent of how fast the server answers.
+
+        Latency is measured from each arrival's scheduled time (no coordinated omission).
+        Arrivals while max_inflight requests are outstanding are counted in self.dropped
+        instead of being queued.
+        """
+        deadline = time.perf_counter() + duration if duration else None
+        issued = 0
+        slots = threading.BoundedSemaphore(max_inflight)
+
+        def send(scheduled: float) -> None:
+            try:
+                self.send_one(scheduled)
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=max_inflight) as pool:
+            next_arrival = time.perf_counter()
+            while True:
+                if total_requests is not None and issued >= total_requests:
+                    break
+                if deadline and next_arrival >= deadline:
+                    break
+                delay = next_arrival - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                if slots.acquire(blocking=False):
+                    pool.submit(send, next_arrival)
+                else:
+                    with self._lock:
+                        self.dropped += 1
+                issued += 1
+                next_arrival += random.expovariate(rate)
+
+    def fetch_server_metrics(self) -> Dict[str, Any]:
+        """Read the server's LLM metrics and peak RSS."""
+        try:
+            response = requests.get(self.base_url + self.target["metrics"], timeout=10)
+            return response.json() if response.status_code == 200 else {}
+        except (requests.RequestException, ValueError):
+            return {}
+
+    def report(self, config: Dict[str, Any], wall_time: float) -> Dict[str, Any]:
+        """Aggregate the collected results into a JSON-serializable report."""
+        successes = [r for r in self.results if r["ok"]]
+        errors: Dict[str, int] = {}
+        for r in self.results:
+            if not r["ok"]:
+                errors[r["error"]] = errors.get(r["error"], 0) + 1
+
+        stage_samples: Dict[str, List[float]] = {}
+        for r in successes:
+            for stage, seconds in r.get("timings", {}).items():
+                stage_samples.setdefault(stage, []).append(seconds)
+
+        server = self.fetch_server_metrics()
+        total = len(self.results)
+        return {
+            "target": self.target_name,
+            "url": self.base_url + self.target["endpoint"],
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": config,
+            "wall_time_s": round(wall_time, 3),
+            "requests": total,
+            "dropped_arrivals": self.dropped,
+            "successes": len(successes),
+            "error_rate": round((total - len(successes)) / total, 4) if total else 0.0,
+            "errors": errors,
+            "throughput_rps": round(len(successes) / wall_time, 3) if wall_time > 0 else 0.0,
+            "latency_s": summarize([r["latency"] for r in successes]),
+            "service_time_s": summarize([r["service_time"] for r in successes]),
+            "stages_s": {stage: summarize(samples) for stage, samples in stage_samples.items()},
+            "server_peak_rss_mb": server.get("peak_rss_mb"),
+            "server_llm_metrics": server.get("metrics", {}),
+            "client_peak_rss_mb": peak_rss_mb(),
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a human-readable summary of a load test report."""
+    print("\n" + "=" * 60)
+    print(f"📊 LOAD TEST REPORT ({report['target']} @ {report['commit']})")
+    print("=" * 60)
+    print(f"   Requests: {report['requests']} | OK: {report['successes']} | Error rate: {report['error_rate'] * 100:.1f}%")
+    print(f"   Throughput: {report['throughput_rps']} req/s over {report['wall_time_s']}s")
+    latency = report["latency_s"]
+    if latency.get("count"):
+        print(f"   Latency: p50 {latency['p50']}s | p95 {latency['p95']}s | p99 {latency['p99']}s")
+    for stage, stats in report["stages_s"].items():
+        print(f"   • {stage:<14} p50 {stats['p50']}s | p95 {stats['p95']}s | p99 {stats['p99']}s")
+    if report.get("dropped_arrivals"):
+        print(f"   ⚠️  Dropped arrivals: {report['dropped_arrivals']} (--max-inflight requests were outstanding; "
+              f"the offered rate was not sustained)")
+    if report["errors"]:
+        print(f"   Errors: {report['errors']}")
+    print(f"   Peak RSS: server {report['server_peak_rss_mb']} MB | client {report['client_peak_rss_mb']} MB")
+    print("=" * 60)
+
+
+def print_comparison(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print deltas against an earlier report."""
+    def delta(new, old):
+        if not new or not old:
+            return "n/a"
+        return f"{(new - old) / old * 100:+.1f}%"
+
+    print(f"\n🔁 Compared with {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    print(f"   Throughput: {baseline['throughput_rps']} → {report['throughput_rps']} req/s "
+          f"({delta(report['throughput_rps'], baseline['throughput_rps'])})")
+    for key in ("p50", "p95", "p99"):
+        old = baseline["latency_s"].get(key)
+        new = report["latency_s"].get(key)
+        print(f"   Latency {key}: {old} → {new}s ({delta(new, old)})")
+    print(f"   Error rate: {baseline['error_rate']} → {report['error_rate']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the application servers")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="api", help="api = FastAPI /apply, flask = /api/process")
+    parser.add_argument("--url", default=None, help="Server base URL (default: :8000 for api, :5000 for flask)")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory of job description .txt files")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--concurrency", type=int, default=4, help="Closed-loop concurrent clients")
+    mode.add_argument("--rate", type=float, default=None, help="Open-loop arrival rate (requests/second)")
+    parser.add_argument("--requests", type=int, default=None, help="Total requests to send")
+    parser.add_argument("--duration", type=float, default=None, help="Stop issuing requests after N seconds")
+    parser.add_argument("--max-inflight", type=int, default=256, help="Open-loop cap on outstanding requests (arrivals beyond it are dropped and counted)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request timeout (seconds)")
+    parser.add_argument("--output", default=None, help="Report path (default: benchmarks/results/<target>_<time>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier report to compare against")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.requests is None and args.duration is None:
+        args.requests = 20
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    base_url = args.url or ("http://127.0.0.1:8000" if args.target == "api" else "http://127.0.0.1:5000")
+    test = LoadTest(base_url, args.target, load_corpus(args.corpus), timeout=args.timeout)
+    config = {
+        "mode": "open" if args.rate else "closed",
+        "concurrency": None if args.rate else args.concurrency,
+        "rate": args.rate,
+        "requests": args.requests,
+        "duration": args.duration,
+        "max_inflight": args.max_inflight if args.rate else None,
+        "corpus_size": len(test.corpus),
+    }
+
+    print(f"🚀 Load testing {base_url}{TARGETS[args.target]['endpoint']} ({config['mode']} loop)...")
+    start = time.perf_counter()
+    if args.rate:
+        test.run_open_loop(args.rate, args.requests, args.duration, args.max_inflight)
+    else:
+        test.run_closed_loop(args.concurrency, args.requests, args.duration)
+    report = test.report(config, time.perf_counter() - start)
+    print_report(report)
+
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"{args.target}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Report saved to: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Synthetic Data Generators
+Role: Build deterministic profiles and job analyses of any size for benchmarks and load tests.
+"""
+
+import random
+from typing import Dict, Any, List
+
+BASE_SKILLS = [
+    "Python", "JavaScript", "TypeScript", "Java", "Go", "Rust", "SQL", "PostgreSQL", "MongoDB",
+    "Redis", "Docker", "Kubernetes", "AWS", "GCP", "Azure", "Terraform", "FastAPI", "Django",
+    "Flask", "React", "Node.js", "GraphQL", "Kafka", "Spark", "Airflow", "PyTorch", "TensorFlow",
+    "scikit-learn", "Machine Learning", "Data Engineering", "CI/CD", "Microservices", "REST APIs",
+    "LLMs", "RAG", "Prompt Engineering", "n8n", "Zapier", "Linux", "Git",
+]
+
+SOFT_SKILLS = ["Communication", "Leadership", "Mentoring", "Stakeholder Management", "Problem Solving"]
+
+VERBS = ["Built", "Designed", "Led", "Optimized", "Migrated", "Automated", "Scaled", "Delivered", "Reduced", "Improved"]
+OBJECTS = ["data pipelines", "REST APIs", "deployment workflows", "search infrastructure", "billing services",
+           "recommendation models", "monitoring dashboards", "customer onboarding", "ETL jobs", "agent workflows"]
+OUTCOMES = ["cutting latency by {n}%", "saving {n} hours per week", "increasing revenue by {n}%",
+            "serving {n}k daily users", "reducing costs by {n}%", "improving accuracy by {n}%"]
+
+
+def skill_vocabulary(n_skills: int, seed: int = 0) -> List[str]:
+    """Real-looking skill names, padded with synthetic ones up to n_skills."""
+    rng = random.Random(seed)
+    skills = list(BASE_SKILLS)
+    while len(skills) < n_skills:
+        base = rng.choice(BASE_SKILLS)
+        skills.append(f"{base} {rng.choice(['Advanced', 'Cloud', 'Platform', 'Tooling', 'Ops'])} {len(skills)}")
+    return skills[:n_skills]
+
+
+def make_bullet(rng: random.Random, skills: List[str]) -> str:
+    """One achievement bullet mentioning a couple of skills."""
+    used = rng.sample(skills, k=min(2, len(skills)))
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 80))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {used[0]} and {used[-1]}, {outcome}."
+
+
+def make_profile(n_roles: int = 5, n_skills: int = 50, bullets_per_role: int = 4, seed: int = 0) -> Dict[str, Any]:
+    """
+    Generate a master profile in the data/master_profile.json schema.
+
+    Args:
+        n_roles: Number of experience entries
+        n_skills: Number of distinct skills in the skills section
+        bullets_per_role: Achievements per role
+        seed: Random seed (same seed -> same profile)
+
+    Returns:
+        Profile dictionary
+    """
+    rng = random.Random(seed)
+    skills = skill_vocabulary(n_skills, seed)
+    experience = []
+    for i in range(n_roles):
+        start = 2024 - i
+        experience.append({
+            "company": f"Company {i}",
+            "title": rng.choice(["Software Engineer", "Senior Engineer", "Data Engineer", "Tech Lead", "ML Engineer"]),
+            "dates": f"{start - 1} - {start}",
+            "location": rng.choice(["Remote", "London", "Berlin", "Karachi", "New York"]),
+            "achievements": [make_bullet(rng, skills) for _ in range(bullets_per_role)]
+        })
+
+    return {
+        "personal_info": {
+            "name": "Synthetic Candidate",
+            "email": "candidate@example.com",
+            "phone": "+1 555-0100",
+            "linkedin": "linkedin.com/in/synthetic",
+            "location": "Remote"
+        },
+        "summary": "Engineer with experience across " + ", ".join(skills[:8]) + ". Delivers measurable impact in production systems.",
+        "skills": {
+            "Technical": skills,
+            "Soft Skills": list(SOFT_SKILLS)
+        },
+        "experience": experience,
+        "education": [{"school": "Synthetic University", "degree": "BSc Computer Science", "dates": "2010 - 2014"}],
+        "projects": [
+            {"name": f"Project {i}", "description": make_bullet(rng, skills)}
+            for i in range(max(1, n_roles // 5))
+        ]
+    }
+
+
+def make_job_analysis(
+    n_required: int = 8,
+    n_nice: int = 5,
+    n_keywords: int = 15,
+    vocabulary_size: int = 200,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Generate a job analysis in the JobAnalyzer output schema.
+
+    Args:
+        n_required: Number of must-have skills
+        n_nice: Number of nice-to-have skills
+        n_keywords: Number of ATS keywords
+        vocabulary_size: Size of the skill pool the job draws from
+        seed: Random seed
+
+    Returns:
+        Job analysis dictionary
+    """
+    rng = random.Random(seed)
+    pool = skill_vocabulary(max(vocabulary_size, n_required + n_nice + n_keywords), seed + 1)
+    rng.shuffle(pool)
+    return {
+        "role_info": {
+            "title": rng.choice(["Backend Engineer", "Data Engineer", "ML Engineer", "Platform Engineer"]),
+            "company": f"Employer {seed}",
+            "location": "Remote",
+            "level": rng.choice(["Mid", "Senior", "Lead"])
+        },
+        "requirements": {
+            "must_have_skills": pool[:n_required],
+            "nice_to_have_skills": pool[n_required:n_required + n_nice],
+            "education": "BSc Computer Science",
+            "years_experience": f"{rng.randint(2, 8)} years"
+        },
+        "keywords": {
+            "ats_keywords": pool[:n_keywords // 2] + [rng.choice(OBJECTS) for _ in range(n_keywords - n_keywords // 2)],
+            "soft_skills": rng.sample(SOFT_SKILLS, 2)
+        },
+        "summary": "Synthetic job analysis for benchmarking."
+    }
@@ -0,0 +1,511 @@
+"""
+Local OpenAI-compatible LLM Stub Server
+Role: Serve canned /chat/completions responses so api.py and app.py can be load-tested end-to-end without network access.
+
+Usage:
+    python llm_stub_server.py --port 8001 --latency-ms 800 --latency-dist lognormal --error-rate 0.02
+
+Then point DeepSeekClient at it:
+    DEEPSEEK_BASE_URL=http://127.0.0.1:8001 DEEPSEEK_API_KEY=stub python api.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Set
+
+LOREM_SENTENCES = [
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore.",
+    "Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.",
+    "Duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur.",
+    "Excepteur sint occaecat cupidatat non proident, sunt in culpa qui officia deserunt mollit anim id est laborum.",
+    "Sed ut perspiciatis unde omnis iste natus error sit voluptatem accusantium doloremque laudantium.",
+    "Nemo enim ipsam voluptatem quia voluptas sit aspernatur aut odit aut fugit, sed quia consequuntur magni.",
+]
+
+# Data header line of an agent prompt, e.g. "JOB DESCRIPTION:"
+_HEADER = re.compile(r"^[A-Z][A-Z /-]*:$")
+
+CANNED_SKILLS = ["Python", "FastAPI", "Docker", "PostgreSQL", "AWS", "LLMs", "RAG", "CI/CD"]
+
+
+class StubConfig:
+    """
+    Behaviour knobs for the stub server.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 500.0,
+        latency_jitter_ms: float = 200.0,
+        latency_dist: str = "normal",
+        tokens_per_second: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            latency_ms: Mean time-to-first-token in milliseconds
+            latency_jitter_ms: Spread of the latency distribution (std-dev / half-width)
+            latency_dist: 'fixed', 'uniform', 'normal' or 'lognormal'
+            tokens_per_second: Simulated output speed (0 = instant output)
+            error_rate: Fraction of requests answered with an error (0-1)
+            error_status: HTTP status used for injected errors (e.g. 429 or 500)
+            seed: Random seed for reproducible runs
+        """
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.latency_dist = latency_dist
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample_latency(self) -> float:
+        """Draw a time-to-first-token in seconds from the configured distribution."""
+        mean, jitter = self.latency_ms, self.latency_jitter_ms
+        with self._lock:
+            if self.latency_dist == "fixed":
+                value = mean
+            elif self.latency_dist == "uniform":
+                value = self.random.uniform(mean - jitter, mean + jitter)
+            elif self.latency_dist == "lognormal":
+                # Parameterize so the distribution mean equals latency_ms
+                sigma = min(jitter / mean, 2.0) if mean > 0 else 0.0
+                value = mean * self.random.lognormvariate(-(sigma ** 2) / 2, sigma)
+            else:
+                value = self.random.gauss(mean, jitter)
+        return max(value, 0.0) / 1000
+
+    def should_fail(self) -> bool:
+        """Decide whether to inject an error for this request."""
+        with self._lock:
+            return self.random.random() < self.error_rate
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def _extract_json_after(text: str, marker: str) -> Optional[Dict[str, Any]]:
+    """Decode the first JSON object that follows a marker in the prompt."""
+    position = text.find(marker)
+    if position == -1:
+        return None
+    start = text.find("{", position)
+    if start == -1:
+        return None
+    try:
+        obj, _ = json.JSONDecoder().raw_decode(text[start:])
+        return obj
+    except json.JSONDecodeError:
+        return None
+
+
+def _job_title(prompt: str) -> str:
+    """Pull a job title out of the job description, if it states one."""
+    match = re.search(r'(?:Job Title|Title|Position)\s*:\s*(.+)', prompt)
+    return match.group(1).strip() if match else "Software Engineer"
+
+
+def canned_job_analysis(prompt: str) -> Dict[str, Any]:
+    """Schema-valid response for JobAnalyzer."""
+    return {
+        "role_info": {
+            "title": _job_title(prompt),
+            "company": "Unknown",
+            "location": "Remote",
+            "level": "Senior"
+        },
+        "requirements": {
+            "must_have_skills": CANNED_SKILLS[:5],
+            "nice_to_have_skills": CANNED_SKILLS[5:],
+            "education": "Bachelor's degree in Computer Science",
+            "years_experience": "5 years"
+        },
+        "keywords": {
+            "ats_keywords": CANNED_SKILLS + ["microservices", "automation"],
+            "soft_skills": ["Communication", "Leadership"]
+        },
+        "summary": "Senior engineering role building backend services. Focus on Python and cloud infrastructure."
+    }
+
+
+def canned_cv(prompt: str) -> Dict[str, Any]:
+    """Schema-valid response for CVCustomizer, derived from the profile embedded in the prompt."""
+    profile = _extract_json_after(prompt, "CANDIDATE BASE PROFILE:") or {}
+    experience = []
+    for role in profile.get("experience", [])[:4]:
+        bullets = role.get("achievements") or role.get("responsibilities") or []
+        experience.append({
+            "company": role.get("company", "Company"),
+            "title": role.get("title", "Engineer"),
+            "dates": role.get("dates", ""),
+            "achievements": (bullets[:4] or LOREM_SENTENCES[:3])
+        })
+    return {
+        "personal_info": profile.get("personal_info", {"name": "Stub Candidate"}),
+        "summary": " ".join(LOREM_SENTENCES[:2]),
+        "skills": profile.get("skills") or {"Technical": CANNED_SKILLS, "Soft Skills": ["Communication"]},
+        "experience": experience,
+        "education": profile.get("education", [])
+    }
+
+
+def canned_linkedin_profile(prompt: str) -> Dict[str, Any]:
+    """Schema-valid response for LinkedInScraper."""
+    return {
+        "personal_info": {
+            "name": "Stub Candidate",
+            "email": None,
+            "phone": None,
+            "linkedin": "https://www.linkedin.com/in/stub-candidate",
+            "location": "Remote",
+            "headline": "Software Engineer"
+        },
+        "summary": LOREM_SENTENCES[0],
+        "skills": {"Technical": CANNED_SKILLS[:4], "Soft Skills": ["Communication"], "Tools": ["Docker"]},
+        "experience": [{
+            "company": "Stub Corp",
+            "title": "Software Engineer",
+            "dates": "2020 - Present",
+            "location": "Remote",
+            "responsibilities": LOREM_SENTENCES[:3]
+        }],
+        "education": [{
+            "school": "Stub University",
+            "degree": "BSc",
+            "field": "Computer Science",
+            "dates": "2014 - 2018"
+        }],
+        "certifications": []
+    }
+
+
+def canned_cover_letter(prompt: str, variant: int = 0) -> str:
+    """Four lorem paragraphs shaped like a cover letter body."""
+    rng = random.Random(variant)
+    paragraphs = []
+    for _ in range(4):
+        sentences = rng.sample(LOREM_SENTENCES, 3)
+        paragraphs.append(" ".join(sentences))
+    return "\n\n".join(paragraphs)
+
+
+def _extract_list_after(text: str, marker: str) -> List[Any]:
+    """Decode the first JSON array that follows a marker in the prompt."""
+    position = text.find(marker)
+    start = text.find("[", position) if position != -1 else -1
+    if start == -1:
+        return []
+    try:
+        items, _ = json.JSONDecoder().raw_decode(text[start:])
+        return items if isinstance(items, list) else []
+    except json.JSONDecodeError:
+        return []
+
+
+def canned_section_rewrite(prompt: str) -> Dict[str, Any]:
+    """Schema-valid response for ATSOptimizer: the current section with the missing keywords worked in."""
+    current = _extract_json_after(prompt, "CURRENT SECTION:") or {}
+    keywords = [str(k) for k in _extract_list_after(prompt, "MISSING KEYWORDS:")]
+    mention = ", ".join(keywords[:5]) or "the required stack"
+    if "SECTION TYPE: experience" in prompt:
+        bullets = list(current.get("achievements") or LOREM_SENTENCES[:2])
+        return {"achievements": bullets + [f"Applied {mention} in production systems."]}
+    if "SECTION TYPE: skills" in prompt:
+        skills = current if isinstance(current, dict) and current else {"Technical": []}
+        first = next(iter(skills))
+        return {"skills": {**skills, first: list(skills[first]) + keywords}}
+    return {"summary": f"{current.get('summary', LOREM_SENTENCES[0])} Experienced with {mention}."}
+
+
+def canned_section_customization(prompt: str) -> Dict[str, Any]:
+    """Schema-valid responses for CVCustomizer's parallel mode (bullets 1:1, summary, skills)."""
+    if "ROLE BULLET REWRITE" in prompt:
+        bullets = _extract_list_after(prompt, "BULLETS:")
+        return {"achievements": [f"{bullet} (tailored)" for bullet in bullets]}
+    if "SKILLS SELECTION" in prompt:
+        return {"skills": _extract_json_after(prompt, "CURRENT SKILLS:") or {"Technical": CANNED_SKILLS}}
+    return {"summary": " ".join(LOREM_SENTENCES[:2])}
+
+
+def canned_edit_script(prompt: str) -> Dict[str, Any]:
+    """Schema-valid edit script for CVCustomizer's 'edits' mode, using the IDs tagged in the prompt."""
+    role_ids = list(dict.fromkeys(re.findall(r'\[(r\d+)\]', prompt)))[:4]
+    operations: List[Dict[str, Any]] = [
+        {"op": "set_summary", "text": " ".join(LOREM_SENTENCES[:2])},
+        {"op": "select_roles", "ids": role_ids},
+        {"op": "order_skills", "ids": list(dict.fromkeys(re.findall(r'\[(s\d+)\]', prompt)))}
+    ]
+    for role_id in role_ids:
+        bullet_ids = list(dict.fromkeys(re.findall(rf'\[({role_id}\.b\d+)\]', prompt)))[:4]
+        if bullet_ids:
+            operations.append({"op": "select_bullets", "ids": bullet_ids})
+            operations.append({"op": "replace_bullet", "id": bullet_ids[0], "text": LOREM_SENTENCES[0]})
+    return {"operations": operations}
+
+
+def prompt_task(prompt: str) -> str:
+    """Task marker of a prompt: its first non-empty line (e.g. "CV EDIT SCRIPT")."""
+    for line in prompt.splitlines():
+        if line.strip():
+            return line.strip()
+    return ""
+
+
+def prompt_headers(prompt: str) -> Set[str]:
+    """Data headers of a prompt: lines that consist only of an upper-case label and a colon."""
+    return {line.strip() for line in prompt.splitlines() if _HEADER.match(line.strip())}
+
+
+def build_completion_text(messages: List[Dict[str, str]], variant: int = 0) -> str:
+    """
+    Pick a canned response based on the task marker or data headers of the agent's prompt.
+
+    Args:
+        messages: Chat messages from the request
+        variant: Choice index (for n > 1)
+
+    Returns:
+        Response content string
+    """
+    system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    prompt = " ".join(m.get("content", "") for m in messages if m.get("role") == "user")
+
+    task = prompt_task(prompt)
+    if task == "TARGETED SECTION REWRITE":
+        return json.dumps(canned_section_rewrite(prompt), indent=2)
+    if task == "CV EDIT SCRIPT":
+        return json.dumps(canned_edit_script(prompt), indent=2)
+    if task in ("ROLE BULLET REWRITE", "SUMMARY REWRITE", "SKILLS SELECTION"):
+        return json.dumps(canned_section_customization(prompt), indent=2)
+    if task == "COMBINED APPLICATION":
+        return json.dumps({"cv": canned_cv(prompt), "cover_letter": canned_cover_letter(prompt, variant)}, indent=2)
+
+    # Route on whole header lines, never on free text: job descriptions mention "cover letter"
+    # and cover letter prompts embed the job analysis JSON
+    headers = prompt_headers(prompt)
+    if "CANDIDATE BASE PROFILE:" in headers:
+        return json.dumps(canned_cv(prompt), indent=2)
+    if "LINKEDIN PROFILE CONTENT:" in headers:
+        return json.dumps(canned_linkedin_profile(prompt), indent=2)
+    if "CANDIDATE PROFILE:" in headers and "JOB ANALYSIS:" in headers:
+        return canned_cover_letter(prompt, variant)
+    if "JOB DESCRIPTION:" in headers:
+        return json.dumps(canned_job_analysis(prompt), indent=2)
+    if "JSON" in system or "JSON" in prompt:
+        return json.dumps({"result": LOREM_SENTENCES[0]})
+    return canned_cover_letter(prompt, variant)
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Minimal OpenAI-compatible request handler.
+    """
+
+    server_version = "LLMStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def config(self) -> StubConfig:
+        return self.server.stub_config
+
+    def log_message(self, format: str, *args) -> None:
+        """Keep the console quiet under load unless verbose logging was requested."""
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") in ("", "/health"):
+            self._send_json(200, {"status": "online", "message": "LLM stub server"})
+        elif self.path.rstrip("/") in ("/models", "/v1/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "deepseek-chat", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") not in ("/chat/completions", "/v1/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+            return
+
+        time.sleep(self.config.sample_latency())
+
+        if self.config.should_fail():
+            status = self.config.error_status
+            error_type = "rate_limit_error" if status == 429 else "server_error"
+            self._send_json(status, {"error": {"message": "Injected stub error", "type": error_type}})
+            return
+
+        messages = request.get("messages", [])
+        n = max(1, int(request.get("n") or 1))
+        contents = [build_completion_text(messages, variant) for variant in range(n)]
+        prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in messages)
+
+        if request.get("max_tokens"):
+            # Mimic truncation by the token cap (~4 chars per token)
+            contents = [c[: int(request["max_tokens"]) * 4] for c in contents]
+
+        if request.get("stream"):
+            self._stream(request, contents[0], prompt_tokens)
+        else:
+            self._complete(request, contents, prompt_tokens)
+
+    def _complete(self, request: Dict[str, Any], contents: List[str], prompt_tokens: int) -> None:
+        completion_tokens = sum(estimate_tokens(c) for c in contents)
+        if self.config.tokens_per_second > 0:
+            time.sleep(completion_tokens / self.config.tokens_per_second)
+
+        self._send_json(200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "deepseek-chat"),
+            "choices": [
+                {"index": i, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                for i, content in enumerate(contents)
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_cache_hit_tokens": 0,
+                "prompt_cache_miss_tokens": prompt_tokens
+            }
+        })
+
+    def _stream(self, request: Dict[str, Any], content: str, prompt_tokens: int) -> None:
+        """Send the content as server-sent events, paced by tokens_per_second."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = request.get("model", "deepseek-chat")
+        pieces = re.findall(r'\S+\s*|\s+', content)
+
+        def send_event(payload: Any) -> None:
+            data = payload if isinstance(payload, str) else json.dumps(payload)
+            self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        for piece in pieces:
+            if self.config.tokens_per_second > 0:
+                time.sleep(estimate_tokens(piece) / self.config.tokens_per_second)
+            send_event({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+            })
+
+        completion_tokens = estimate_tokens(content)
+        send_event({
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+        send_event("[DONE]")
+
+
+def start_stub_server(
+    host: str = "127.0.0.1",
+    port: int = 8001,
+    config: Optional[StubConfig] = None,
+    verbose: bool = False
+) -> ThreadingHTTPServer:
+    """
+    Start the stub server on a background thread.
+
+    Args:
+        host: Interface to bind
+        port: Port to listen on (0 picks a free port)
+        config: Stub behaviour configuration
+        verbose: Log every request
+
+    Returns:
+        The running server (call .shutdown() to stop it)
+    """
+    server = ThreadingHTTPServer((host, port), StubRequestHandler)
+    server.daemon_threads = True
+    server.stub_config = config or StubConfig()
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible LLM stub server for offline load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Mean time-to-first-token (ms)")
+    parser.add_argument("--latency-jitter-ms", type=float, default=200.0, help="Latency spread (ms)")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "normal", "lognormal"], default="normal")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Simulated output speed (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail (0-1)")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status for injected errors")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        latency_dist=args.latency_dist,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed
+    )
+    server = ThreadingHTTPServer((args.host, args.port), StubRequestHandler)
+    server.daemon_threads = True
+    server.stub_config = config
+    server.verbose = args.verbose
+
+    print(f"🧪 LLM stub server listening on http://{args.host}:{args.port}")
+    print(f"💡 Point the agents at it with: DEEPSEEK_BASE_URL=http://{args.host}:{args.port}")
+    print("🛑 Press Ctrl+C to stop the server\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,9 @@ Role: Coordinate the workflow between JobAnalyzer, CVCustomizer, and DocumentBui
 import os
 import sys
 import json
-from typing import Dict, Any
+import time
+import argparse
+from typing import Dict, Any, List
 from dotenv import load_dotenv
 
 # Fix Windows console encoding for emojis
@@ -20,12 +22,15 @@ if sys.platform == 'win32':
         pass
 
 # Import our modular components
-from utils.deepseek_client import DeepSeekClient
-from utils.document_builder import DocumentBuilder
+from utils.model_router import ModelRouter
+from utils.document_builder import DocumentBuilder, DOCUMENT_FORMATS
+from utils.run_store import RunStore, RUN_DOCUMENTS, new_run_id, render_run
 from utils.match_calculator import MatchCalculator
 from agents.job_analyzer import JobAnalyzer
 from agents.cv_customizer import CVCustomizer
+from agents.ats_optimizer import ATSOptimizer
 from agents.cover_letter_generator import CoverLetterGenerator
+from agents.application_writer import ApplicationWriter
 from utils.rag_engine import RAGEngine
 
 # Load environment variables
@@ -55,54 +60,6 @@ def load_profile(path: str = "data/master_profile.json") -> Dict[str, Any]:
         print(f"❌ Error: Invalid JSON in {path}")
         sys.exit(1)
 
-def calculate_match_score(customized_cv: Dict[str, Any], job_keywords: List[str]) -> Dict[str, Any]:
-    """
-    Calculate the keyword match score between the CV and Job requirements.
-    
-    Args:
-        customized_cv: The tailored CV data
-        job_keywords: List of keywords extracted from job description
-        
-    Returns:
-        Dictionary with score metrics
-    """
-    # 1. Flatten CV content into a single string for searching
-    cv_text = f"{customized_cv.get('summary', '')} "
-    
-    # Add skills
-    skills_data = customized_cv.get('skills', {})
-    if isinstance(skills_data, dict):
-        for category in skills_data:
-            cv_text += " ".join(skills_data[category]) + " "
-    
-    # Add experience achievements
-    for role in customized_cv.get('experience', []):
-        cv_text += f"{role.get('title', '')} "
-        cv_text += " ".join(role.get('achievements', [])) + " "
-    
-    cv_text = cv_text.lower()
-    
-    # 2. Count matches
-    matched = []
-    missing = []
-    
-    for kw in job_keywords:
-        if kw.lower() in cv_text:
-            matched.append(kw)
-        else:
-            missing.append(kw)
-            
-    total = len(job_keywords)
-    score = (len(matched) / total * 100) if total > 0 else 0
-    
-    return {
-        "score": round(score, 1),
-        "total": total,
-        "matched_count": len(matched),
-        "matched_list": matched,
-        "missing_list": missing
-    }
-
 def get_job_description() -> str:
     """
     Get job description from user input.
@@ -127,21 +84,24 @@ def main():
     print("🚀 AI-Powered Job Application Agent Initializing (DeepSeek Edition)...")
     
     # 1. Setup & Config
-    api_key = os.getenv("DEEPSEEK_API_KEY")
-    if not api_key:
-        print("❌ Error: DEEPSEEK_API_KEY not found in environment variables.")
-        print("💡 Tip: Add DEEPSEEK_API_KEY=your_key to .env file.")
+    router = ModelRouter.from_env()
+    missing_keys = router.missing_api_keys()
+    if missing_keys:
+        print(f"❌ Error: {', '.join(missing_keys)} not found in environment variables.")
+        print(f"💡 Tip: Add {missing_keys[0]}=your_key to .env file.")
         return
+    if router.is_offline:
+        print(f"📼 Replaying LLM responses from cassette: {router.cassette.path}")
 
     try:
-        client = DeepSeekClient(api_key=api_key)
-        builder = DocumentBuilder()
+        builder = DocumentBuilder.from_env()
         match_calculator = MatchCalculator()
         
-        # Initialize Agents
-        job_analyzer = JobAnalyzer(client)
-        cv_customizer = CVCustomizer(client)
-        cover_letter_generator = CoverLetterGenerator(client)
+        # Initialize Agents (each agent gets the model configured for its route)
+        job_analyzer = JobAnalyzer(router.get_client("job_analyzer"))
+        cv_customizer = CVCustomizer(router.get_client("cv_customizer"))
+        cover_letter_generator = CoverLetterGenerator(router.get_client("cover_letter_generator"))
+        application_writer = ApplicationWriter.from_router(router, cv_customizer, cover_letter_generator)
         rag_engine = RAGEngine()
 
         # 2. Load Data
@@ -167,28 +127,8 @@ def main():
         # 4.5. RAG Retrieval (New Strategic Improvement)
         print("\n🔍 Phase 1.5: Retrieving Relevant Contexts (RAG)...")
         keywords = analysis.get("keywords", {}).get("ats_keywords", [])
-        relevant_snippets = rag_engine.retrieve_relevant_experience(keywords)
-        
-        # 5. Customize CV
-        print("\n🎨 Phase 2: Customizing CV...")
-        customized_cv = cv_customizer.customize(profile, analysis, relevant_snippets)
-        print("✅ CV content customized for ATS optimization.")
-
-        # 5.1 Calculate Match Score (New Validation Step)
-        job_keywords = analysis.get("keywords", {}).get("ats_keywords", [])
-        match_metrics = calculate_match_score(customized_cv, job_keywords)
-        print(f"\n📊 ATS Match Score: {match_metrics['score']}%")
-        print(f"   🔑 Keywords Matched: {match_metrics['matched_count']}/{match_metrics['total']}")
+        relevant_snippets = rag_engine.retrieve_relevant_experience(keywords, profile=profile)
         
-        if match_metrics['score'] < 70:
-            print(f"   ⚠️  Warning: Lower match score. Consider adding more details to your master profile.")
-        
-        # 6. Generate Information
-        print("\n✍️  Phase 3: Writing Cover Letter...")
-        cover_letter_text = cover_letter_generator.generate(profile, analysis)
-
-        # 7. Generate Documents
-        print("\n📄 Phase 4: Generating Documents...")
         # Sanitize filename for Windows
         import re
         def sanitize_filename(name):
@@ -203,20 +143,133 @@ def main():
         cv_filename = f"output/CV_{safe_company}_{safe_title}.docx"
         cl_filename = f"output/CL_{safe_company}_{safe_title}.docx"
         
-        # Save CV
+        # 5. Customize CV and write the cover letter (two calls or one combined call);
+        # the letter is rendered as it arrives when COVER_LETTER_STREAM is on
+        print(f"\n🎨 Phase 2: Customizing CV and writing cover letter ({application_writer.mode})...")
+        customized_cv, cover_letters = application_writer.generate(
+            profile, analysis, relevant_snippets,
+            cover_letter_sink=lambda chunks: builder.create_cover_letter_streaming(chunks, profile, cl_filename)
+        )
+        print("✅ CV content customized for ATS optimization.")
+
+        # 5.0.1 Closed-loop ATS optimization: re-prompt only the weakest sections
+        if ATSOptimizer.enabled():
+            ats_optimizer = ATSOptimizer(router.get_client("ats_optimizer"), match_calculator)
+            customized_cv, _ = ats_optimizer.optimize(customized_cv, analysis, profile)
+
+        # 5.1 Calculate Match Score (New Validation Step)
+        # Same engine as the web app; sections shared with the master profile are not re-tokenized
+        profile_match = match_calculator.calculate_match_score(profile, analysis)
+        match_metrics = match_calculator.calculate_match_score(customized_cv, analysis)
+        print(f"\n📊 ATS Match Score: {match_metrics['overall_score']}% (master profile: {profile_match['overall_score']}%)")
+        print(f"   🔑 Keywords Matched: {match_metrics['keywords_matched']}/{match_metrics['keywords_total']}")
+        
+        if match_metrics['overall_score'] < 70:
+            print(f"   ⚠️  Warning: Lower match score. Consider adding more details to your master profile.")
+        
+        # 7. Generate Documents
+        print("\n📄 Phase 3: Generating Documents...")
+        # Save CV (the cover letter was written during Phase 2)
         builder.create_cv(customized_cv, cv_filename)
-        # Save Cover Letter
-        builder.create_cover_letter(cover_letter_text, profile, cl_filename)
+        # Extra variants (COVER_LETTER_VARIANTS) are rendered from the same response
+        for variant in range(1, len(cover_letters)):
+            builder.create_cover_letter(cover_letters, profile, cl_filename.replace(".docx", f"_v{variant + 1}.docx"), variant=variant)
+        
+        # Keep the intermediate results so the documents can be re-rendered without the LLM
+        run_store = RunStore.from_env(default_directory="output/runs")
+        run_id = None
+        if run_store is not None:
+            run_id = new_run_id()
+            run_store.save(
+                run_id, profile, analysis, customized_cv, cover_letters,
+                match={"profile": profile_match, "cv": match_metrics},
+                file_stems={"cv": f"CV_{safe_company}_{safe_title}", "cover_letter": f"CL_{safe_company}_{safe_title}"},
+                source="cli"
+            )
         
         print(f"\n✨ SUCCESS!")
         print(f"   1. CV: {cv_filename}")
         print(f"   2. Cover Letter: {cl_filename}")
+        if len(cover_letters) > 1:
+            print(f"      (+{len(cover_letters) - 1} alternative versions saved alongside)")
+        if run_id:
+            print(f"   🗂️  Run {run_id} saved; re-render with: python main.py rerender {run_id} --font Georgia")
         print("   Good luck with your application! 🚀")
 
+        router.metrics.print_report()
+        if cv_customizer.bullet_cache is not None:
+            cv_customizer.bullet_cache.print_report()
+
     except Exception as e:
         print(f"\n❌ An error occurred during the process: {e}")
         import traceback
         traceback.print_exc()
 
+def rerender(argv: List[str]):
+    """
+    Re-render the documents of a saved run with other layout options (no LLM call).
+    
+    Args:
+        argv: Command line arguments after 'rerender'
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py rerender",
+        description="Re-render the documents of a saved run with other layout options, without calling the LLM"
+    )
+    parser.add_argument("run_id", nargs="?", help="Run to re-render (see --list)")
+    parser.add_argument("--list", action="store_true", help="List the most recent saved runs")
+    parser.add_argument("--format", choices=DOCUMENT_FORMATS, default="docx", help="Output format")
+    parser.add_argument("--font", default=None, help="Body font, e.g. Georgia")
+    parser.add_argument("--font-size", type=float, default=None, help="Body font size in points")
+    parser.add_argument("--section-order", default=None,
+                        help="Comma-separated CV sections, e.g. experience,skills,education,summary (left out = omitted)")
+    parser.add_argument("--variant", type=int, default=0, help="Cover letter variant (0 = first)")
+    parser.add_argument("--only", choices=RUN_DOCUMENTS, default=None, help="Render just one document")
+    parser.add_argument("--output-dir", default=None,
+                        help="Where to save the documents (default: output/runs/<run_id>/, so the originals in output/ are kept)")
+    args = parser.parse_args(argv)
+
+    run_store = RunStore.from_env(default_directory="output/runs")
+    if run_store is None:
+        print("❌ Error: The run store is disabled (RUN_STORE_DIR is empty).")
+        return
+    if args.list or not args.run_id:
+        runs = run_store.list_runs()
+        if not runs:
+            print(f"📭 No saved runs in {run_store.directory}")
+        for run in runs:
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(run["created_at"]))
+            print(f"   {run['run_id']}  {created}  {run['role_title']} at {run['company']} ({run['source']})")
+        return
+
+    try:
+        record = run_store.load(args.run_id)
+        if record is None:
+            print(f"❌ Error: No saved run '{args.run_id}' in {run_store.directory}")
+            return
+        builder = DocumentBuilder.from_env().with_options(
+            font_name=args.font,
+            font_size=args.font_size,
+            section_order=[s.strip() for s in args.section_order.split(",")] if args.section_order else None
+        )
+        start = time.perf_counter()
+        rendered = render_run(record, builder, [args.only] if args.only else RUN_DOCUMENTS, args.format, args.variant)
+        render_ms = (time.perf_counter() - start) * 1000
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return
+
+    output_dir = args.output_dir or os.path.join("output", "runs", args.run_id)
+    os.makedirs(output_dir, exist_ok=True)
+    for document, (filename, data) in rendered.items():
+        path = os.path.join(output_dir, filename)
+        with open(path, 'wb') as f:
+            f.write(data)
+        print(f"✅ {document}: {path}")
+    print(f"⚡ Re-rendered {record['role_title']} at {record['company']} in {render_ms:.1f} ms")
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "rerender":
+        rerender(sys.argv[2:])
+    else:
+        main()
@@ -1,5 +1,10 @@
 """
 Test script for the Agentic AI API
+
+Set LLM_CASSETTE (and LLM_CASSETTE_MODE=replay) to run the pipeline offline
+against recorded LLM responses instead of the live DeepSeek API.
+tests/test_pipeline_replay.py does this without a server, using the recorded
+cassette in tests/cassettes/.
 """
 
 import requests
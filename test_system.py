@@ -22,7 +22,8 @@ def check_dependencies():
         'openai': 'openai',
         'docx': 'python-docx',
         'tenacity': 'tenacity',
-        'dotenv': 'python-dotenv'
+        'dotenv': 'python-dotenv',
+        'numpy': 'numpy'
     }
     
     missing = []
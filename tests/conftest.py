@@ -0,0 +1,8 @@
+"""
+Shared pytest setup: run the suite from any directory with the project root importable.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,136 @@
+"""
+Tests for the artifact store backends: content addressing, TTL and garbage collection, memory
+eviction, and the object-store path with paginated listings and S3-style not-found errors.
+"""
+
+import time
+
+import pytest
+
+from utils.artifact_store import (
+    DiskArtifactStore, LocalObjectStoreClient, MemoryArtifactStore, ObjectStoreArtifactStore, content_disposition
+)
+
+BACKENDS = ["memory", "disk", "object"]
+
+
+def make_store(kind, tmp_path, **kwargs):
+    if kind == "memory":
+        return MemoryArtifactStore(**kwargs)
+    if kind == "disk":
+        return DiskArtifactStore(str(tmp_path / "artifacts"), **kwargs)
+    return ObjectStoreArtifactStore(LocalObjectStoreClient(str(tmp_path / "bucket")), "artifacts", **kwargs)
+
+
+@pytest.mark.parametrize("kind", BACKENDS)
+def test_round_trip(kind, tmp_path):
+    store = make_store(kind, tmp_path)
+    data = b"x" * 200_000
+    meta = store.put(data, "CV.docx")
+    assert store.put(data, "CV.docx")["key"] == meta["key"]
+    opened = store.open(meta["key"], chunk_size=64 * 1024)
+    assert opened[0]["filename"] == "CV.docx" and opened[0]["size"] == len(data)
+    chunks = list(opened[1])
+    assert b"".join(chunks) == data and max(len(chunk) for chunk in chunks) <= 64 * 1024
+    assert store.stats()["artifacts"] == 1
+
+    store.delete(meta["key"])
+    assert store.get(meta["key"]) is None and store.open(meta["key"]) is None
+
+
+@pytest.mark.parametrize("kind", BACKENDS)
+def test_unknown_and_invalid_keys(kind, tmp_path):
+    store = make_store(kind, tmp_path)
+    assert store.get("0" * 64) is None
+    assert store.open("../../etc/passwd") is None
+    store.delete("0" * 64)
+
+
+@pytest.mark.parametrize("kind", BACKENDS)
+def test_expired_artifacts_are_hidden_then_collected(kind, tmp_path):
+    store = make_store(kind, tmp_path, ttl_seconds=10, gc_interval_seconds=3600)
+    old = store.put(b"old", "old.docx")
+    new = store.put(b"new", "new.docx")
+    assert store.collect_garbage(now=time.time() + 5) == 0
+
+    later = time.time() + 60
+    assert store.collect_garbage(now=later) == 2
+    assert store.stats()["artifacts"] == 0
+    assert store.read(old["key"]) is None and store.read(new["key"]) is None
+
+
+def test_memory_store_evicts_oldest_beyond_max_bytes():
+    store = MemoryArtifactStore(max_bytes=10)
+    first = store.put(b"a" * 6, "a")
+    second = store.put(b"b" * 6, "b")
+    assert store.get(first["key"]) is None
+    assert store.read(second["key"]) == b"b" * 6
+
+
+class PagedClient(LocalObjectStoreClient):
+    """Local client with tiny listing pages, to exercise continuation tokens."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.list_calls = 0
+
+    def list_objects_v2(self, **kwargs):
+        self.list_calls += 1
+        return super().list_objects_v2(MaxKeys=2, **kwargs)
+
+
+def test_object_store_follows_continuation_tokens(tmp_path):
+    client = PagedClient(str(tmp_path))
+    store = ObjectStoreArtifactStore(client, "artifacts", ttl_seconds=10, gc_interval_seconds=3600)
+    for i in range(5):
+        store.put(f"doc {i}".encode(), f"{i}.docx")
+    assert store.stats()["artifacts"] == 5
+    assert client.list_calls == 3
+    assert store.collect_garbage(now=time.time() + 60) == 5
+
+
+class ClientError(Exception):
+    """Shape of botocore.exceptions.ClientError."""
+
+    def __init__(self, code, status):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}
+
+
+class S3StyleClient(LocalObjectStoreClient):
+    """Raises like boto3 instead of KeyError for missing objects."""
+
+    def head_object(self, **kwargs):
+        try:
+            return super().head_object(**kwargs)
+        except KeyError:
+            raise ClientError("404", 404)
+
+    def get_object(self, **kwargs):
+        try:
+            return super().get_object(**kwargs)
+        except KeyError:
+            raise ClientError("NoSuchKey", 404)
+
+
+def test_s3_style_not_found_errors_mean_missing(tmp_path):
+    store = ObjectStoreArtifactStore(S3StyleClient(str(tmp_path)), "artifacts")
+    assert store.get("0" * 64) is None and store.open("0" * 64) is None
+    meta = store.put(b"data", "a.docx")
+    assert store.read(meta["key"]) == b"data"
+
+
+def test_other_object_store_errors_propagate(tmp_path):
+    class DeniedClient(LocalObjectStoreClient):
+        def head_object(self, **kwargs):
+            raise ClientError("AccessDenied", 403)
+
+    store = ObjectStoreArtifactStore(DeniedClient(str(tmp_path)), "artifacts")
+    with pytest.raises(ClientError):
+        store.get("0" * 64)
+
+
+def test_content_disposition_has_ascii_fallback():
+    header = content_disposition('CV_Zürich "Lead".docx')
+    assert header.startswith('attachment; filename="CV_Zrich Lead.docx"')
+    assert "filename*=UTF-8''CV_Z%C3%BCrich%20%22Lead%22.docx" in header
@@ -0,0 +1,53 @@
+"""
+Tests for ATSOptimizer section targeting: only terms the master profile really supports are sent to
+the LLM, and support is decided per word on the profile's text values.
+"""
+
+from agents.ats_optimizer import ATSOptimizer
+
+PROFILE = {
+    "summary": "Engineer at Google building data pipelines",
+    "skills": {"Technical": ["Python", "Node.js"]},
+    "experience": [{
+        "title": "Engineer",
+        "company": "Google",
+        "dates": "2020",
+        "achievements": ["Built CI/CD with GitHub Actions for Python services", "Led a team"],
+    }],
+}
+
+
+def select(missing):
+    optimizer = ATSOptimizer(client=None, sections_per_iteration=3)
+    return {target['kind']: target['terms'] for target in optimizer._select_sections(PROFILE, missing, PROFILE)}
+
+
+def test_short_terms_and_json_keys_are_not_supported():
+    targets = select({"required": ["go", "r", "c", "title", "dates"], "nice_to_have": [], "keywords": ["go", "title"]})
+    assert targets == {}
+
+
+def test_supported_terms_target_their_sections():
+    targets = select({"required": ["node.js"], "nice_to_have": ["ci/cd"], "keywords": ["pipelines", "github actions"]})
+    assert targets["skills"] == ["node.js", "ci/cd"]
+    assert targets["experience"] == ["ci/cd", "github actions"]
+    assert targets["summary"] == ["pipelines", "github actions"]
+
+
+def test_role_targeting_matches_whole_words():
+    targets = select({"required": [], "nice_to_have": [], "keywords": ["action", "build"]})
+    assert "experience" not in targets
+
+
+def test_rounds_that_do_not_improve_the_score_stop_the_loop():
+    optimizer = ATSOptimizer(client=None, target_score=100, max_iterations=5, sections_per_iteration=3)
+    optimizer._rewrite = lambda cv, target, profile: None
+    customized = dict(PROFILE, experience=[dict(PROFILE["experience"][0], achievements=["Led a team"])])
+    job = {"requirements": {"must_have_skills": ["CI/CD"]}, "keywords": {"ats_keywords": ["GitHub Actions"]}}
+
+    cv, report = optimizer.optimize(customized, job, PROFILE)
+
+    assert [round_['accepted'] for round_ in report['iterations']] == [False]
+    assert report['llm_calls'] == len(report['iterations'][0]['sections'])
+    assert report['final_score'] == report['initial_score']
+    assert cv == customized
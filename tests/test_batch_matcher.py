@@ -0,0 +1,73 @@
+"""
+Parity tests: the vectorized rankers must score exactly like MatchCalculator.calculate_match_score.
+"""
+
+import pytest
+
+from benchmarks.synthetic import make_job_analysis, make_profile
+from utils.batch_matcher import JobRanker
+from utils.match_calculator import MatchCalculator
+
+SCORE_FIELDS = (
+    'overall_score', 'required_skills_score', 'nice_to_have_score', 'keyword_score',
+    'required_skills_matched', 'required_skills_total', 'nice_to_have_matched',
+    'nice_to_have_total', 'keywords_matched', 'keywords_total',
+)
+
+
+def assert_same_breakdown(ranked, expected):
+    assert {field: ranked[field] for field in SCORE_FIELDS} == {field: expected[field] for field in SCORE_FIELDS}
+    # Missing lists are truncated from a set, so only compare them when nothing was cut off
+    for field in ('missing_required_skills', 'missing_nice_to_have_skills'):
+        if len(expected[field]) < 10:
+            assert set(ranked[field]) == set(expected[field])
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_job_ranker_matches_match_calculator(seed):
+    calculator = MatchCalculator()
+    profile = make_profile(n_roles=10, n_skills=150, seed=seed)
+    jobs = [
+        make_job_analysis(n_required=8, n_nice=5, n_keywords=12, vocabulary_size=150, seed=seed * 100 + i)
+        for i in range(12)
+    ]
+
+    ranked = JobRanker(jobs, calculator).rank(profile)
+    assert sorted(result['job_index'] for result in ranked) == list(range(len(jobs)))
+    assert [result['overall_score'] for result in ranked] == sorted(
+        (result['overall_score'] for result in ranked), reverse=True
+    )
+    for result in ranked:
+        assert_same_breakdown(result, calculator.calculate_match_score(profile, jobs[result['job_index']]))
+
+
+def test_empty_job_list_ranks_nothing():
+    assert JobRanker([], MatchCalculator()).rank(make_profile(seed=0)) == []
+
+
+def test_candidate_ranker_matches_match_calculator():
+    calculator = MatchCalculator()
+    profiles = {f"c{i}": make_profile(n_roles=6, n_skills=150, seed=i) for i in range(8)}
+    job = make_job_analysis(n_required=8, n_nice=5, n_keywords=12, vocabulary_size=150, seed=42)
+
+    ranked = calculator.build_candidate_ranker(profiles).rank(job, top_n=len(profiles))
+    assert sorted(result['candidate_id'] for result in ranked) == sorted(profiles)
+    for result in ranked:
+        assert_same_breakdown(result, calculator.calculate_match_score(profiles[result['candidate_id']], job))
+
+
+def test_candidate_ranker_updates_in_place():
+    calculator = MatchCalculator()
+    profiles = {f"c{i}": make_profile(n_roles=4, n_skills=150, seed=i) for i in range(4)}
+    job = make_job_analysis(n_required=8, n_nice=5, n_keywords=12, vocabulary_size=150, seed=7)
+    ranker = calculator.build_candidate_ranker(profiles)
+
+    assert ranker.remove_profile("c1")
+    assert not ranker.remove_profile("c1")
+    ranker.add_profile("c0", profiles["c3"])
+    ranker.add_profile("c9", profiles["c2"])
+
+    ranked = {result['candidate_id']: result for result in ranker.rank(job, top_n=10)}
+    assert sorted(ranked) == ["c0", "c2", "c3", "c9"]
+    assert_same_breakdown(ranked["c0"], calculator.calculate_match_score(profiles["c3"], job))
+    assert_same_breakdown(ranked["c9"], calculator.calculate_match_score(profiles["c2"], job))
@@ -0,0 +1,77 @@
+"""
+Tests for BulletRewriteCache: flushing only rewrites the file after put() or eviction.
+"""
+
+import os
+
+from utils.bullet_cache import BulletRewriteCache
+
+
+def test_hits_do_not_rewrite_the_file(tmp_path):
+    path = str(tmp_path / "bullets.json")
+    cache = BulletRewriteCache(path)
+    cache.put("k1", "Rewritten bullet")
+    cache.flush()
+    os.remove(path)
+
+    assert cache.get("k1") == "Rewritten bullet"
+    assert cache.get("missing") is None
+    cache.flush()
+    assert not os.path.exists(path)
+
+    cache.put("k2", "Another bullet")
+    cache.flush()
+    assert BulletRewriteCache(path).get("k1") == "Rewritten bullet"
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = BulletRewriteCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_survive_a_restart_in_lru_order(tmp_path):
+    path = str(tmp_path / "cache" / "bullets.json")
+    cache = BulletRewriteCache(path)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.upper())
+    cache.flush()
+
+    reloaded = BulletRewriteCache(path, max_entries=2)
+    assert list(reloaded.entries) == ["b", "c"]
+    assert reloaded.get("c") == "C"
+
+
+def test_corrupt_or_outdated_files_start_empty(tmp_path):
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text("{not json", encoding="utf-8")
+    outdated = tmp_path / "outdated.json"
+    outdated.write_text('{"version": 0, "entries": [["a", "A"]]}', encoding="utf-8")
+
+    assert len(BulletRewriteCache(str(corrupt)).entries) == 0
+    assert len(BulletRewriteCache(str(outdated)).entries) == 0
+
+
+def test_keys_ignore_keyword_order_case_and_whitespace():
+    key = BulletRewriteCache.make_key("Built  APIs", ["Python", "AWS"], "deepseek-chat", 1)
+    assert key == BulletRewriteCache.make_key("Built APIs", ["aws", "python"], "deepseek-chat", 1)
+    assert key != BulletRewriteCache.make_key("Built APIs", ["aws", "python"], "deepseek-chat", 2)
+
+
+def test_flush_merges_entries_written_by_other_processes(tmp_path):
+    path = str(tmp_path / "bullets.json")
+    first, second = BulletRewriteCache(path), BulletRewriteCache(path)
+    first.put("a", "A")
+    first.flush()
+    second.put("b", "B")
+    second.flush()
+
+    reloaded = BulletRewriteCache(path)
+    assert list(reloaded.entries) == ["a", "b"]
+    assert second.get("a") == "A"
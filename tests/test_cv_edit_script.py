@@ -0,0 +1,84 @@
+"""
+Tests for the CV edit-script catalog: stable IDs, validation of malformed scripts and rebuilding the
+full CV from operations.
+"""
+
+import pytest
+
+from utils.cv_edit_script import DEFAULT_BULLETS_PER_ROLE, EditScriptError, ProfileCatalog
+
+PROFILE = {
+    "personal_info": {"name": "Alex Candidate"},
+    "summary": "Backend engineer.",
+    "skills": {"Technical": ["Python", "SQL"], "Soft Skills": ["Mentoring"]},
+    "experience": [
+        {"company": "Acme", "title": "Engineer", "dates": "2020-2023",
+         "responsibilities": ["Built APIs"], "achievements": [f"Win {i}" for i in range(1, 6)]},
+        {"company": "Initech", "title": "Intern", "dates": "2019", "achievements": ["Wrote tests"]},
+    ],
+    "education": [
+        {"school": "Uni", "degree": "BSc", "dates": "2019"},
+        {"school": "Uni", "degree": "BSc", "dates": "2019"},
+    ],
+}
+
+
+@pytest.fixture
+def catalog():
+    return ProfileCatalog(PROFILE)
+
+
+def test_ids_are_positional(catalog):
+    assert list(catalog.roles) == ["r1", "r2"]
+    assert catalog.bullets["r1.b1"] == "Built APIs"
+    assert catalog.bullets["r2.b1"] == "Wrote tests"
+    assert catalog.skills == {"s1": ("Technical", "Python"), "s2": ("Technical", "SQL"), "s3": ("Soft Skills", "Mentoring")}
+    assert "[r1.b2] Win 1" in catalog.render()
+
+
+@pytest.mark.parametrize("script", [
+    None,
+    [],
+    {"operations": "set_summary"},
+    {"operations": [{"op": "delete_everything"}]},
+    {"operations": ["select_roles"]},
+    {"operations": [{"op": "set_summary", "text": 42}]},
+    {"operations": [{"op": "select_roles", "ids": "r1"}]},
+    {"operations": [{"op": "select_roles", "ids": ["r9"]}]},
+    {"operations": [{"op": "select_roles", "ids": [["r1"]]}]},
+    {"operations": [{"op": "order_skills", "ids": [{"id": "s1"}]}]},
+    {"operations": [{"op": "replace_bullet", "id": {"id": "r1.b1"}, "text": "x"}]},
+    {"operations": [{"op": "replace_bullet", "id": None, "text": "x"}]},
+    {"operations": [{"op": "select_roles", "ids": []}]},
+    {"operations": [{"op": "replace_bullet", "id": "r1.b6", "text": "x"}]},
+    {"operations": [{"op": "select_bullets", "ids": ["r1.b1"]}, {"op": "replace_bullet", "id": "r1.b2", "text": "x"}]},
+    {"operations": [{"op": "select_roles", "ids": ["r1"]}, {"op": "replace_bullet", "id": "r2.b1", "text": "x"}]},
+])
+def test_malformed_scripts_are_rejected(catalog, script):
+    assert catalog.validate(script)
+    with pytest.raises(EditScriptError):
+        catalog.apply(script)
+
+
+def test_apply_rebuilds_the_cv(catalog):
+    cv = catalog.apply({"operations": [
+        {"op": "set_summary", "text": "Python engineer."},
+        {"op": "select_roles", "ids": ["r2", "r1", "r2"]},
+        {"op": "order_skills", "ids": ["s3", "s1"]},
+        {"op": "select_bullets", "ids": ["r1.b3", "r1.b1"]},
+        {"op": "replace_bullet", "id": "r1.b1", "text": "Built Python APIs"},
+    ]})
+    assert cv["summary"] == "Python engineer."
+    assert [role["company"] for role in cv["experience"]] == ["Initech", "Acme"]
+    assert cv["experience"][1]["achievements"] == ["Win 2", "Built Python APIs"]
+    assert cv["experience"][0]["achievements"] == ["Wrote tests"]
+    assert cv["skills"] == {"Soft Skills": ["Mentoring"], "Technical": ["Python"]}
+    assert cv["education"] == [{"school": "Uni", "degree": "BSc", "dates": "2019"}]
+    assert cv["personal_info"] == {"name": "Alex Candidate"}
+
+
+def test_empty_script_keeps_the_profile_defaults(catalog):
+    cv = catalog.apply({"operations": []})
+    assert cv["summary"] == "Backend engineer."
+    assert len(cv["experience"][0]["achievements"]) == DEFAULT_BULLETS_PER_ROLE
+    assert cv["skills"] == PROFILE["skills"]
@@ -0,0 +1,78 @@
+"""
+Tests for the document renderers: the OOXML writer matches python-docx, layout options and text
+formats, and failed renders leave no partial file behind.
+"""
+
+import io
+import zipfile
+
+import pytest
+
+from utils.document_builder import DocumentBuilder
+from utils.ooxml_writer import OOXMLDocumentBuilder
+
+CV = {
+    "personal_info": {"name": "Alex Candidate", "email": "alex@example.com", "location": "Remote"},
+    "summary": "Backend engineer & mentor.",
+    "skills": {"Technical": ["Python", "SQL"], "Soft Skills": ["Mentoring"]},
+    "experience": [{"company": "Acme", "location": "Berlin", "title": "Engineer", "dates": "2020-2023",
+                    "achievements": ["Built <fast> APIs", "  Led a team\tof 4"]}],
+    "education": [{"school": "Uni", "degree": "BSc", "dates": "2019"}],
+}
+LETTER = "Dear team,\n\nI would like to apply.\n\nBest regards"
+
+
+def parts(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+@pytest.mark.parametrize("options", [{}, {"font_name": "Georgia", "font_size": 10.5,
+                                          "section_order": ["experience", "skills", "education"]}])
+def test_ooxml_writer_matches_python_docx(options):
+    assert parts(OOXMLDocumentBuilder(**options).render_cv(CV)) == parts(DocumentBuilder(**options).render_cv(CV))
+    assert (parts(OOXMLDocumentBuilder(**options).render_cover_letter(LETTER, CV))
+            == parts(DocumentBuilder(**options).render_cover_letter(LETTER, CV)))
+
+
+def test_section_order_and_text_formats():
+    builder = DocumentBuilder(section_order=["experience", "summary"])
+    document = parts(builder.render_cv(CV))["word/document.xml"].decode("utf-8")
+    assert document.index("PROFESSIONAL EXPERIENCE") < document.index("PROFESSIONAL SUMMARY")
+    assert "EDUCATION" not in document
+
+    text = builder.render_cv(CV, fmt="txt").decode("utf-8")
+    assert text.startswith("Alex Candidate\nalex@example.com | Remote\n\nPROFESSIONAL EXPERIENCE")
+    markdown = builder.render_cv(CV, fmt="md").decode("utf-8")
+    assert "### Acme — Berlin\n\n*Engineer* | 2020-2023\n\n- Built <fast> APIs" in markdown
+    with pytest.raises(ValueError):
+        builder.render_cv(CV, fmt="pdf")
+
+
+@pytest.mark.parametrize("options", [{"section_order": ["projects"]}, {"section_order": ["skills", "skills"]},
+                                     {"font_size": 0}, {"font_name": " "}])
+def test_invalid_options_are_rejected(options):
+    with pytest.raises(ValueError):
+        DocumentBuilder(**options)
+
+
+@pytest.mark.parametrize("builder_class", [DocumentBuilder, OOXMLDocumentBuilder])
+def test_failed_streamed_letter_leaves_no_file(builder_class, tmp_path):
+    def broken_stream():
+        yield "Dear team,\n\nI would"
+        raise ConnectionError("stream dropped")
+
+    path = tmp_path / "CL.docx"
+    with pytest.raises(ConnectionError):
+        builder_class().create_cover_letter_streaming(broken_stream(), CV, str(path))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_invalid_characters_leave_existing_file_untouched(tmp_path):
+    path = tmp_path / "CV.docx"
+    OOXMLDocumentBuilder().create_cv(CV, str(path))
+    before = path.read_bytes()
+    with pytest.raises(ValueError):
+        OOXMLDocumentBuilder().create_cv({**CV, "summary": "bad \x00 byte"}, str(path))
+    assert path.read_bytes() == before
+    assert [item.name for item in tmp_path.iterdir()] == ["CV.docx"]
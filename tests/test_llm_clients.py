@@ -0,0 +1,99 @@
+"""
+Tests for the LLM client wrappers that need no network: variant top-ups and stream retries.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from utils.deepseek_client import MAX_VARIANT_TOP_UPS, STREAM_ATTEMPTS, DeepSeekClient
+
+# generate_variants without its tenacity wrapper (no back-off sleeps in tests)
+generate_variants = DeepSeekClient.generate_variants.__wrapped__
+
+
+@pytest.fixture
+def client():
+    return DeepSeekClient(api_key="test", base_url="http://127.0.0.1:9")
+
+
+def fake_generate(client, responses):
+    calls = []
+
+    def _generate(prompt, system_instruction, config, n):
+        calls.append(n)
+        return responses.pop(0) if responses else []
+
+    client._generate = _generate
+    return calls
+
+
+def test_variants_are_topped_up(client):
+    calls = fake_generate(client, [["a"], ["b", "c"]])
+    assert generate_variants(client, "prompt", 3) == ["a", "b", "c"]
+    assert calls == [3, 2]
+
+
+def test_top_ups_stop_when_a_call_adds_nothing(client):
+    calls = fake_generate(client, [["a"], [], ["never requested"]])
+    assert generate_variants(client, "prompt", 3) == ["a"]
+    assert calls == [3, 2]
+
+
+def test_top_ups_are_capped(client):
+    calls = fake_generate(client, [["a"] for _ in range(10)])
+    assert generate_variants(client, "prompt", 10) == ["a"] * (1 + MAX_VARIANT_TOP_UPS)
+    assert len(calls) == 1 + MAX_VARIANT_TOP_UPS
+
+
+def test_no_variants_raises(client):
+    fake_generate(client, [])
+    with pytest.raises(ValueError):
+        generate_variants(client, "prompt", 2)
+
+
+def chunk(text):
+    return SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+def fake_stream(client, monkeypatch, attempts):
+    """Each attempt is a list of deltas, optionally ending in an exception to raise."""
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        attempt = attempts.pop(0)
+
+        def stream():
+            for item in attempt:
+                if isinstance(item, Exception):
+                    raise item
+                yield chunk(item)
+        return stream()
+
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr("utils.deepseek_client.time.sleep", lambda seconds: None)
+    return calls
+
+
+def test_stream_retries_until_the_first_delta(client, monkeypatch):
+    calls = fake_stream(client, monkeypatch, [[ConnectionError("reset")], ["Dear ", "team"]])
+    assert list(client.stream_content("prompt")) == ["Dear ", "team"]
+    assert len(calls) == 2
+
+
+def test_stream_gives_up_after_the_attempt_limit(client, monkeypatch):
+    calls = fake_stream(client, monkeypatch, [[ConnectionError("reset")] for _ in range(STREAM_ATTEMPTS)])
+    with pytest.raises(ConnectionError):
+        list(client.stream_content("prompt"))
+    assert len(calls) == STREAM_ATTEMPTS
+
+
+def test_stream_is_not_retried_after_a_delta(client, monkeypatch):
+    calls = fake_stream(client, monkeypatch, [["Dear ", ConnectionError("reset")], ["never requested"]])
+    received = []
+    with pytest.raises(ConnectionError):
+        for delta in client.stream_content("prompt"):
+            received.append(delta)
+    assert received == ["Dear "]
+    assert len(calls) == 1
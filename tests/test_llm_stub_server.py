@@ -0,0 +1,44 @@
+"""
+Tests for the stub LLM server's routing: prompts are dispatched on their header lines,
+not on words that the embedded job description or job analysis happen to contain.
+"""
+
+import json
+
+from agents.cover_letter_generator import CoverLetterGenerator
+from agents.job_analyzer import JobAnalyzer
+from llm_stub_server import build_completion_text
+
+
+class RecordingClient:
+    """Captures the prompt an agent sends and answers with a fixed response."""
+
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def generate_json(self, prompt, system_instruction="", temperature=0.1):
+        self.prompts.append(prompt)
+        return self.response
+
+    def generate_content(self, prompt, system_instruction="", config=None):
+        self.prompts.append(prompt)
+        return self.response
+
+
+def test_job_description_mentioning_a_cover_letter_is_analyzed():
+    client = RecordingClient({"role_info": {}, "requirements": {}, "keywords": {}})
+    JobAnalyzer(client).analyze("Job Title: Data Engineer\nPlease attach a cover letter with your application.")
+
+    response = json.loads(build_completion_text([{"role": "user", "content": client.prompts[0]}]))
+    assert response["role_info"]["title"] == "Data Engineer"
+
+
+def test_cover_letter_prompt_embedding_the_job_analysis_gets_a_letter():
+    client = RecordingClient("Letter")
+    analysis = {"role_info": {"title": "Data Engineer", "company": "Acme"}}
+    CoverLetterGenerator(client, variants=1).generate({"summary": "Engineer"}, analysis)
+
+    response = build_completion_text([{"role": "user", "content": client.prompts[0]}])
+    assert len(response.split("\n\n")) == 4
+    assert "role_info" not in response
@@ -0,0 +1,45 @@
+"""
+Tests for MatchCalculator scoring paths: first-time scoring (union index) and re-scoring
+(memoized per-section matches) must agree, and re-scoring must see edited sections.
+"""
+
+import copy
+
+import pytest
+
+from benchmarks.synthetic import make_job_analysis, make_profile
+from utils.match_calculator import MatchCalculator
+from utils.profile_index import ProfileIndex
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes():
+    ProfileIndex.clear_cache()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rescoring_matches_first_time_scoring(seed):
+    profile = make_profile(n_roles=20, n_skills=200, seed=seed)
+    job = make_job_analysis(n_required=10, n_nice=6, n_keywords=20, vocabulary_size=200, seed=seed)
+    calculator = MatchCalculator()
+
+    first = calculator.calculate_match_score(profile, job)
+    again = calculator.calculate_match_score(profile, job)
+    assert again == first
+    assert MatchCalculator().calculate_match_score(profile, job) == first
+
+
+def test_rescoring_sees_an_edited_section():
+    profile = {
+        "summary": "Backend engineer",
+        "skills": {"Technical": ["Python"]},
+        "experience": [{"title": "Engineer", "company": "Acme", "dates": "2020", "achievements": ["Built APIs"]}],
+    }
+    job = {"requirements": {"must_have_skills": ["Python", "Kubernetes"]}}
+    calculator = MatchCalculator()
+    assert calculator.calculate_match_score(profile, job)['required_skills_matched'] == 1
+
+    edited = copy.deepcopy(profile)
+    edited["experience"][0]["achievements"].append("Ran services on Kubernetes")
+    assert calculator.calculate_match_score(edited, job)['required_skills_matched'] == 2
+    assert calculator.calculate_match_score(profile, job)['required_skills_matched'] == 1
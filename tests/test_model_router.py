@@ -0,0 +1,28 @@
+"""
+Tests for ModelRouter's API key checks: only the providers the routing table uses need a key.
+"""
+
+from utils.llm_cassette import LLMCassette
+from utils.model_router import DEFAULT_ROUTES, ModelRouter
+
+GEMINI_ROUTES = {agent: dict(route, provider="gemini", model="gemini-1.5-flash") for agent, route in DEFAULT_ROUTES.items()}
+
+
+def test_default_routes_need_the_deepseek_key():
+    assert ModelRouter({"deepseek": None, "gemini": "key"}).missing_api_keys() == ["DEEPSEEK_API_KEY"]
+    assert ModelRouter({"deepseek": "key", "gemini": None}).missing_api_keys() == []
+
+
+def test_all_gemini_routes_need_only_the_google_key():
+    assert ModelRouter({"deepseek": None, "gemini": "key"}, GEMINI_ROUTES).missing_api_keys() == []
+    assert ModelRouter({"deepseek": None, "gemini": None}, GEMINI_ROUTES).missing_api_keys() == ["GOOGLE_API_KEY"]
+
+
+def test_mixed_routes_need_both_keys():
+    routes = dict(DEFAULT_ROUTES, job_analyzer=GEMINI_ROUTES["job_analyzer"])
+    assert ModelRouter({"deepseek": None, "gemini": None}, routes).missing_api_keys() == ["DEEPSEEK_API_KEY", "GOOGLE_API_KEY"]
+
+
+def test_offline_replay_needs_no_keys(tmp_path):
+    cassette = LLMCassette(str(tmp_path / "cassette.json"), mode="replay")
+    assert ModelRouter({"deepseek": None, "gemini": None}, cassette=cassette).missing_api_keys() == []
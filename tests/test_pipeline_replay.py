@@ -0,0 +1,88 @@
+"""
+Offline pipeline test: JobAnalyzer and CVCustomizer run against a recorded cassette
+(tests/cassettes/pipeline.json), with no API key and no network.
+
+The cassette was recorded against llm_stub_server.py. Re-record it after changing a prompt:
+    python -m tests.test_pipeline_replay
+"""
+
+import os
+
+import pytest
+
+from agents.cv_customizer import CVCustomizer
+from agents.job_analyzer import JobAnalyzer
+from utils.llm_cassette import CassetteMissError, LLMCassette
+from utils.model_router import ModelRouter
+
+CASSETTE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes", "pipeline.json")
+
+JOB_DESCRIPTION = """
+Job Title: AI Engineer
+Company: TechNova
+Requirements:
+- Proficiency in Python
+- Experience with LLMs and Agentic Workflows
+- Knowledge of RAG systems
+"""
+
+PROFILE = {
+    "personal_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "summary": "Backend engineer building LLM-powered data products.",
+    "skills": {"Technical": ["Python", "Docker", "PostgreSQL"]},
+    "experience": [{
+        "company": "Analytical Engines Ltd",
+        "title": "Senior Engineer",
+        "dates": "2019 - Present",
+        "achievements": ["Built a RAG service in Python", "Cut inference cost by 40% with caching"],
+    }],
+    "education": [{"school": "University of London", "degree": "BSc Mathematics", "dates": "2015"}],
+}
+
+
+def run_pipeline(router: ModelRouter, job_description: str = JOB_DESCRIPTION):
+    """The recorded calls: job analysis, then a single-call CV customization."""
+    analysis = JobAnalyzer(router.get_client("job_analyzer")).analyze(job_description)
+    customizer = CVCustomizer(router.get_client("cv_customizer"), mode="single")
+    return analysis, customizer.customize(PROFILE, analysis)
+
+
+@pytest.fixture
+def router():
+    cassette = LLMCassette(CASSETTE_PATH, mode="replay")
+    return ModelRouter({"deepseek": None, "gemini": None}, cassette=cassette)
+
+
+def test_pipeline_replays_offline(router):
+    analysis, cv = run_pipeline(router)
+
+    assert analysis["role_info"]["title"] == "AI Engineer"
+    assert analysis["requirements"]["must_have_skills"]
+    assert cv["personal_info"]["name"] == "Ada Lovelace"
+    assert cv["experience"][0]["company"] == "Analytical Engines Ltd"
+    assert router.metrics.summary()
+
+
+def test_unrecorded_prompt_raises(router):
+    with pytest.raises(CassetteMissError):
+        run_pipeline(router, job_description="Job Title: Pastry Chef\nCompany: Nowhere Bakery")
+
+
+def record_cassette() -> None:
+    """Record the pipeline's calls against a local stub server."""
+    from llm_stub_server import StubConfig, start_stub_server
+
+    server = start_stub_server(port=0, config=StubConfig(latency_ms=0, latency_jitter_ms=0))
+    os.environ["DEEPSEEK_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    if os.path.exists(CASSETTE_PATH):
+        os.remove(CASSETTE_PATH)
+    try:
+        router = ModelRouter({"deepseek": "stub", "gemini": None}, cassette=LLMCassette(CASSETTE_PATH, mode="record"))
+        run_pipeline(router)
+    finally:
+        server.shutdown()
+    print(f"💾 Cassette recorded to: {CASSETTE_PATH}")
+
+
+if __name__ == "__main__":
+    record_cassette()
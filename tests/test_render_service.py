@@ -0,0 +1,37 @@
+"""
+Tests for RenderService recovery: a worker that dies breaks the process pool, and the next
+submit() must replace it instead of failing every later render.
+"""
+
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from utils.render_service import RenderService
+
+CV = {
+    "personal_info": {"name": "Ada Lovelace", "email": "ada@example.com"},
+    "summary": "Engineer",
+    "skills": {"Technical": ["Python"]},
+    "experience": [],
+    "education": [],
+}
+
+
+@pytest.fixture
+def service():
+    with RenderService(workers=1, timeout=5) as service:
+        yield service
+
+
+def test_submit_restarts_a_broken_pool(service):
+    crashed = service._pool.submit(os._exit, 1)
+    with pytest.raises(BrokenProcessPool):
+        crashed.result(timeout=30)
+
+    assert service.render_cv(CV)[:2] == b"PK"
+    stats = service.stats()
+    assert stats["pool_restarts"] == 1
+    assert stats["completed"] == 1
+    assert stats["pending"] == 0
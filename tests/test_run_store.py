@@ -0,0 +1,117 @@
+"""
+Tests for RunStore round-trips, retention (TTL and run cap), opt-in configuration and re-rendering
+stored runs.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from utils.document_builder import DocumentBuilder
+from utils.run_store import RunStore, render_run
+
+PROFILE = {
+    "personal_info": {"name": "Alex Candidate", "email": "alex@example.com"},
+    "summary": "Backend engineer.",
+    "skills": {"Technical": ["Python"]},
+    "experience": [{"company": "Acme", "title": "Engineer", "dates": "2020", "achievements": ["Built APIs"]}],
+    "education": [{"school": "Uni", "degree": "BSc", "dates": "2019"}],
+}
+ANALYSIS = {"role_info": {"title": "Engineer", "company": "Acme"}}
+
+
+def save(store, run_id, **kwargs):
+    return store.save(run_id, PROFILE, ANALYSIS, PROFILE, ["First letter", "Second letter"],
+                      file_stems={"cv": "CV_Acme_Engineer", "cover_letter": "CL_Acme_Engineer"}, **kwargs)
+
+
+def test_round_trip(tmp_path):
+    store = RunStore(str(tmp_path))
+    save(store, "run1", match={"cv": {"overall_score": 80}}, source="flask")
+    record = store.load("run1")
+    assert record["customized_cv"] == PROFILE
+    assert record["cover_letters"] == ["First letter", "Second letter"]
+    assert record["match"] == {"cv": {"overall_score": 80}}
+    assert (record["role_title"], record["company"], record["source"]) == ("Engineer", "Acme", "flask")
+    assert store.list_runs()[0]["run_id"] == "run1"
+    assert store.load("missing") is None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+@pytest.mark.parametrize("run_id", ["../etc/passwd", "a.b", "", "x" * 65])
+def test_invalid_run_ids_are_rejected(tmp_path, run_id):
+    with pytest.raises(ValueError):
+        RunStore(str(tmp_path)).load(run_id)
+
+
+def age(path, seconds):
+    """Make a stored run look `seconds` old (record timestamp and file mtime)."""
+    record = json.loads(path.read_text(encoding="utf-8"))
+    record["created_at"] -= seconds
+    path.write_text(json.dumps(record), encoding="utf-8")
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_oldest_runs_beyond_the_cap_are_deleted(tmp_path):
+    store = RunStore(str(tmp_path), max_runs=2)
+    for i in range(4):
+        save(store, f"r{i}")
+        age(tmp_path / f"r{i}.json", 100 - i)
+    save(store, "r4")
+    assert sorted(os.listdir(tmp_path)) == ["r3.json", "r4.json"]
+
+
+def test_expired_runs_are_not_loaded_and_are_deleted(tmp_path):
+    store = RunStore(str(tmp_path), ttl_seconds=60)
+    save(store, "old")
+    age(tmp_path / "old.json", 120)
+    assert store.load("old") is None
+    assert (tmp_path / "old.json").exists()
+
+    save(store, "new")
+    assert not (tmp_path / "old.json").exists()
+    assert store.load("new") is not None
+
+
+def test_ttl_zero_keeps_runs(tmp_path):
+    store = RunStore(str(tmp_path), ttl_seconds=0)
+    save(store, "old")
+    age(tmp_path / "old.json", 365 * 24 * 3600)
+    save(store, "new")
+    assert store.load("old") is not None
+
+
+def test_servers_are_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv("RUN_STORE_DIR", raising=False)
+    assert RunStore.from_env() is None
+    assert RunStore.from_env(default_directory=str(tmp_path)).directory == str(tmp_path)
+    monkeypatch.setenv("RUN_STORE_DIR", "")
+    assert RunStore.from_env(default_directory=str(tmp_path)) is None
+    monkeypatch.setenv("RUN_STORE_DIR", str(tmp_path / "runs"))
+    monkeypatch.setenv("RUN_STORE_TTL_SECONDS", "0")
+    store = RunStore.from_env()
+    assert (store.max_runs, store.ttl_seconds) == (200, 0)
+
+
+def test_render_run_applies_options_and_formats(tmp_path):
+    store = RunStore(str(tmp_path))
+    record = save(store, "run1")
+    builder = DocumentBuilder().with_options(section_order=["experience", "summary"])
+
+    rendered = render_run(record, builder, fmt="md", variant=1)
+    assert rendered["cv"][0] == "CV_Acme_Engineer.md"
+    assert rendered["cover_letter"][0] == "CL_Acme_Engineer_v2.md"
+    cv_text = rendered["cv"][1].decode("utf-8")
+    assert cv_text.index("## Professional Experience") < cv_text.index("## Professional Summary")
+    assert "Education" not in cv_text
+    assert "Second letter" in rendered["cover_letter"][1].decode("utf-8")
+
+    docx = render_run(record, builder, documents=["cv"])
+    assert list(docx) == ["cv"] and docx["cv"][1][:2] == b"PK"
+    with pytest.raises(ValueError):
+        render_run(record, builder, documents=["resume"])
+    with pytest.raises(ValueError):
+        render_run(record, builder, variant=5)
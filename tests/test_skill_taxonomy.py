@@ -0,0 +1,64 @@
+"""
+Tests for skill extraction from free text: ambiguous aliases must not fire on ordinary prose.
+"""
+
+import pytest
+
+from utils.skill_taxonomy import SkillTaxonomy
+
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return SkillTaxonomy.from_file()
+
+
+@pytest.mark.parametrize("text", [
+    "react quickly to incidents on each node of the cluster; built rails for the py pipeline",
+    "Lit the torch, checked the ts column and asked the kube team",
+    "Able to go the extra mile and make a swift, rest-of-the-year plan",
+])
+def test_ambiguous_words_in_prose_are_not_skills(taxonomy, text):
+    assert taxonomy.extract(text) == []
+
+
+def test_cased_names_still_match_as_written(taxonomy):
+    text = "Built React front ends on Node with a Rails API"
+    assert taxonomy.extract(text) == ["React", "Node.js", "Ruby on Rails"]
+
+
+def test_unambiguous_spellings_match_in_any_case(taxonomy):
+    text = "reactjs, NodeJS, ruby on rails, python3 and pytorch"
+    assert taxonomy.extract(text) == ["React", "Node.js", "Ruby on Rails", "Python", "PyTorch"]
+
+
+@pytest.mark.parametrize("alias, canonical", [
+    ("py", "Python"), ("ts", "TypeScript"), ("torch", "PyTorch"), ("kube", "Kubernetes"),
+    ("node", "Node.js"), ("rails", "Ruby on Rails"), ("react", "React"),
+])
+def test_ambiguous_aliases_still_canonicalize_as_skill_names(taxonomy, alias, canonical):
+    assert taxonomy.canonicalize(alias) == canonical
+
+
+def test_longest_match_wins_at_the_same_start():
+    taxonomy = SkillTaxonomy([
+        {"canonical": "Spring", "aliases": []},
+        {"canonical": "Spring Boot", "aliases": []},
+        {"canonical": "Boot Camp", "aliases": []},
+    ])
+    assert taxonomy.extract("Services built with Spring Boot camp") == ["Spring Boot"]
+    assert taxonomy.extract("Spring and Spring Boot") == ["Spring", "Spring Boot"]
+
+
+def test_matches_do_not_overlap_and_respect_word_boundaries():
+    taxonomy = SkillTaxonomy([
+        {"canonical": "Machine Learning", "aliases": ["ml"]},
+        {"canonical": "Learning Analytics", "aliases": []},
+        {"canonical": "Java", "aliases": []},
+        {"canonical": "JavaScript", "aliases": []},
+    ])
+    assert taxonomy.extract("machine learning analytics") == ["Machine Learning"]
+    assert taxonomy.extract("JavaScript, not Java; html") == ["JavaScript", "Java"]
+
+
+def test_results_are_deduplicated_in_order_of_first_appearance(taxonomy):
+    assert taxonomy.extract("K8s, Python, kubernetes and python3") == ["Kubernetes", "Python"]
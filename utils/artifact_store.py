@@ -0,0 +1,556 @@
+"""
+Artifact Store
+Role: Keep rendered documents out of a shared output/ directory. Each artifact is stored under the
+hash of its content with a retention period, served back as a chunked stream, and garbage-collected
+once it expires.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from utils.document_builder import DOCX_MEDIA_TYPE
+
+# ARTIFACT_STORE values
+ARTIFACT_BACKENDS = ("memory", "disk", "object")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def content_key(data: bytes) -> str:
+    """Content-addressed key of an artifact."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def content_disposition(filename: str) -> str:
+    """Content-Disposition header for a download (ASCII fallback plus RFC 5987 UTF-8 name)."""
+    fallback = filename.encode('ascii', 'ignore').decode('ascii').replace('"', '') or "download"
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def _is_key(key: str) -> bool:
+    """Keys are SHA-256 hex digests; anything else (e.g. a path) is rejected."""
+    return len(key) == 64 and all(c in "0123456789abcdef" for c in key)
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for rendered documents with a retention period.
+
+    Storing the same bytes again returns the same key and renews the retention.
+    Expired artifacts are invisible immediately and deleted by collect_garbage(),
+    which put() also runs once every gc_interval_seconds.
+
+    Subclasses implement _save, _load_meta, _open_stream, _delete and _iter_keys.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, gc_interval_seconds: float = 60):
+        """
+        Args:
+            ttl_seconds: How long an artifact stays downloadable after its last put
+            gc_interval_seconds: Minimum time between garbage collections triggered by put()
+        """
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        self.ttl_seconds = ttl_seconds
+        self.gc_interval_seconds = gc_interval_seconds
+        self._gc_lock = threading.Lock()
+        self._last_gc = time.time()
+        self.collected = 0
+
+    @classmethod
+    def from_env(cls) -> "ArtifactStore":
+        """
+        Build the store selected by ARTIFACT_STORE (memory, disk or object).
+
+        Shared settings: ARTIFACT_TTL_SECONDS (3600), ARTIFACT_GC_INTERVAL_SECONDS (60).
+        memory: ARTIFACT_MEMORY_MAX_MB (256). disk: ARTIFACT_DIR (output/artifacts).
+        object: ARTIFACT_BUCKET_DIR (output/bucket), ARTIFACT_BUCKET (artifacts).
+        """
+        backend = os.getenv("ARTIFACT_STORE", "memory").lower()
+        if backend not in ARTIFACT_BACKENDS:
+            raise ValueError(f"Unknown artifact store '{backend}' (expected one of {', '.join(ARTIFACT_BACKENDS)})")
+        settings = {
+            "ttl_seconds": float(os.getenv("ARTIFACT_TTL_SECONDS", "3600")),
+            "gc_interval_seconds": float(os.getenv("ARTIFACT_GC_INTERVAL_SECONDS", "60")),
+        }
+        if backend == "disk":
+            return DiskArtifactStore(os.getenv("ARTIFACT_DIR", os.path.join("output", "artifacts")), **settings)
+        if backend == "object":
+            client = LocalObjectStoreClient(os.getenv("ARTIFACT_BUCKET_DIR", os.path.join("output", "bucket")))
+            return ObjectStoreArtifactStore(client, os.getenv("ARTIFACT_BUCKET", "artifacts"), **settings)
+        max_bytes = int(float(os.getenv("ARTIFACT_MEMORY_MAX_MB", "256")) * 1024 * 1024)
+        return MemoryArtifactStore(max_bytes=max_bytes, **settings)
+
+    def put(self, data: bytes, filename: str, media_type: str = DOCX_MEDIA_TYPE) -> Dict[str, Any]:
+        """
+        Store an artifact.
+
+        Args:
+            data: File content
+            filename: Download name (Content-Disposition)
+            media_type: MIME type served with the download
+
+        Returns:
+            Metadata: key, filename, media_type, size, created_at, expires_at
+        """
+        now = time.time()
+        meta = {
+            "key": content_key(data),
+            "filename": filename,
+            "media_type": media_type,
+            "size": len(data),
+            "created_at": now,
+            "expires_at": now + self.ttl_seconds,
+        }
+        self._save(meta["key"], data, meta)
+        self._maybe_collect(now)
+        return meta
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Metadata of a live artifact, or None if unknown or expired."""
+        if not _is_key(key):
+            return None
+        meta = self._load_meta(key)
+        if meta is None or meta["expires_at"] <= time.time():
+            return None
+        return meta
+
+    def open(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Optional[Tuple[Dict[str, Any], Iterator[bytes]]]:
+        """
+        Open a live artifact for streaming.
+
+        The content is opened before returning, so a download that has started is not
+        affected by a concurrent garbage collection.
+
+        Returns:
+            (metadata, iterator over chunks of at most chunk_size bytes), or None
+        """
+        meta = self.get(key)
+        if meta is None:
+            return None
+        chunks = self._open_stream(key, chunk_size)
+        if chunks is None:
+            return None
+        return meta, chunks
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Whole content of a live artifact, or None."""
+        opened = self.open(key)
+        return b"".join(opened[1]) if opened else None
+
+    def delete(self, key: str) -> None:
+        """Remove an artifact (no-op if it does not exist)."""
+        if _is_key(key):
+            self._delete(key)
+
+    def collect_garbage(self, now: Optional[float] = None) -> int:
+        """
+        Delete every expired artifact.
+
+        Returns:
+            Number of artifacts removed
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        for key in list(self._iter_keys()):
+            meta = self._load_meta(key)
+            if meta is not None and meta["expires_at"] <= now:
+                self._delete(key)
+                removed += 1
+        for key in self._stale_orphans(now):
+            self._delete(key)
+            removed += 1
+        with self._gc_lock:
+            self._last_gc = now
+            self.collected += removed
+        return removed
+
+    def _maybe_collect(self, now: float) -> None:
+        """Run collect_garbage() if gc_interval_seconds have passed since the last run."""
+        with self._gc_lock:
+            if now - self._last_gc < self.gc_interval_seconds:
+                return
+            self._last_gc = now
+        self.collect_garbage(now)
+
+    def stats(self) -> Dict[str, Any]:
+        """Artifact counts for metrics endpoints."""
+        keys = list(self._iter_keys())
+        metas = [meta for meta in (self._load_meta(key) for key in keys) if meta]
+        return {
+            "backend": type(self).__name__,
+            "artifacts": len(metas),
+            "bytes": sum(meta["size"] for meta in metas),
+            "ttl_seconds": self.ttl_seconds,
+            "collected": self.collected,
+        }
+
+    def _save(self, key: str, data: bytes, meta: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def _load_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _open_stream(self, key: str, chunk_size: int) -> Optional[Iterator[bytes]]:
+        raise NotImplementedError
+
+    def _delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def _iter_keys(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def _stale_orphans(self, now: float) -> List[str]:
+        """Keys left incomplete by an interrupted put, old enough to be removed."""
+        return []
+
+
+class MemoryArtifactStore(ArtifactStore):
+    """In-process store; the oldest artifacts are evicted once max_bytes is exceeded."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, **kwargs):
+        """
+        Args:
+            max_bytes: Upper bound on the total size of stored artifacts
+            **kwargs: ttl_seconds, gc_interval_seconds
+        """
+        super().__init__(**kwargs)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, Tuple[bytes, Dict[str, Any]]]" = OrderedDict()
+        self._bytes = 0
+
+    def _save(self, key: str, data: bytes, meta: Dict[str, Any]) -> None:
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+            self._items[key] = (data, meta)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and len(self._items) > 1:
+                _, (evicted, _) = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def _load_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._items.get(key)
+        return item[1] if item else None
+
+    def _open_stream(self, key: str, chunk_size: int) -> Optional[Iterator[bytes]]:
+        with self._lock:
+            item = self._items.get(key)
+        if item is None:
+            return None
+        view = memoryview(item[0])
+        return (bytes(view[i:i + chunk_size]) for i in range(0, len(view), chunk_size))
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            item = self._items.pop(key, None)
+            if item is not None:
+                self._bytes -= len(item[0])
+
+    def _iter_keys(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._items))
+
+
+def _iter_file(f, chunk_size: int) -> Iterator[bytes]:
+    """Yield an already opened file in chunks, closing it at the end."""
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        f.close()
+
+
+class DiskArtifactStore(ArtifactStore):
+    """Local directory store: <key>.bin holds the content, <key>.json its metadata."""
+
+    def __init__(self, directory: str, **kwargs):
+        """
+        Args:
+            directory: Directory for the artifact files (created if missing)
+            **kwargs: ttl_seconds, gc_interval_seconds
+        """
+        super().__init__(**kwargs)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _save(self, key: str, data: bytes, meta: Dict[str, Any]) -> None:
+        # Content first: metadata only appears once the content is complete
+        self._write_atomic(self._path(key, ".bin"), data)
+        self._write_atomic(self._path(key, ".json"), json.dumps(meta).encode('utf-8'))
+
+    def _load_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key, ".json"), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _open_stream(self, key: str, chunk_size: int) -> Optional[Iterator[bytes]]:
+        try:
+            f = open(self._path(key, ".bin"), 'rb')
+        except FileNotFoundError:
+            return None
+        return _iter_file(f, chunk_size)
+
+    def _delete(self, key: str) -> None:
+        for suffix in (".json", ".bin"):
+            try:
+                os.remove(self._path(key, suffix))
+            except FileNotFoundError:
+                pass
+
+    def _iter_keys(self) -> Iterator[str]:
+        return iter(sorted(name[:-len(".json")] for name in os.listdir(self.directory) if name.endswith(".json")))
+
+    def _stale_orphans(self, now: float) -> List[str]:
+        # Content whose metadata never appeared; the age check spares puts still in progress
+        orphans = []
+        for name in os.listdir(self.directory):
+            if not name.endswith((".bin", ".tmp")):
+                continue
+            key = name.split('.')[0]
+            path = os.path.join(self.directory, name)
+            try:
+                stale = now - os.path.getmtime(path) > self.ttl_seconds
+            except FileNotFoundError:
+                continue
+            if stale and (name.endswith(".tmp") or not os.path.exists(self._path(key, ".json"))):
+                if name.endswith(".tmp"):
+                    os.remove(path)
+                else:
+                    orphans.append(key)
+        return orphans
+
+
+class LocalObjectStoreClient:
+    """
+    Object-store stand-in on the local filesystem.
+
+    Implements the subset of the S3 client API used by ObjectStoreArtifactStore
+    (put_object, head_object, get_object, delete_object, list_objects_v2) so a real client can
+    be dropped in. Missing objects raise KeyError; listings are paginated like S3's.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Directory holding one subdirectory per bucket
+        """
+        self.root = root
+
+    def _path(self, bucket: str, key: str) -> str:
+        return os.path.join(self.root, bucket, *key.split('/'))
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, Metadata: Dict[str, str] = None, ContentType: str = "") -> None:
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(Body)
+        # Metadata travels with the object, as object headers do
+        with open(f"{tmp_path}.meta", 'w', encoding='utf-8') as f:
+            json.dump({"Metadata": Metadata or {}, "ContentType": ContentType}, f)
+        os.replace(f"{tmp_path}.meta", f"{path}.meta")
+        os.replace(tmp_path, path)
+
+    def get_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        path = self._path(Bucket, Key)
+        try:
+            with open(f"{path}.meta", 'r', encoding='utf-8') as f:
+                headers = json.load(f)
+            body = open(path, 'rb')
+        except FileNotFoundError:
+            raise KeyError(Key)
+        return {"Body": _LocalStreamingBody(body), "ContentLength": os.fstat(body.fileno()).st_size, **headers}
+
+    def head_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        path = self._path(Bucket, Key)
+        try:
+            with open(f"{path}.meta", 'r', encoding='utf-8') as f:
+                headers = json.load(f)
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            raise KeyError(Key)
+        return {"ContentLength": size, **headers}
+
+    def delete_object(self, Bucket: str, Key: str) -> None:
+        path = self._path(Bucket, Key)
+        for target in (path, f"{path}.meta"):
+            try:
+                os.remove(target)
+            except FileNotFoundError:
+                pass
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", MaxKeys: int = 1000, ContinuationToken: str = "") -> Dict[str, Any]:
+        base = os.path.join(self.root, Bucket)
+        keys: List[str] = []
+        for directory, _, files in os.walk(base):
+            for name in files:
+                if name.endswith((".meta", ".tmp")):
+                    continue
+                key = os.path.relpath(os.path.join(directory, name), base).replace(os.sep, '/')
+                # The token is the last key of the previous page
+                if key.startswith(Prefix) and key > ContinuationToken:
+                    keys.append(key)
+        keys.sort()
+        page = keys[:MaxKeys]
+        response = {"Contents": [{"Key": key} for key in page], "KeyCount": len(page), "IsTruncated": len(keys) > MaxKeys}
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = page[-1]
+        return response
+
+
+class _LocalStreamingBody:
+    """Minimal counterpart of botocore's StreamingBody."""
+
+    def __init__(self, f):
+        self._f = f
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._f.read() if amt is None else self._f.read(amt)
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        return _iter_file(self._f, chunk_size)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Whether an object-store error means the object does not exist (KeyError or an S3-style 404)."""
+    if isinstance(error, KeyError):
+        return True
+    # botocore's ClientError (and client.exceptions.NoSuchKey) carry the parsed error response
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return False
+    code = str(response.get("Error", {}).get("Code", ""))
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in ("404", "NoSuchKey", "NotFound") or status == 404
+
+
+class _ObjectClientAdapter:
+    """
+    The calls ObjectStoreArtifactStore makes, on top of any S3-compatible client:
+    missing objects come back as None whatever the client raises for them, and
+    listings follow continuation tokens past the first page.
+    """
+
+    def __init__(self, client: Any, bucket: str):
+        """
+        Args:
+            client: Object-store client (LocalObjectStoreClient, boto3 S3 client, ...)
+            bucket: Bucket name
+        """
+        self.client = client
+        self.bucket = bucket
+
+    def put(self, key: str, data: bytes, metadata: Dict[str, str], content_type: str) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, Metadata=metadata, ContentType=content_type)
+
+    def head(self, key: str) -> Optional[Dict[str, Any]]:
+        """Object headers, or None if the object does not exist."""
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            if _is_not_found(e):
+                return None
+            raise
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Object with its streaming Body, or None if it does not exist."""
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            if _is_not_found(e):
+                return None
+            raise
+
+    def delete(self, key: str) -> None:
+        """Remove an object (missing objects are ignored)."""
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            if not _is_not_found(e):
+                raise
+
+    def iter_keys(self, prefix: str) -> Iterator[str]:
+        """Every object key under a prefix, one listing page at a time."""
+        request = {"Bucket": self.bucket, "Prefix": prefix}
+        while True:
+            listing = self.client.list_objects_v2(**request)
+            for item in listing.get("Contents", []):
+                yield item["Key"]
+            if not listing.get("IsTruncated"):
+                return
+            request["ContinuationToken"] = listing["NextContinuationToken"]
+
+
+class ObjectStoreArtifactStore(ArtifactStore):
+    """
+    Store backed by an S3-compatible client (LocalObjectStoreClient by default).
+
+    Objects live under <prefix><key[:2]>/<key>; the artifact metadata is kept in the
+    object's user metadata, so expiry can be checked without downloading the content.
+    """
+
+    def __init__(self, client: Any, bucket: str, prefix: str = "artifacts/", **kwargs):
+        """
+        Args:
+            client: Object-store client with put_object/head_object/get_object/delete_object/list_objects_v2
+            bucket: Bucket name
+            prefix: Key prefix for artifacts
+            **kwargs: ttl_seconds, gc_interval_seconds
+        """
+        super().__init__(**kwargs)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self._objects = _ObjectClientAdapter(client, bucket)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key[:2]}/{key}"
+
+    def _save(self, key: str, data: bytes, meta: Dict[str, Any]) -> None:
+        # Object metadata values must be strings
+        self._objects.put(self._object_key(key), data, {"artifact": json.dumps(meta)}, meta["media_type"])
+
+    def _load_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        response = self._objects.head(self._object_key(key))
+        if response is None:
+            return None
+        return json.loads(response["Metadata"]["artifact"])
+
+    def _open_stream(self, key: str, chunk_size: int) -> Optional[Iterator[bytes]]:
+        response = self._objects.get(self._object_key(key))
+        if response is None:
+            return None
+        return response["Body"].iter_chunks(chunk_size)
+
+    def _delete(self, key: str) -> None:
+        self._objects.delete(self._object_key(key))
+
+    def _iter_keys(self) -> Iterator[str]:
+        return (object_key.rsplit('/', 1)[-1] for object_key in self._objects.iter_keys(self.prefix))
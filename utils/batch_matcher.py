@@ -0,0 +1,428 @@
+"""
+Batch Matcher
+Role: Score one profile against many analyzed jobs (JobRanker), or many stored profiles against
+one job (CandidateRanker), in vectorized passes over sparse matrices instead of calling
+MatchCalculator once per (profile, job) pair.
+"""
+
+import threading
+from typing import Dict, Any, List, Iterable, Optional, Set
+
+import numpy as np
+
+from utils.match_calculator import MatchCalculator
+from utils.profile_index import ProfileIndex, TokenIndex
+
+# Job sections in the order returned by MatchCalculator.extract_job_requirements
+SECTIONS = ("required", "nice_to_have", "keywords")
+
+
+class CSRMatrix:
+    """
+    Minimal compressed sparse row matrix with implicit 1.0 entries
+    (rows = jobs/candidates, columns = vocabulary terms).
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, n_cols: int):
+        self.indptr = indptr
+        self.indices = indices
+        self.n_rows = len(indptr) - 1
+        self.n_cols = n_cols
+        # Row id of every stored entry, used for vectorized row sums
+        self._row_ids = np.repeat(np.arange(self.n_rows), np.diff(indptr))
+
+    @classmethod
+    def from_rows(cls, rows: List[List[int]], n_cols: int) -> "CSRMatrix":
+        """Build from a list of column-id lists (one per row)."""
+        lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.fromiter(
+            (col for row in rows for col in row), dtype=np.int64, count=int(indptr[-1])
+        )
+        return cls(indptr, indices, n_cols)
+
+    def row(self, i: int) -> np.ndarray:
+        """Column ids stored in row i."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def row_counts(self) -> np.ndarray:
+        """Number of stored entries per row."""
+        return np.diff(self.indptr)
+
+    def dot(self, vector: np.ndarray) -> np.ndarray:
+        """Matrix-vector product (sum of vector[col] over each row's columns)."""
+        return np.bincount(self._row_ids, weights=vector[self.indices], minlength=self.n_rows)
+
+    def columns(self) -> np.ndarray:
+        """Distinct columns that appear in any row."""
+        return np.unique(self.indices)
+
+
+def score_arrays(
+    required_matched: np.ndarray, required_total: np.ndarray,
+    nice_matched: np.ndarray, nice_total: np.ndarray,
+    keywords_matched: np.ndarray, keywords_total: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized form of the MatchCalculator.calculate_match_score weighting
+    (required /100, nice-to-have /50, keywords /30, overall capped at 100).
+    """
+    required_score = np.where(required_total > 0, required_matched / np.maximum(required_total, 1) * 100, 100.0)
+    nice_to_have_score = np.where(nice_total > 0, nice_matched / np.maximum(nice_total, 1) * 50, 0.0)
+    keyword_score = np.where(keywords_total > 0, keywords_matched / np.maximum(keywords_total, 1) * 30, 0.0)
+    return {
+        "overall": np.minimum(100, required_score + nice_to_have_score + keyword_score),
+        "required": required_score,
+        "nice_to_have": nice_to_have_score,
+        "keywords": keyword_score,
+    }
+
+
+class JobRanker:
+    """
+    Ranks a fixed set of analyzed jobs for any number of profiles.
+
+    Job requirements are compiled once into sparse job x term matrices over a shared
+    vocabulary. Ranking a profile then matches each distinct term against the profile
+    once (exact or fuzzy, same rules as MatchCalculator) and scores every job with
+    three sparse matrix-vector products.
+    """
+
+    def __init__(self, job_analyses: Iterable[Dict[str, Any]], calculator: Optional[MatchCalculator] = None):
+        """
+        Args:
+            job_analyses: JobAnalyzer outputs to rank
+            calculator: MatchCalculator providing the similarity threshold and recommendations
+        """
+        self.calculator = calculator or MatchCalculator()
+        self.jobs: List[Dict[str, Any]] = list(job_analyses)
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+
+        rows: Dict[str, List[List[int]]] = {section: [] for section in SECTIONS}
+        for job in self.jobs:
+            for section, items in zip(SECTIONS, MatchCalculator.extract_job_requirements(job)):
+                rows[section].append([self._term_id(item) for item in items])
+
+        self.matrices = {
+            section: CSRMatrix.from_rows(rows[section], len(self.terms)) for section in SECTIONS
+        }
+        self.totals = {section: self.matrices[section].row_counts() for section in SECTIONS}
+        # Skills are matched against the profile's skills, ATS keywords against its keywords
+        self._skill_columns = np.union1d(self.matrices["required"].columns(), self.matrices["nice_to_have"].columns())
+        self._keyword_columns = self.matrices["keywords"].columns()
+
+    def _term_id(self, term: str) -> int:
+        term_id = self.vocabulary.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.vocabulary[term] = term_id
+            self.terms.append(term)
+        return term_id
+
+    def _hits(self, columns: np.ndarray, index: TokenIndex) -> np.ndarray:
+        """1.0 for every vocabulary column (among `columns`) the profile matches."""
+        hits = np.zeros(len(self.terms), dtype=np.float64)
+        threshold = self.calculator.similarity_threshold
+        for col in columns.tolist():
+            if index.matches(self.terms[col], threshold):
+                hits[col] = 1.0
+        return hits
+
+    def score_all(self, profile: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        Score every job for a profile.
+
+        Returns:
+            Arrays (one entry per job) of matched counts and section/overall scores
+        """
+        index = ProfileIndex.for_profile(profile)
+        skill_hits = self._hits(self._skill_columns, index.skills_index)
+        keyword_hits = self._hits(self._keyword_columns, index.keywords_index)
+
+        matched = {
+            "required": self.matrices["required"].dot(skill_hits),
+            "nice_to_have": self.matrices["nice_to_have"].dot(skill_hits),
+            "keywords": self.matrices["keywords"].dot(keyword_hits),
+        }
+        scores = score_arrays(
+            matched["required"], self.totals["required"],
+            matched["nice_to_have"], self.totals["nice_to_have"],
+            matched["keywords"], self.totals["keywords"]
+        )
+        scores["skill_hits"] = skill_hits
+        scores["keyword_hits"] = keyword_hits
+        scores.update({f"{section}_matched": matched[section] for section in SECTIONS})
+        return scores
+
+    def rank(self, profile: Dict[str, Any], top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rank all jobs for a profile, best first.
+
+        Args:
+            profile: Candidate profile
+            top_n: Only return (and build breakdowns for) the best N jobs
+
+        Returns:
+            One entry per job with 'job_index', 'role_info' and the same breakdown
+            fields as MatchCalculator.calculate_match_score
+        """
+        if not self.jobs:
+            return []
+        scores = self.score_all(profile)
+        # Stable sort keeps input order among equal scores
+        order = np.argsort(-scores["overall"], kind="stable")
+        if top_n is not None:
+            order = order[:top_n]
+
+        ranked = []
+        for job_index in order.tolist():
+            result = self._breakdown(job_index, scores)
+            result["job_index"] = job_index
+            result["role_info"] = self.jobs[job_index].get("role_info", {})
+            ranked.append(result)
+        return ranked
+
+    def _breakdown(self, job_index: int, scores: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """Per-job breakdown in the calculate_match_score format."""
+        skill_hits = scores["skill_hits"]
+        missing_required = {
+            self.terms[col] for col in self.matrices["required"].row(job_index).tolist() if not skill_hits[col]
+        }
+        missing_nice_to_have = {
+            self.terms[col] for col in self.matrices["nice_to_have"].row(job_index).tolist() if not skill_hits[col]
+        }
+        overall_score = float(scores["overall"][job_index])
+
+        return {
+            'overall_score': round(overall_score, 1),
+            'required_skills_score': round(float(scores["required"][job_index]), 1),
+            'nice_to_have_score': round(float(scores["nice_to_have"][job_index]), 1),
+            'keyword_score': round(float(scores["keywords"][job_index]), 1),
+            'required_skills_matched': int(scores["required_matched"][job_index]),
+            'required_skills_total': int(self.totals["required"][job_index]),
+            'nice_to_have_matched': int(scores["nice_to_have_matched"][job_index]),
+            'nice_to_have_total': int(self.totals["nice_to_have"][job_index]),
+            'keywords_matched': int(scores["keywords_matched"][job_index]),
+            'keywords_total': int(self.totals["keywords"][job_index]),
+            'missing_required_skills': list(missing_required)[:10],  # Top 10
+            'missing_nice_to_have_skills': list(missing_nice_to_have)[:10],
+            'recommendations': self.calculator._generate_recommendations(
+                overall_score,
+                missing_required,
+                missing_nice_to_have
+            )
+        }
+
+
+class _ItemMatrix:
+    """
+    Incrementally updatable candidate x item matrix for one item space
+    (profile skills or profile keywords).
+
+    Rows hold each candidate's item ids (CSR view); postings hold each item's
+    candidate rows (CSC view) so a job term resolves to matching candidates
+    without scanning the corpus.
+    """
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.items: List[str] = []
+        self.token_index = TokenIndex(())
+        self.rows: Dict[int, np.ndarray] = {}
+        self.postings: List[Set[int]] = []
+
+    def set_row(self, row: int, items: Iterable[str]) -> None:
+        """Replace a candidate's items."""
+        self.clear_row(row)
+        item_ids = []
+        for item in items:
+            item_id = self.vocabulary.get(item)
+            if item_id is None:
+                item_id = len(self.items)
+                self.vocabulary[item] = item_id
+                self.items.append(item)
+                self.postings.append(set())
+                self.token_index.add(item)
+            self.postings[item_id].add(row)
+            item_ids.append(item_id)
+        self.rows[row] = np.array(sorted(item_ids), dtype=np.int64)
+
+    def clear_row(self, row: int) -> None:
+        """Remove a candidate's items (vocabulary entries are kept for reuse)."""
+        for item_id in self.rows.pop(row, np.empty(0, dtype=np.int64)).tolist():
+            self.postings[item_id].discard(row)
+
+    def term_hits(self, term: str, threshold: float, n_rows: int) -> np.ndarray:
+        """Boolean vector over candidate rows: does the candidate have an item matching the term?"""
+        hits = np.zeros(n_rows, dtype=bool)
+        for item in self.token_index.matching_items(term, threshold):
+            rows = self.postings[self.vocabulary[item]]
+            if rows:
+                hits[np.fromiter(rows, dtype=np.int64, count=len(rows))] = True
+        return hits
+
+
+class CandidateRanker:
+    """
+    Ranks a corpus of stored candidate profiles against one job analysis.
+
+    Each profile's skills and keywords are extracted once into candidate x item
+    matrices. Profiles can be added, replaced or removed one row at a time; a
+    query resolves every job term to the matching candidates through the item
+    postings and scores the whole corpus with vectorized sums.
+    """
+
+    def __init__(self, calculator: Optional[MatchCalculator] = None):
+        """
+        Args:
+            calculator: MatchCalculator providing the similarity threshold and recommendations
+        """
+        self.calculator = calculator or MatchCalculator()
+        self.skills = _ItemMatrix()
+        self.keywords = _ItemMatrix()
+        self.row_ids: Dict[str, int] = {}
+        self.candidate_ids: List[Optional[str]] = []
+        self.names: List[str] = []
+        self._free_rows: List[int] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_profiles(
+        cls,
+        profiles: Dict[str, Dict[str, Any]],
+        calculator: Optional[MatchCalculator] = None
+    ) -> "CandidateRanker":
+        """Build a ranker from {candidate_id: profile}."""
+        ranker = cls(calculator)
+        for candidate_id, profile in profiles.items():
+            ranker.add_profile(candidate_id, profile)
+        return ranker
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def add_profile(self, candidate_id: str, profile: Dict[str, Any]) -> None:
+        """
+        Insert a profile, or update its row in place if the candidate is already stored.
+
+        Args:
+            candidate_id: Stable identifier for the candidate
+            profile: Candidate profile
+        """
+        # Extraction happens outside the lock; only the row swap is serialized
+        skills = ProfileIndex.extract_candidate_skills(profile)
+        keywords = ProfileIndex.extract_keywords(profile)
+        name = profile.get('personal_info', {}).get('name', '')
+
+        with self._lock:
+            row = self.row_ids.get(candidate_id)
+            if row is None:
+                if self._free_rows:
+                    row = self._free_rows.pop()
+                    self.candidate_ids[row] = candidate_id
+                    self.names[row] = name
+                else:
+                    row = len(self.candidate_ids)
+                    self.candidate_ids.append(candidate_id)
+                    self.names.append(name)
+                self.row_ids[candidate_id] = row
+            else:
+                self.names[row] = name
+            self.skills.set_row(row, skills)
+            self.keywords.set_row(row, keywords)
+
+    def remove_profile(self, candidate_id: str) -> bool:
+        """
+        Remove a stored profile.
+
+        Returns:
+            True if the candidate was stored
+        """
+        with self._lock:
+            row = self.row_ids.pop(candidate_id, None)
+            if row is None:
+                return False
+            self.skills.clear_row(row)
+            self.keywords.clear_row(row)
+            self.candidate_ids[row] = None
+            self.names[row] = ''
+            self._free_rows.append(row)
+            return True
+
+    def rank(self, job_analysis: Dict[str, Any], top_n: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find the best-matching stored candidates for a job.
+
+        Args:
+            job_analysis: Analyzed job requirements
+            top_n: Number of candidates to return
+
+        Returns:
+            Candidates best first, each with 'candidate_id', 'name' and the same
+            breakdown fields as MatchCalculator.calculate_match_score
+        """
+        required, nice_to_have, ats_keywords = MatchCalculator.extract_job_requirements(job_analysis)
+        # Fixed term order so per-term hit rows line up with the names below
+        required_terms, nice_terms, keyword_terms = sorted(required), sorted(nice_to_have), sorted(ats_keywords)
+        threshold = self.calculator.similarity_threshold
+
+        with self._lock:
+            n_rows = len(self.candidate_ids)
+            if not self.row_ids:
+                return []
+            active = np.zeros(n_rows, dtype=bool)
+            active[list(self.row_ids.values())] = True
+
+            def hit_matrix(matrix: _ItemMatrix, terms: List[str]) -> np.ndarray:
+                if not terms:
+                    return np.zeros((0, n_rows), dtype=bool)
+                return np.vstack([matrix.term_hits(term, threshold, n_rows) for term in terms])
+
+            required_hits = hit_matrix(self.skills, required_terms)
+            nice_hits = hit_matrix(self.skills, nice_terms)
+            keyword_hits = hit_matrix(self.keywords, keyword_terms)
+            candidate_ids = list(self.candidate_ids)
+            names = list(self.names)
+
+        required_matched = required_hits.sum(axis=0)
+        nice_matched = nice_hits.sum(axis=0)
+        keywords_matched = keyword_hits.sum(axis=0)
+        scores = score_arrays(
+            required_matched, np.full(n_rows, len(required_terms)),
+            nice_matched, np.full(n_rows, len(nice_terms)),
+            keywords_matched, np.full(n_rows, len(ats_keywords))
+        )
+
+        # Free rows sort last; stable sort keeps insertion order among ties
+        overall = np.where(active, scores["overall"], -1.0)
+        order = np.argsort(-overall, kind="stable")[:min(top_n, int(active.sum()))]
+
+        ranked = []
+        for row in order.tolist():
+            missing_required = {term for i, term in enumerate(required_terms) if not required_hits[i, row]}
+            missing_nice_to_have = {term for i, term in enumerate(nice_terms) if not nice_hits[i, row]}
+            overall_score = float(scores["overall"][row])
+            ranked.append({
+                'candidate_id': candidate_ids[row],
+                'name': names[row],
+                'overall_score': round(overall_score, 1),
+                'required_skills_score': round(float(scores["required"][row]), 1),
+                'nice_to_have_score': round(float(scores["nice_to_have"][row]), 1),
+                'keyword_score': round(float(scores["keywords"][row]), 1),
+                'required_skills_matched': int(required_matched[row]),
+                'required_skills_total': len(required_terms),
+                'nice_to_have_matched': int(nice_matched[row]),
+                'nice_to_have_total': len(nice_terms),
+                'keywords_matched': int(keywords_matched[row]),
+                'keywords_total': len(keyword_terms),
+                'missing_required_skills': list(missing_required)[:10],  # Top 10
+                'missing_nice_to_have_skills': list(missing_nice_to_have)[:10],
+                'recommendations': self.calculator._generate_recommendations(
+                    overall_score,
+                    missing_required,
+                    missing_nice_to_have
+                )
+            })
+        return ranked
@@ -0,0 +1,169 @@
+"""
+Bullet Rewrite Cache
+Role: Persist rewritten CV bullets keyed by (bullet, target keywords, model, prompt version) so bullets
+already tailored toward the same keyword set are reused across applications instead of re-prompted.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional
+
+BULLET_CACHE_VERSION = 1
+
+
+class BulletRewriteCache:
+    """
+    Thread-safe LRU cache of bullet rewrites, persisted as a JSON file.
+
+    Entries are kept in least-recently-used order; once max_entries is exceeded the
+    oldest entries are evicted. Hits, misses and evictions are counted for metrics.
+    Only put() marks the cache for flushing: hits reorder entries in memory, and the
+    order on disk catches up with the next write. flush() merges the entries other
+    processes wrote to the same file, so several servers can share one cache.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 5000):
+        """
+        Initialize the cache.
+
+        Args:
+            path: JSON file backing the cache (None keeps it in memory only)
+            max_entries: Maximum number of cached bullets
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries: "OrderedDict[str, str]" = self._load()
+
+    @classmethod
+    def from_env(cls) -> Optional["BulletRewriteCache"]:
+        """
+        Build a cache from BULLET_CACHE_PATH and BULLET_CACHE_MAX_ENTRIES.
+
+        Only CVCustomizer's parallel mode (CV_CUSTOMIZER_MODE=parallel) rewrites bullets
+        one role at a time; the single and edits modes never read or fill the cache.
+
+        Returns:
+            Configured cache, or None when BULLET_CACHE_PATH is not set
+        """
+        path = os.getenv("BULLET_CACHE_PATH")
+        if not path:
+            return None
+        return cls(path, max_entries=int(os.getenv("BULLET_CACHE_MAX_ENTRIES", "5000")))
+
+    def _load(self) -> "OrderedDict[str, str]":
+        """Load entries from disk, oldest first (empty when missing or from another version)."""
+        if not self.path or not os.path.exists(self.path):
+            return OrderedDict()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            print(f"⚠️  Bullet cache at {self.path} is corrupt; starting empty.")
+            return OrderedDict()
+        if data.get("version") != BULLET_CACHE_VERSION:
+            return OrderedDict()
+        entries = OrderedDict((key, text) for key, text in data.get("entries", []))
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return entries
+
+    @staticmethod
+    def make_key(bullet: str, keywords: Iterable[str], model: str, prompt_version: int) -> str:
+        """
+        Cache key for one bullet rewrite.
+
+        Args:
+            bullet: Original bullet text (whitespace-normalized before hashing)
+            keywords: Canonical target keywords (order and case do not matter)
+            model: Model that produces the rewrite
+            prompt_version: Version of the rewrite prompt
+
+        Returns:
+            Hex digest identifying the rewrite
+        """
+        payload = json.dumps(
+            [" ".join(bullet.split()), sorted({k.lower() for k in keywords}), model, prompt_version],
+            ensure_ascii=False, separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached rewrite for a key (marks it most recently used), or None."""
+        with self._lock:
+            text = self.entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return text
+
+    def put(self, key: str, text: str) -> None:
+        """Store a rewrite, evicting the least recently used entries beyond max_entries."""
+        with self._lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            self._dirty = True
+
+    def flush(self) -> None:
+        """
+        Atomically write the cache to disk if it changed since the last flush.
+
+        Entries another process flushed to the same file since it was loaded are merged
+        in (as least recently used) rather than overwritten. Two processes flushing at
+        the same instant can still drop each other's newest entries, which only costs
+        a later cache miss.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+        on_disk = self._load()
+        with self._lock:
+            merged = OrderedDict((key, text) for key, text in on_disk.items() if key not in self.entries)
+            merged.update(self.entries)
+            while len(merged) > self.max_entries:
+                merged.popitem(last=False)
+            self.entries = merged
+            entries: List[List[str]] = [[key, text] for key, text in self.entries.items()]
+            self._dirty = False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": BULLET_CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics since startup."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+    def print_report(self) -> None:
+        """Print hit-rate metrics."""
+        stats = self.stats()
+        print(f"\n🗃️  Bullet cache: {stats['hits']}/{stats['hits'] + stats['misses']} hits "
+              f"({stats['hit_rate'] * 100:.0f}%), {stats['entries']} entries, {stats['evictions']} evicted")
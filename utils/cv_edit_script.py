@@ -0,0 +1,220 @@
+"""
+CV Edit Script
+Role: Give profile elements stable IDs so the CV customizer can answer with a compact list of
+operations instead of re-emitting the whole CV, and rebuild the full CV dict locally from them.
+"""
+
+import json
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from utils.profile_index import ProfileIndex
+
+# Operations the applier understands
+EDIT_OPERATIONS = ("set_summary", "select_roles", "order_skills", "select_bullets", "replace_bullet")
+
+# Bullets kept per role when the script does not select any explicitly
+DEFAULT_BULLETS_PER_ROLE = 4
+
+
+class EditScriptError(ValueError):
+    """Raised when an edit script is malformed or references IDs that do not exist."""
+
+
+def unique_education(profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Education entries of a profile, each (school, degree, dates) only once."""
+    education = []
+    seen: Set[Tuple[str, str, str]] = set()
+    for edu in profile.get('education', []) or []:
+        key = ProfileIndex.education_key(edu)
+        if key not in seen:
+            seen.add(key)
+            education.append(edu)
+    return education
+
+
+class ProfileCatalog:
+    """
+    Stable, position-based IDs for the editable parts of a profile.
+
+    Roles are r1..rN, their bullets r1.b1..r1.bM (responsibilities then achievements),
+    and skills s1..sK across all categories in profile order. The same profile always
+    yields the same IDs.
+    """
+
+    def __init__(self, profile: Dict[str, Any]):
+        """
+        Args:
+            profile: Master profile
+        """
+        self.profile = profile
+        self.roles: Dict[str, Dict[str, Any]] = {}
+        self.role_bullets: Dict[str, List[str]] = {}
+        self.bullets: Dict[str, str] = {}
+        self.skills: Dict[str, Tuple[str, str]] = {}
+
+        for i, role in enumerate(profile.get('experience', []) or [], start=1):
+            role_id = f"r{i}"
+            self.roles[role_id] = role
+            self.role_bullets[role_id] = []
+            for j, bullet in enumerate(ProfileIndex._role_items(role), start=1):
+                bullet_id = f"{role_id}.b{j}"
+                self.role_bullets[role_id].append(bullet_id)
+                self.bullets[bullet_id] = bullet
+
+        skills = profile.get('skills', {})
+        categories = skills.items() if isinstance(skills, dict) else [("Technical", skills or [])]
+        counter = 0
+        for category, items in categories:
+            for skill in items or []:
+                counter += 1
+                self.skills[f"s{counter}"] = (category, skill)
+
+    def render(self) -> str:
+        """Compact, ID-annotated listing of the profile for the prompt."""
+        lines = ["SUMMARY:", json.dumps(self.profile.get('summary', '') or '', ensure_ascii=False), "", "ROLES:"]
+        for role_id, role in self.roles.items():
+            lines.append(f"[{role_id}] {role.get('title', '')} at {role.get('company', '')} ({role.get('dates', '')})")
+            for bullet_id in self.role_bullets[role_id]:
+                lines.append(f"    [{bullet_id}] {self.bullets[bullet_id]}")
+        lines.append("")
+        lines.append("SKILLS:")
+        for skill_id, (category, skill) in self.skills.items():
+            lines.append(f"[{skill_id}] {skill} ({category})")
+        return "\n".join(lines)
+
+    def validate(self, script: Dict[str, Any]) -> List[str]:
+        """
+        Check an edit script against the catalog.
+
+        Returns:
+            Human-readable problems (empty if the script is valid)
+        """
+        if not isinstance(script, dict) or not isinstance(script.get('operations'), list):
+            return ["Edit script must be an object with an 'operations' list"]
+
+        errors = []
+        for position, operation in enumerate(script['operations']):
+            if not isinstance(operation, dict) or operation.get('op') not in EDIT_OPERATIONS:
+                errors.append(f"Operation {position}: unknown op {operation.get('op') if isinstance(operation, dict) else operation!r}")
+                continue
+            op = operation['op']
+            if op in ('set_summary', 'replace_bullet') and not isinstance(operation.get('text'), str):
+                errors.append(f"Operation {position} ({op}): 'text' must be a string")
+            if op == 'replace_bullet':
+                ids, known = [operation.get('id')], self.bullets
+            elif op == 'select_roles':
+                ids, known = operation.get('ids'), self.roles
+            elif op == 'order_skills':
+                ids, known = operation.get('ids'), self.skills
+            elif op == 'select_bullets':
+                ids, known = operation.get('ids'), self.bullets
+            else:
+                continue
+            if not isinstance(ids, list):
+                errors.append(f"Operation {position} ({op}): 'ids' must be a list")
+                continue
+            if op == 'select_roles' and not ids and self.roles:
+                errors.append(f"Operation {position} ({op}): at least one role must be selected")
+                continue
+            # Checked before the lookup: lists or dicts from a malformed response are unhashable
+            invalid = [repr(item) for item in ids if not isinstance(item, str)]
+            if invalid:
+                errors.append(f"Operation {position} ({op}): IDs must be strings (got {', '.join(invalid)})")
+                continue
+            unknown = [item for item in ids if item not in known]
+            if unknown:
+                errors.append(f"Operation {position} ({op}): unknown IDs {', '.join(unknown)}")
+        if errors:
+            return errors
+
+        # A replacement for a bullet that does not end up in the CV would be dropped silently
+        _, role_ids, _, bullet_ids, replacements = self._collect(script)
+        shown = {bullet_id for role_id in role_ids for bullet_id in bullet_ids[role_id]}
+        hidden = [bullet_id for bullet_id in replacements if bullet_id not in shown]
+        if hidden:
+            errors.append(f"replace_bullet targets bullets that are not selected: {', '.join(hidden)}")
+        return errors
+
+    def _collect(self, script: Dict[str, Any]) -> Tuple[
+        str, List[str], Optional[List[str]], Dict[str, List[str]], Dict[str, str]
+    ]:
+        """
+        Net effect of a validated script.
+
+        Returns:
+            (summary, role IDs, skill IDs or None, bullet IDs shown per role, replacement text per bullet ID)
+        """
+        summary = self.profile.get('summary', '') or ''
+        role_ids = list(self.roles)
+        skill_ids = None
+        selected_bullets: Dict[str, List[str]] = {}
+        replacements: Dict[str, str] = {}
+
+        for operation in script['operations']:
+            op = operation['op']
+            if op == 'set_summary':
+                summary = operation['text']
+            elif op == 'select_roles':
+                role_ids = list(dict.fromkeys(operation['ids']))
+            elif op == 'order_skills':
+                skill_ids = list(dict.fromkeys(operation['ids']))
+            elif op == 'select_bullets':
+                for bullet_id in dict.fromkeys(operation['ids']):
+                    selected_bullets.setdefault(bullet_id.split('.')[0], []).append(bullet_id)
+            elif op == 'replace_bullet':
+                replacements[operation['id']] = operation['text']
+
+        bullet_ids = {
+            role_id: selected_bullets.get(role_id) or self.role_bullets[role_id][:DEFAULT_BULLETS_PER_ROLE]
+            for role_id in self.roles
+        }
+        return summary, role_ids, skill_ids, bullet_ids, replacements
+
+    def apply(self, script: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild a full customized CV from an edit script.
+
+        Args:
+            script: {"operations": [...]} as returned by the model
+
+        Returns:
+            CV dictionary in the same schema as CVCustomizer.customize()
+
+        Raises:
+            EditScriptError: If the script is malformed or references unknown IDs
+        """
+        errors = self.validate(script)
+        if errors:
+            raise EditScriptError("; ".join(errors))
+
+        summary, role_ids, skill_ids, bullet_ids, replacements = self._collect(script)
+
+        experience = []
+        for role_id in role_ids:
+            role = self.roles[role_id]
+            experience.append({
+                "company": role.get('company', ''),
+                "title": role.get('title', ''),
+                "dates": role.get('dates', ''),
+                "achievements": [replacements.get(bullet_id, self.bullets[bullet_id]) for bullet_id in bullet_ids[role_id]]
+            })
+
+        return {
+            "personal_info": self.profile.get('personal_info', {}),
+            "summary": summary,
+            "skills": self._build_skills(skill_ids),
+            "experience": experience,
+            "education": unique_education(self.profile)
+        }
+
+    def _build_skills(self, skill_ids: Any) -> Any:
+        """Skills grouped under their original categories, in the script's order."""
+        if skill_ids is None:
+            return self.profile.get('skills', {})
+        grouped: Dict[str, List[str]] = {}
+        for skill_id in skill_ids:
+            category, skill = self.skills[skill_id]
+            grouped.setdefault(category, []).append(skill)
+        if not isinstance(self.profile.get('skills', {}), dict):
+            return grouped.get("Technical", [])
+        return grouped
@@ -3,37 +3,78 @@ DeepSeek API Client Wrapper
 Role: Handle all interactions with DeepSeek API via OpenAI client with robust error handling.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional
 import json
 import os
+import time
 from openai import OpenAI, APIError, RateLimitError
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_not_exception_type
+from utils.llm_cassette import LLMCassette, CassetteMissError
+from utils.llm_metrics import LLMMetrics
+
+DEFAULT_BASE_URL = "https://api.deepseek.com"
+
+# Extra requests made when fewer than n variants come back
+MAX_VARIANT_TOP_UPS = 2
+
+# Attempts at opening a stream (same count and back-off as the retried calls)
+STREAM_ATTEMPTS = 3
+
+
+def stream_retry_wait(attempt: int) -> float:
+    """Seconds to wait before retrying a stream that failed on the given attempt."""
+    return min(10.0, max(2.0, 2.0 ** attempt))
+
 
 class DeepSeekClient:
     """
     Wrapper for DeepSeek API (OpenAI-compatible) to handle configuration, generation, and error handling.
     """
     
-    def __init__(self, api_key: str, model_name: str = "deepseek-chat"):
+    provider = "deepseek"
+
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "deepseek-chat",
+        max_tokens: Optional[int] = None,
+        route_name: str = "default",
+        metrics: Optional[LLMMetrics] = None,
+        cassette: Optional[LLMCassette] = None,
+        base_url: Optional[str] = None
+    ):
         """
         Initialize the DeepSeek client.
 
         Args:
             api_key: DeepSeek API Key
             model_name: Model version to use (default: deepseek-chat)
+            max_tokens: Default cap on output tokens per call (None = provider default)
+            route_name: Agent/route name used when recording metrics
+            metrics: Optional metrics collector for latency and token usage
+            cassette: Optional record/replay cassette for offline runs
+            base_url: OpenAI-compatible endpoint (default: DEEPSEEK_BASE_URL env or the DeepSeek API),
+                      e.g. a local llm_stub_server.py for load testing
         """
         if not api_key:
             raise ValueError("API key is required for DeepSeekClient")
             
+        self.base_url = base_url or os.getenv("DEEPSEEK_BASE_URL", DEFAULT_BASE_URL)
         self.client = OpenAI(
             api_key=api_key,
-            base_url="https://api.deepseek.com"
+            base_url=self.base_url
         )
         self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.route_name = route_name
+        self.metrics = metrics
+        self.cassette = cassette
+        self.last_usage: Dict[str, int] = {}
 
     @retry(
         stop=stop_after_attempt(3), 
-        wait=wait_exponential(multiplier=1, min=2, max=10)
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_not_exception_type(CassetteMissError)
     )
     def generate_content(self, prompt: str, system_instruction: str = "", config: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -42,35 +83,230 @@ class DeepSeekClient:
         Args:
             prompt: The input prompt string
             system_instruction: System prompt/role definition
-            config: Optional generation config (temperature, etc.)
+            config: Optional generation config (temperature, max_tokens, etc.)
 
         Returns:
             Generated text string
         """
+        return self._generate(prompt, system_instruction, config, n=1)[0]
+
+    @retry(
+        stop=stop_after_attempt(3), 
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_not_exception_type(CassetteMissError)
+    )
+    def generate_variants(
+        self,
+        prompt: str,
+        n: int,
+        system_instruction: str = "",
+        config: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        Generate n alternative completions of one prompt in a single request (`n` parameter),
+        so the prompt is processed once.
+
+        Args:
+            prompt: The input prompt string
+            n: Number of variants
+            system_instruction: System prompt/role definition
+            config: Optional generation config (temperature, max_tokens, etc.)
+
+        Returns:
+            Up to n generated text strings (topped up with at most MAX_VARIANT_TOP_UPS extra calls
+            if the provider returns fewer; fewer are returned when a call adds nothing)
+
+        Raises:
+            ValueError: If no variant comes back at all
+        """
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        variants = self._generate(prompt, system_instruction, config, n=n)
+        for _ in range(MAX_VARIANT_TOP_UPS):
+            if len(variants) >= n:
+                break
+            added = self._generate(prompt, system_instruction, config, n=n - len(variants))
+            if not added:
+                break
+            variants.extend(added)
+        if not variants:
+            raise ValueError("The model returned no choices (blocked or empty response)")
+        return variants[:n]
+
+    def stream_content(
+        self,
+        prompt: str,
+        system_instruction: str = "",
+        config: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """
+        Stream text content from DeepSeek as it is generated.
+
+        Failures before the first delta (connection errors, rate limits) are retried up to
+        STREAM_ATTEMPTS times; once a delta has been yielded a failure is raised, since a
+        retry would duplicate output already consumed. Cassettes share the key of
+        generate_content, so a recorded response replays as one chunk.
+
+        Args:
+            prompt: The input prompt string
+            system_instruction: System prompt/role definition
+            config: Optional generation config (temperature, max_tokens, etc.)
+
+        Yields:
+            Text deltas in order
+        """
+        start = time.perf_counter()
+        config = config or {}
+        temperature = config.get("temperature", 0.7)
+        max_tokens = config.get("max_tokens", self.max_tokens)
+
+        cassette_request = None
+        if self.cassette is not None:
+            cassette_request = LLMCassette.build_request(
+                self.provider, self.model_name, system_instruction, prompt,
+                {"temperature": temperature, "max_tokens": max_tokens}
+            )
+            replayed = self.cassette.replay(cassette_request)
+            if replayed is not None:
+                self.last_usage = replayed.get("usage", {})
+                self._record(time.perf_counter() - start, self.last_usage)
+                yield replayed["response"]
+                return
+
+        print(f"🤖 User: Streaming DeepSeek ({self.model_name}) for {self.route_name}...")
+        messages = []
+        if system_instruction:
+            messages.append({"role": "system", "content": system_instruction})
+        messages.append({"role": "user", "content": prompt})
+
+        request_args = {
+            "model": self.model_name,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+        if max_tokens:
+            request_args["max_tokens"] = max_tokens
+
+        for attempt in range(1, STREAM_ATTEMPTS + 1):
+            parts: List[str] = []
+            usage: Dict[str, int] = {}
+            try:
+                for chunk in self.client.chat.completions.create(**request_args):
+                    if getattr(chunk, "usage", None) is not None:
+                        usage = self._extract_usage(chunk)
+                    if chunk.choices:
+                        delta = chunk.choices[0].delta.content
+                        if delta:
+                            parts.append(delta)
+                            yield delta
+                break
+            except Exception as e:
+                self._record(time.perf_counter() - start, error=True)
+                print(f"❌ DeepSeek API Error: {e}")
+                if parts or attempt == STREAM_ATTEMPTS:
+                    raise
+                wait = stream_retry_wait(attempt)
+                print(f"🔁 Retrying stream in {wait:.0f}s (attempt {attempt + 1}/{STREAM_ATTEMPTS})...")
+                time.sleep(wait)
+
+        latency = time.perf_counter() - start
+        self.last_usage = usage
+        self._record(latency, usage)
+        if cassette_request is not None:
+            self.cassette.record(cassette_request, "".join(parts), usage, latency)
+
+    def _generate(self, prompt: str, system_instruction: str, config: Optional[Dict[str, Any]], n: int) -> List[str]:
+        """Run one chat completion request and return the content of every choice."""
+        start = time.perf_counter()
+        config = config or {}
+        temperature = config.get("temperature", 0.7)
+        max_tokens = config.get("max_tokens", self.max_tokens)
+
+        cassette_request = None
+        if self.cassette is not None:
+            params = {"temperature": temperature, "max_tokens": max_tokens}
+            if n > 1:
+                params["n"] = n
+            cassette_request = LLMCassette.build_request(
+                self.provider, self.model_name, system_instruction, prompt, params
+            )
+            replayed = self.cassette.replay(cassette_request)
+            if replayed is not None:
+                self.last_usage = replayed.get("usage", {})
+                self._record(time.perf_counter() - start, self.last_usage)
+                return json.loads(replayed["response"]) if n > 1 else [replayed["response"]]
+
         try:
-            print(f"🤖 User: Calling DeepSeek ({self.model_name})...")
-            temperature = config.get("temperature", 0.7) if config else 0.7
+            print(f"🤖 User: Calling DeepSeek ({self.model_name}) for {self.route_name}...")
             
             messages = []
             if system_instruction:
                 messages.append({"role": "system", "content": system_instruction})
             messages.append({"role": "user", "content": prompt})
 
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                temperature=temperature,
-                stream=False
-            )
-            return response.choices[0].message.content
+            request_args = {
+                "model": self.model_name,
+                "messages": messages,
+                "temperature": temperature,
+                "stream": False
+            }
+            if max_tokens:
+                request_args["max_tokens"] = max_tokens
+            if n > 1:
+                request_args["n"] = n
+
+            response = self.client.chat.completions.create(**request_args)
+            latency = time.perf_counter() - start
+            contents = [choice.message.content for choice in response.choices]
+            self.last_usage = self._extract_usage(response)
+            self._record(latency, self.last_usage)
+            if cassette_request is not None:
+                recorded = json.dumps(contents, ensure_ascii=False) if n > 1 else contents[0]
+                self.cassette.record(cassette_request, recorded, self.last_usage, latency)
+            return contents
             
         except RateLimitError:
+            self._record(time.perf_counter() - start, error=True)
             print("⚠️  Rate limit exceeded. Retrying...")
             raise
         except Exception as e:
+            self._record(time.perf_counter() - start, error=True)
             print(f"❌ DeepSeek API Error: {e}")
             raise
 
+    def _extract_usage(self, response: Any) -> Dict[str, int]:
+        """Pull token usage out of a chat completion response."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return {}
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+
+        # DeepSeek reports prefix-cache hits/misses directly; other OpenAI-compatible
+        # servers report cached tokens under prompt_tokens_details.
+        cache_hit = getattr(usage, "prompt_cache_hit_tokens", None)
+        if cache_hit is None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            cache_hit = getattr(details, "cached_tokens", 0) if details is not None else 0
+        cache_hit = cache_hit or 0
+        cache_miss = getattr(usage, "prompt_cache_miss_tokens", None)
+        if cache_miss is None:
+            cache_miss = max(prompt_tokens - cache_hit, 0)
+
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+            "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+            "cache_hit_tokens": cache_hit,
+            "cache_miss_tokens": cache_miss or 0,
+        }
+
+    def _record(self, latency: float, usage: Optional[Dict[str, int]] = None, error: bool = False) -> None:
+        """Forward call statistics to the metrics collector, if any."""
+        if self.metrics is not None:
+            self.metrics.record(self.route_name, self.provider, self.model_name, latency, usage, error)
+
     def generate_json(self, prompt: str, system_instruction: str = "", temperature: float = 0.0) -> Dict[str, Any]:
         """
         Generate and parse JSON content.
@@ -3,81 +3,259 @@ Document Builder Utility
 Role: Generate professional, ATS-friendly DOCX files.
 """
 
-from typing import Dict, Any, List
+import copy
+import io
+import os
+import threading
+from typing import BinaryIO, Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from docx import Document
+from docx.document import Document as DocxDocument
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
+
+# DOCUMENT_RENDERER values: python-docx object model, or the direct OOXML writer
+RENDERERS = ("docx", "ooxml")
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Output formats: Word document, or plain text / Markdown (ATS paste-in forms, previews)
+DOCUMENT_FORMATS = ("docx", "txt", "md")
+FORMAT_MEDIA_TYPES = {
+    "docx": DOCX_MEDIA_TYPE,
+    "txt": "text/plain; charset=utf-8",
+    "md": "text/markdown; charset=utf-8",
+}
+
+DEFAULT_FONT_NAME = "Calibri"
+DEFAULT_FONT_SIZE = 11
+
+# CV body sections in their default order, and their headings
+CV_SECTIONS = ("summary", "skills", "experience", "education")
+CV_SECTION_TITLES = {
+    "summary": "PROFESSIONAL SUMMARY",
+    "skills": "CORE SKILLS",
+    "experience": "PROFESSIONAL EXPERIENCE",
+    "education": "EDUCATION",
+}
+
+# Styled templates kept per (font, size); other combinations are built per render
+MAX_CACHED_TEMPLATES = 8
+
+# A file path, or a binary stream such as io.BytesIO for in-memory rendering
+OutputTarget = Union[str, BinaryIO]
+
+
+def describe_target(output: OutputTarget) -> str:
+    """Where a document went, for log lines."""
+    return output if isinstance(output, str) else "memory"
+
+
+def iter_stream_lines(chunks: Iterable[str], parts: List[str]) -> Iterator[str]:
+    """
+    Yield the lines of a streamed text as soon as each one is complete.
+
+    Args:
+        chunks: Text deltas
+        parts: Receives every chunk, so the caller can rebuild the full text
+
+    Yields:
+        Lines without their line break (the last one once the stream ends)
+    """
+    pending = ""
+    for chunk in chunks:
+        parts.append(chunk)
+        pending += chunk
+        if '\n' in pending:
+            *complete, pending = pending.split('\n')
+            yield from complete
+    yield pending
+
+
+class DocumentTemplate:
+    """
+    Pre-styled base document, parsed once per process and deep-copied for every render.
+
+    Cloning skips unzipping and parsing the default package and re-applying the styles;
+    style IDs used for every bullet are resolved once here instead of per paragraph.
+    """
+
+    def __init__(self, font_name: str = DEFAULT_FONT_NAME, font_size: float = DEFAULT_FONT_SIZE):
+        """
+        Args:
+            font_name: Body font
+            font_size: Body font size in points
+        """
+        self.document = Document()
+        DocumentBuilder._setup_styles(self.document, font_name, font_size)
+        self.bullet_style_id = self.document.styles['List Bullet'].style_id
+
+    def clone(self) -> DocxDocument:
+        """Independent copy of the styled base document."""
+        return copy.deepcopy(self.document)
+
+
+_templates: Dict[Tuple[str, float], DocumentTemplate] = {}
+_template_lock = threading.Lock()
+
+
+def get_template(font_name: str = DEFAULT_FONT_NAME, font_size: float = DEFAULT_FONT_SIZE) -> DocumentTemplate:
+    """Process-wide styled template for a body font, built on first use."""
+    key = (font_name, font_size)
+    template = _templates.get(key)
+    if template is None:
+        with _template_lock:
+            template = _templates.get(key)
+            if template is None:
+                template = DocumentTemplate(font_name, font_size)
+                if len(_templates) >= MAX_CACHED_TEMPLATES:
+                    del _templates[next(iter(_templates))]
+                _templates[key] = template
+    return template
+
+
 class DocumentBuilder:
     """
     Handles creation and formatting of MS Word documents.
+
+    The builder holds no per-document state: every render works on its own freshly
+    styled Document, so one instance can be shared across requests and threads.
+    Layout options (font, section order) are fixed per instance; with_options() derives
+    a builder with other options.
     """
 
-    def __init__(self):
-        self.doc = Document()
-        self._setup_styles()
+    def __init__(
+        self,
+        clone_template: bool = True,
+        font_name: str = DEFAULT_FONT_NAME,
+        font_size: float = DEFAULT_FONT_SIZE,
+        section_order: Optional[Sequence[str]] = None
+    ):
+        """
+        Args:
+            clone_template: Clone the process-wide styled template (False rebuilds
+                            Document() and its styles for every render)
+            font_name: Body and section heading font
+            font_size: Body font size in points
+            section_order: CV sections to render, in order (default: CV_SECTIONS);
+                           sections left out are omitted
+        """
+        if not font_name or not font_name.strip():
+            raise ValueError("font_name must not be empty")
+        if not 4 <= font_size <= 72:
+            raise ValueError(f"font_size must be between 4 and 72 points (got {font_size})")
+        section_order = tuple(section_order or CV_SECTIONS)
+        unknown = [section for section in section_order if section not in CV_SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown CV section(s) {', '.join(unknown)} (expected {', '.join(CV_SECTIONS)})")
+        if len(set(section_order)) != len(section_order):
+            raise ValueError("section_order lists a section more than once")
+
+        self.clone_template = clone_template
+        self.font_name = font_name.strip()
+        self.font_size = font_size
+        self.section_order = section_order
+
+    @classmethod
+    def from_env(cls, **options) -> "DocumentBuilder":
+        """
+        Builder for DOCUMENT_RENDERER: 'docx' (python-docx object model, default) or
+        'ooxml' (writes WordprocessingML straight into the zip; same output, less CPU).
+
+        Args:
+            **options: Layout options passed to the builder (font_name, font_size, section_order)
+        """
+        renderer = os.getenv("DOCUMENT_RENDERER", "docx").lower()
+        if renderer not in RENDERERS:
+            raise ValueError(f"Unknown document renderer '{renderer}' (expected one of {', '.join(RENDERERS)})")
+        if renderer == "ooxml":
+            from utils.ooxml_writer import OOXMLDocumentBuilder
+            return OOXMLDocumentBuilder(**options)
+        return cls(**options)
+
+    def with_options(
+        self,
+        font_name: Optional[str] = None,
+        font_size: Optional[float] = None,
+        section_order: Optional[Sequence[str]] = None
+    ) -> "DocumentBuilder":
+        """Builder of the same kind with the given layout options replaced (None keeps the current one)."""
+        return type(self)(
+            clone_template=self.clone_template,
+            font_name=self.font_name if font_name is None else font_name,
+            font_size=self.font_size if font_size is None else font_size,
+            section_order=self.section_order if section_order is None else section_order
+        )
 
-    def _setup_styles(self):
+    def _new_document(self) -> DocxDocument:
+        """Create an empty document with the CV/cover letter styles applied."""
+        if self.clone_template:
+            return get_template(self.font_name, self.font_size).clone()
+        doc = Document()
+        self._setup_styles(doc, self.font_name, self.font_size)
+        return doc
+
+    @staticmethod
+    def _setup_styles(doc: DocxDocument, font_name: str = DEFAULT_FONT_NAME, font_size: float = DEFAULT_FONT_SIZE):
         """Configure document styles for ATS readability"""
         # Set margins (standard 1 inch)
-        for section in self.doc.sections:
+        for section in doc.sections:
             section.top_margin = Inches(1.0)
             section.bottom_margin = Inches(1.0)
             section.left_margin = Inches(1.0)
             section.right_margin = Inches(1.0)
 
         # Standard font
-        style = self.doc.styles['Normal']
+        style = doc.styles['Normal']
         font = style.font
-        font.name = 'Calibri'
-        font.size = Pt(11)
+        font.name = font_name
+        font.size = Pt(font_size)
 
-    def create_cv(self, cv_data: Dict[str, Any], output_path: str):
+    def create_cv(self, cv_data: Dict[str, Any], output_path: OutputTarget):
         """
         Generate a CV document from structured data.
 
         Args:
             cv_data: Dictionary containing 'personal_info', 'experience', 'education', 'skills'
-            output_path: File path to save the DOCX
+            output_path: File path or binary stream (e.g. io.BytesIO) to save the DOCX
         """
         try:
+            doc = self._new_document()
+
             # 1. Header (Name & Contact)
-            self._add_header(cv_data.get('personal_info', {}))
-
-            # 2. Professional Summary
-            if 'summary' in cv_data:
-                self._add_section_title("PROFESSIONAL SUMMARY")
-                self.doc.add_paragraph(cv_data['summary'])
-
-            # 3. Skills
-            if 'skills' in cv_data:
-                self._add_section_title("CORE SKILLS")
-                self._add_skills(cv_data['skills'])
-
-            # 4. Experience
-            if 'experience' in cv_data:
-                self._add_section_title("PROFESSIONAL EXPERIENCE")
-                for role in cv_data['experience']:
-                    self._add_experience_item(role)
-
-            # 5. Education
-            if 'education' in cv_data:
-                self._add_section_title("EDUCATION")
-                for edu in cv_data['education']:
-                    self._add_education_item(edu)
+            self._add_header(doc, cv_data.get('personal_info', {}))
+
+            # 2. Summary, skills, experience, education (in section_order)
+            for section in self.section_order:
+                if section in cv_data:
+                    self._add_section_title(doc, CV_SECTION_TITLES[section])
+                    self._add_section(doc, section, cv_data[section])
             
             # Save
-            self.doc.save(output_path)
-            print(f"✅ Document saved to: {output_path}")
+            doc.save(output_path)
+            print(f"✅ Document saved to: {describe_target(output_path)}")
 
         except Exception as e:
             print(f"❌ Failed to create document: {e}")
             raise
 
-    def _add_header(self, info: Dict[str, str]):
+    def _add_section(self, doc: DocxDocument, section: str, content: Any):
+        """Add the body of one CV section"""
+        if section == "summary":
+            doc.add_paragraph(content)
+        elif section == "skills":
+            self._add_skills(doc, content)
+        elif section == "experience":
+            for role in content:
+                self._add_experience_item(doc, role)
+        elif section == "education":
+            for edu in content:
+                self._add_education_item(doc, edu)
+
+    def _add_header(self, doc: DocxDocument, info: Dict[str, str]):
         """Add personal info header"""
         name = info.get('name', 'Candidate Name')
-        p = self.doc.add_paragraph()
+        p = doc.add_paragraph()
         p.alignment = WD_ALIGN_PARAGRAPH.CENTER
         
         run = p.add_run(name)
@@ -93,43 +271,43 @@ class DocumentBuilder:
         if info.get('location'): contact_parts.append(info['location'])
         
         if contact_parts:
-            p = self.doc.add_paragraph(" | ".join(contact_parts))
+            p = doc.add_paragraph(" | ".join(contact_parts))
             p.alignment = WD_ALIGN_PARAGRAPH.CENTER
             p.runs[0].font.size = Pt(10)
 
-    def _add_section_title(self, title: str):
+    def _add_section_title(self, doc: DocxDocument, title: str):
         """Add a standardized section header"""
-        p = self.doc.add_paragraph()
+        p = doc.add_paragraph()
         p.space_before = Pt(12)
         p.space_after = Pt(6)
         
         run = p.add_run(title)
         run.bold = True
         run.font.size = Pt(12)
-        run.font.name = 'Calibri'
+        run.font.name = self.font_name
         
         # Add bottom border style (hacky in python-docx, usually simple underline is safer for ATS)
         # Using simple underline for safety
         run.underline = True
 
-    def _add_skills(self, skills: Any):
+    def _add_skills(self, doc: DocxDocument, skills: Any):
         """Format skills section"""
         if isinstance(skills, list):
             # If simple list, join with bullets or pipes? 
             # ATS prefers comma separated or bullet points.
-            self.doc.add_paragraph(", ".join(skills))
+            doc.add_paragraph(", ".join(skills))
         elif isinstance(skills, dict):
             # Categorized skills
             for category, items in skills.items():
-                p = self.doc.add_paragraph()
+                p = doc.add_paragraph()
                 run = p.add_run(f"{category}: ")
                 run.bold = True
                 p.add_run(", ".join(items))
 
-    def _add_experience_item(self, role: Dict[str, Any]):
+    def _add_experience_item(self, doc: DocxDocument, role: Dict[str, Any]):
         """Add a job role"""
         # Title line
-        p = self.doc.add_paragraph()
+        p = doc.add_paragraph()
         p.space_before = Pt(8)
         
         # Company Name (Bold)
@@ -143,7 +321,7 @@ class DocumentBuilder:
             p.add_run(f" — {location}")
 
         # Job Title & Dates
-        p2 = self.doc.add_paragraph()
+        p2 = doc.add_paragraph()
         p2.paragraph_format.space_after = Pt(2)
         title = role.get('title', '')
         dates = role.get('dates', '')
@@ -156,11 +334,20 @@ class DocumentBuilder:
         # Bullets
         achievements = role.get('achievements', role.get('responsibilities', []))
         for item in achievements:
-            self.doc.add_paragraph(item, style='List Bullet')
+            self._add_bullet(doc, item)
+
+    def _add_bullet(self, doc: DocxDocument, text: str):
+        """Add a 'List Bullet' paragraph"""
+        if not self.clone_template:
+            doc.add_paragraph(text, style='List Bullet')
+            return
+        # Setting the resolved style ID skips python-docx's name lookup over every style
+        p = doc.add_paragraph(text)
+        p._p.style = get_template(self.font_name, self.font_size).bullet_style_id
 
-    def _add_education_item(self, edu: Dict[str, Any]):
+    def _add_education_item(self, doc: DocxDocument, edu: Dict[str, Any]):
         """Add education item"""
-        p = self.doc.add_paragraph()
+        p = doc.add_paragraph()
         p.space_before = Pt(6)
         
         school = edu.get('school', '')
@@ -173,37 +360,198 @@ class DocumentBuilder:
         if dates:
             p.add_run(f" ({dates})")
 
-    def create_cover_letter(self, letter_body: str, profile: Dict[str, Any], output_path: str):
+    def create_cover_letter(
+        self,
+        letter_body: Union[str, List[str]],
+        profile: Dict[str, Any],
+        output_path: OutputTarget,
+        variant: int = 0
+    ):
         """
         Generate a Cover Letter document.
         
         Args:
-            letter_body: The text content of the letter
+            letter_body: The text content of the letter, or all generated variants
             profile: Candidate profile (for header)
-            output_path: File path to save
+            output_path: File path or binary stream to save
+            variant: Which variant to render when letter_body is a list
         """
+        letter_body = self._select_variant(letter_body, variant)
         try:
-            # Re-initialize doc for new file
-            self.doc = Document()
-            self._setup_styles()
+            doc = self._new_document()
             
             # 1. Header (Same as CV)
-            self._add_header(profile.get('personal_info', {}))
+            self._add_header(doc, profile.get('personal_info', {}))
             
             # 2. Spacing
-            self.doc.add_paragraph().space_after = Pt(24)
+            doc.add_paragraph().space_after = Pt(24)
             
             # 3. Body
             # Split by newlines to create proper paragraphs
             for paragraph in letter_body.split('\n'):
-                if paragraph.strip():
-                    p = self.doc.add_paragraph(paragraph.strip())
-                    p.paragraph_format.space_after = Pt(12)
+                self._add_letter_paragraph(doc, paragraph)
             
             # Save
-            self.doc.save(output_path)
-            print(f"✅ Cover Letter saved to: {output_path}")
+            doc.save(output_path)
+            print(f"✅ Cover Letter saved to: {describe_target(output_path)}")
             
         except Exception as e:
             print(f"❌ Failed to create cover letter: {e}")
             raise
+
+    def create_cover_letter_streaming(
+        self,
+        chunks: Iterable[str],
+        profile: Dict[str, Any],
+        output_path: OutputTarget
+    ) -> str:
+        """
+        Generate a Cover Letter document from a streamed response.
+
+        The header is laid out before the first chunk arrives and each paragraph is
+        appended as soon as its line break is received, so rendering overlaps generation
+        and the file is saved the moment the stream ends.
+
+        Args:
+            chunks: Text deltas, e.g. CoverLetterGenerator.generate_stream()
+            profile: Candidate profile (for header)
+            output_path: File path or binary stream to save
+
+        Returns:
+            The full letter text
+        """
+        try:
+            doc = self._new_document()
+            self._add_header(doc, profile.get('personal_info', {}))
+            doc.add_paragraph().space_after = Pt(24)
+
+            parts: List[str] = []
+            for paragraph in iter_stream_lines(chunks, parts):
+                self._add_letter_paragraph(doc, paragraph)
+
+            doc.save(output_path)
+            print(f"✅ Cover Letter saved to: {describe_target(output_path)}")
+            return "".join(parts)
+
+        except Exception as e:
+            print(f"❌ Failed to create cover letter: {e}")
+            raise
+
+    def render_cv(self, cv_data: Dict[str, Any], fmt: str = "docx") -> bytes:
+        """Render a CV in memory and return the document bytes (fmt: one of DOCUMENT_FORMATS)."""
+        if self._check_format(fmt) != "docx":
+            return self.cv_text(cv_data, markdown=fmt == "md").encode('utf-8')
+        buffer = io.BytesIO()
+        self.create_cv(cv_data, buffer)
+        return buffer.getvalue()
+
+    def render_cover_letter(
+        self,
+        letter_body: Union[str, List[str]],
+        profile: Dict[str, Any],
+        variant: int = 0,
+        fmt: str = "docx"
+    ) -> bytes:
+        """Render a cover letter (variant) in memory and return the document bytes."""
+        if self._check_format(fmt) != "docx":
+            return self.cover_letter_text(letter_body, profile, variant, markdown=fmt == "md").encode('utf-8')
+        buffer = io.BytesIO()
+        self.create_cover_letter(letter_body, profile, buffer, variant=variant)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _check_format(fmt: str) -> str:
+        """Validate an output format."""
+        if fmt not in DOCUMENT_FORMATS:
+            raise ValueError(f"Unknown document format '{fmt}' (expected one of {', '.join(DOCUMENT_FORMATS)})")
+        return fmt
+
+    def cv_text(self, cv_data: Dict[str, Any], markdown: bool = False) -> str:
+        """
+        The CV as plain text or Markdown, with the same sections in the same order as the DOCX.
+
+        Args:
+            cv_data: Dictionary containing 'personal_info', 'experience', 'education', 'skills'
+            markdown: Mark up headings, emphasis and lists
+
+        Returns:
+            Text with blocks separated by blank lines
+        """
+        blocks = self._text_header(cv_data.get('personal_info', {}), markdown)
+        for section in self.section_order:
+            if section not in cv_data:
+                continue
+            title = CV_SECTION_TITLES[section]
+            blocks.append(f"## {title.title()}" if markdown else title)
+            content = cv_data[section]
+
+            if section == "summary":
+                blocks.append(content)
+            elif section == "skills":
+                if isinstance(content, list):
+                    blocks.append(", ".join(content))
+                elif isinstance(content, dict):
+                    blocks.append("\n".join(
+                        f"- **{category}:** {', '.join(items)}" if markdown else f"{category}: {', '.join(items)}"
+                        for category, items in content.items()
+                    ))
+            elif section == "experience":
+                for role in content:
+                    location = role.get('location', '')
+                    company_line = f"{role.get('company', '')} — {location}" if location else role.get('company', '')
+                    title = role.get('title', '')
+                    title_line = f"*{title}*" if markdown and title else title
+                    if role.get('dates'):
+                        title_line += f" | {role['dates']}"
+                    bullets = "\n".join(f"- {item}" for item in role.get('achievements', role.get('responsibilities', [])))
+                    if markdown:
+                        blocks.extend([f"### {company_line}", title_line, bullets])
+                    else:
+                        blocks.append("\n".join(line for line in (company_line, title_line, bullets) if line))
+            elif section == "education":
+                lines = []
+                for edu in content:
+                    school = f"**{edu.get('school', '')}**" if markdown else edu.get('school', '')
+                    line = f"{school} — {edu.get('degree', '')}"
+                    if edu.get('dates'):
+                        line += f" ({edu['dates']})"
+                    lines.append(f"- {line}" if markdown else line)
+                blocks.append("\n".join(lines))
+        return "\n\n".join(block for block in blocks if block) + "\n"
+
+    def cover_letter_text(
+        self,
+        letter_body: Union[str, List[str]],
+        profile: Dict[str, Any],
+        variant: int = 0,
+        markdown: bool = False
+    ) -> str:
+        """The cover letter (variant) as plain text or Markdown: header, then one block per paragraph."""
+        letter_body = self._select_variant(letter_body, variant)
+        blocks = self._text_header(profile.get('personal_info', {}), markdown)
+        blocks.extend(line.strip() for line in letter_body.split('\n'))
+        return "\n\n".join(block for block in blocks if block) + "\n"
+
+    @staticmethod
+    def _text_header(info: Dict[str, str], markdown: bool) -> List[str]:
+        """Name and contact line for the text formats"""
+        name = info.get('name', 'Candidate Name')
+        contact = " | ".join(info[key] for key in ('email', 'phone', 'linkedin', 'location') if info.get(key))
+        if markdown:
+            return [f"# {name}", contact]
+        return [f"{name}\n{contact}" if contact else name]
+
+    @staticmethod
+    def _select_variant(letter_body: Union[str, List[str]], variant: int) -> str:
+        """The letter to render when several variants were generated."""
+        if isinstance(letter_body, list):
+            if not 0 <= variant < len(letter_body):
+                raise ValueError(f"Cover letter variant {variant} does not exist ({len(letter_body)} generated)")
+            return letter_body[variant]
+        return letter_body
+
+    def _add_letter_paragraph(self, doc: DocxDocument, text: str) -> None:
+        """Append one body paragraph of a letter (blank lines are skipped)."""
+        if text.strip():
+            p = doc.add_paragraph(text.strip())
+            p.paragraph_format.space_after = Pt(12)
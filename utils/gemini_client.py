@@ -3,24 +3,53 @@ Gemini API Client Wrapper
 Role: Handle all interactions with Google Gemini API with robust error handling and retry logic.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional
 import json
+import time
 import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_not_exception_type
+from utils.llm_cassette import LLMCassette, CassetteMissError
+from utils.llm_metrics import LLMMetrics
+
+# Extra requests made when fewer than n variants come back
+MAX_VARIANT_TOP_UPS = 2
+
+# Attempts at opening a stream (same count and back-off as the retried calls)
+STREAM_ATTEMPTS = 3
+
+
+def stream_retry_wait(attempt: int) -> float:
+    """Seconds to wait before retrying a stream that failed on the given attempt."""
+    return min(10.0, max(2.0, 2.0 ** attempt))
+
 
 class GeminiClient:
     """
     Wrapper for Google Gemini API to handle configuration, generation, and error handling.
     """
     
-    def __init__(self, api_key: str, model_name: str = "gemini-1.5-flash"):
+    provider = "gemini"
+
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "gemini-1.5-flash",
+        max_tokens: Optional[int] = None,
+        route_name: str = "default",
+        metrics: Optional[LLMMetrics] = None,
+        cassette: Optional[LLMCassette] = None
+    ):
         """
         Initialize the Gemini client.
 
         Args:
             api_key: Google API Key
             model_name: Model version to use (default: gemini-1.5-flash)
+            max_tokens: Default cap on output tokens per call (None = provider default)
+            route_name: Agent/route name used when recording metrics
+            metrics: Optional metrics collector for latency and token usage
+            cassette: Optional record/replay cassette for offline runs
         """
         if not api_key:
             raise ValueError("API key is required for GeminiClient")
@@ -28,18 +57,25 @@ class GeminiClient:
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model_name)
         self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.route_name = route_name
+        self.metrics = metrics
+        self.cassette = cassette
+        self.last_usage: Dict[str, int] = {}
 
     @retry(
         stop=stop_after_attempt(3), 
-        wait=wait_exponential(multiplier=1, min=2, max=10)
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_not_exception_type(CassetteMissError)
     )
-    def generate_content(self, prompt: str, config: Optional[Dict[str, Any]] = None) -> str:
+    def generate_content(self, prompt: str, config: Optional[Dict[str, Any]] = None, system_instruction: str = "") -> str:
         """
         Generate text content from Gemini with retry logic.
 
         Args:
             prompt: The input prompt string
             config: Optional generation config (temperature, tokens, etc.)
+            system_instruction: System prompt/role definition, prepended to the prompt
 
         Returns:
             Generated text string
@@ -48,30 +84,202 @@ class GeminiClient:
             google_exceptions.ResourceExhausted: If rate limit exceeded
             ValueError: If generation fails
         """
+        return self._generate(prompt, config, system_instruction, n=1)[0]
+
+    @retry(
+        stop=stop_after_attempt(3), 
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_not_exception_type(CassetteMissError)
+    )
+    def generate_variants(
+        self,
+        prompt: str,
+        n: int,
+        system_instruction: str = "",
+        config: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        Generate n alternative completions of one prompt in a single request (candidate_count).
+
+        Args:
+            prompt: The input prompt string
+            n: Number of variants
+            system_instruction: System prompt/role definition, prepended to the prompt
+            config: Optional generation config (temperature, tokens, etc.)
+
+        Returns:
+            Up to n generated text strings (topped up with at most MAX_VARIANT_TOP_UPS extra calls
+            if fewer candidates come back; fewer are returned when a call adds nothing)
+
+        Raises:
+            ValueError: If no variant comes back at all
+        """
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        variants = self._generate(prompt, config, system_instruction, n=n)
+        for _ in range(MAX_VARIANT_TOP_UPS):
+            if len(variants) >= n:
+                break
+            added = self._generate(prompt, config, system_instruction, n=n - len(variants))
+            if not added:
+                break
+            variants.extend(added)
+        if not variants:
+            raise ValueError("The model returned no candidates (blocked or empty response)")
+        return variants[:n]
+
+    def stream_content(
+        self,
+        prompt: str,
+        system_instruction: str = "",
+        config: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """
+        Stream text content from Gemini as it is generated.
+
+        Failures before the first chunk (connection errors, quota errors) are retried up to
+        STREAM_ATTEMPTS times; once a chunk has been yielded a failure is raised, since a
+        retry would duplicate output already consumed. Cassettes share the key of
+        generate_content, so a recorded response replays as one chunk.
+
+        Args:
+            prompt: The input prompt string
+            system_instruction: System prompt/role definition, prepended to the prompt
+            config: Optional generation config (temperature, tokens, etc.)
+
+        Yields:
+            Text chunks in order
+        """
+        start = time.perf_counter()
+        generation_config = dict(config or {"temperature": 0.7})
+        max_tokens = generation_config.pop("max_tokens", self.max_tokens)
+        if max_tokens:
+            generation_config.setdefault("max_output_tokens", max_tokens)
+
+        cassette_request = None
+        if self.cassette is not None:
+            cassette_request = LLMCassette.build_request(
+                self.provider, self.model_name, system_instruction, prompt, generation_config
+            )
+            replayed = self.cassette.replay(cassette_request)
+            if replayed is not None:
+                self.last_usage = replayed.get("usage", {})
+                self._record(time.perf_counter() - start, self.last_usage)
+                yield replayed["response"]
+                return
+
+        print(f"🤖 User: Streaming Gemini ({self.model_name}) for {self.route_name}...")
+        if system_instruction:
+            prompt = f"{system_instruction.strip()}\n\n{prompt}"
+
+        for attempt in range(1, STREAM_ATTEMPTS + 1):
+            parts: List[str] = []
+            try:
+                response = self.model.generate_content(prompt, generation_config=generation_config, stream=True)
+                for chunk in response:
+                    text = chunk.text
+                    if text:
+                        parts.append(text)
+                        yield text
+                break
+            except Exception as e:
+                self._record(time.perf_counter() - start, error=True)
+                print(f"❌ Gemini API Error: {e}")
+                if parts or attempt == STREAM_ATTEMPTS:
+                    raise
+                wait = stream_retry_wait(attempt)
+                print(f"🔁 Retrying stream in {wait:.0f}s (attempt {attempt + 1}/{STREAM_ATTEMPTS})...")
+                time.sleep(wait)
+
+        latency = time.perf_counter() - start
+        self.last_usage = self._extract_usage(response)
+        self._record(latency, self.last_usage)
+        if cassette_request is not None:
+            self.cassette.record(cassette_request, "".join(parts), self.last_usage, latency)
+
+    def _generate(self, prompt: str, config: Optional[Dict[str, Any]], system_instruction: str, n: int) -> List[str]:
+        """Run one generation request and return the text of every candidate."""
+        start = time.perf_counter()
+        generation_config = dict(config or {"temperature": 0.7})
+        # Accept the OpenAI-style key used by the agents
+        max_tokens = generation_config.pop("max_tokens", self.max_tokens)
+        if max_tokens:
+            generation_config.setdefault("max_output_tokens", max_tokens)
+        if n > 1:
+            generation_config["candidate_count"] = n
+
+        cassette_request = None
+        if self.cassette is not None:
+            cassette_request = LLMCassette.build_request(
+                self.provider, self.model_name, system_instruction, prompt, generation_config
+            )
+            replayed = self.cassette.replay(cassette_request)
+            if replayed is not None:
+                self.last_usage = replayed.get("usage", {})
+                self._record(time.perf_counter() - start, self.last_usage)
+                return json.loads(replayed["response"]) if n > 1 else [replayed["response"]]
+
         try:
-            print(f"🤖 User: Calling Gemini ({self.model_name})...")
-            generation_config = config or {"temperature": 0.7}
+            print(f"🤖 User: Calling Gemini ({self.model_name}) for {self.route_name}...")
+            if system_instruction:
+                prompt = f"{system_instruction.strip()}\n\n{prompt}"
             
             response = self.model.generate_content(
                 prompt, 
                 generation_config=generation_config
             )
-            return response.text
+            latency = time.perf_counter() - start
+            if n > 1:
+                texts = [
+                    "".join(part.text for part in candidate.content.parts)
+                    for candidate in response.candidates
+                ]
+            else:
+                texts = [response.text]
+            self.last_usage = self._extract_usage(response)
+            self._record(latency, self.last_usage)
+            if cassette_request is not None:
+                recorded = json.dumps(texts, ensure_ascii=False) if n > 1 else texts[0]
+                self.cassette.record(cassette_request, recorded, self.last_usage, latency)
+            return texts
             
         except google_exceptions.ResourceExhausted:
+            self._record(time.perf_counter() - start, error=True)
             print("⚠️  Rate limit exceeded. Retrying...")
             raise
         except Exception as e:
+            self._record(time.perf_counter() - start, error=True)
             print(f"❌ Gemini API Error: {e}")
             raise
 
-    def generate_json(self, prompt: str, temperature: float = 0.0) -> Dict[str, Any]:
+    def _extract_usage(self, response: Any) -> Dict[str, int]:
+        """Pull token usage out of a Gemini response."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return {}
+        prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        cache_hit = getattr(usage, "cached_content_token_count", 0) or 0
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": getattr(usage, "candidates_token_count", 0) or 0,
+            "total_tokens": getattr(usage, "total_token_count", 0) or 0,
+            "cache_hit_tokens": cache_hit,
+            "cache_miss_tokens": max(prompt_tokens - cache_hit, 0),
+        }
+
+    def _record(self, latency: float, usage: Optional[Dict[str, int]] = None, error: bool = False) -> None:
+        """Forward call statistics to the metrics collector, if any."""
+        if self.metrics is not None:
+            self.metrics.record(self.route_name, self.provider, self.model_name, latency, usage, error)
+
+    def generate_json(self, prompt: str, temperature: float = 0.0, system_instruction: str = "") -> Dict[str, Any]:
         """
         Generate and parse JSON content.
 
         Args:
             prompt: Input prompt requesting JSON
             temperature: Lower temperature for structured data (default 0.0)
+            system_instruction: System role, prepended to the prompt
 
         Returns:
             Parsed JSON dictionary
@@ -83,7 +291,7 @@ class GeminiClient:
             if "JSON" not in prompt:
                 prompt += "\n\nReturn the result as a valid JSON object."
 
-            response_text = self.generate_content(prompt, config)
+            response_text = self.generate_content(prompt, config, system_instruction)
             return self._parse_json_safe(response_text)
             
         except Exception as e:
@@ -8,6 +8,8 @@ import re
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+from utils.skill_taxonomy import get_taxonomy
+
 class LinkedInImporter:
     """
     Import LinkedIn profile data and convert to our profile format.
@@ -248,14 +250,12 @@ class LinkedInImporter:
         return f"{start_str} - {end_str}"
     
     def _is_language(self, skill: str) -> bool:
-        """Heuristic to identify programming languages"""
-        languages = ['python', 'javascript', 'java', 'c++', 'c#', 'go', 'rust', 'ruby', 'php', 'swift', 'kotlin', 'sql', 'r', 'scala', 'typescript']
-        return skill.lower() in languages
+        """Identify programming languages (skill taxonomy, aliases included)"""
+        return get_taxonomy().category(skill) == 'language'
     
     def _is_framework(self, skill: str) -> bool:
-        """Heuristic to identify frameworks"""
-        frameworks = ['react', 'angular', 'vue', 'django', 'flask', 'fastapi', 'spring', 'express', 'laravel', 'rails', 'tensorflow', 'pytorch']
-        return skill.lower() in frameworks
+        """Identify frameworks (skill taxonomy, aliases included)"""
+        return get_taxonomy().category(skill) == 'framework'
 
 
 def import_linkedin_profile(export_path: Optional[str] = None, linkedin_url: Optional[str] = None) -> Dict[str, Any]:
@@ -27,11 +27,9 @@ class LinkedInScraper:
         if not self.llm_client:
             raise ValueError("LLM client required for parsing")
         
+        # Instructions first and the pasted content last, so the prompt prefix is cacheable
         prompt = f"""
-        Parse this LinkedIn profile content and extract structured information.
-        
-        LINKEDIN PROFILE CONTENT:
-        {profile_text[:8000]}  # Limit to avoid token overflow
+        Parse the LinkedIn profile content at the end of this message and extract structured information.
         
         OUTPUT FORMAT (JSON):
         {{
@@ -78,6 +76,9 @@ class LinkedInScraper:
         3. Convert responsibilities to achievement-focused bullet points
         4. If data is not available, use null or empty array
         5. Return ONLY valid JSON
+        
+        LINKEDIN PROFILE CONTENT:
+        {profile_text[:8000]}
         """
         
         return self.llm_client.generate_json(prompt, temperature=0.2)
@@ -0,0 +1,179 @@
+"""
+LLM Cassette (Record/Replay)
+Role: Record LLM request→response pairs to disk and replay them deterministically for offline runs and benchmarks.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+CASSETTE_VERSION = 1
+CASSETTE_MODES = ("record", "replay", "auto")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+class LLMCassette:
+    """
+    Stores LLM interactions keyed by a hash of the full request.
+
+    Modes:
+        record: always call the real API and store (or overwrite) the response
+        replay: only serve stored responses; unknown requests raise CassetteMissError
+        auto:   serve stored responses, call the API and record on a miss
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency_scale: float = 0.0):
+        """
+        Initialize the cassette.
+
+        Args:
+            path: JSON file holding the recorded interactions
+            mode: 'record', 'replay' or 'auto'
+            latency_scale: Replay delay as a fraction of the recorded latency
+                           (0 = instant, 1.0 = real-time)
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Invalid cassette mode '{mode}'. Use one of: {', '.join(CASSETTE_MODES)}")
+
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self.interactions: Dict[str, Dict[str, Any]] = self._load()
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMCassette"]:
+        """
+        Build a cassette from LLM_CASSETTE, LLM_CASSETTE_MODE and LLM_CASSETTE_LATENCY_SCALE.
+
+        Returns:
+            Configured cassette, or None when LLM_CASSETTE is not set
+        """
+        path = os.getenv("LLM_CASSETTE")
+        if not path:
+            return None
+        return cls(
+            path,
+            mode=os.getenv("LLM_CASSETTE_MODE", "replay").lower(),
+            latency_scale=float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", "0"))
+        )
+
+    @property
+    def is_offline(self) -> bool:
+        """True when every response must come from disk (no API access needed)."""
+        return self.mode == "replay"
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load interactions from disk (empty when the file does not exist yet)."""
+        if not os.path.exists(self.path):
+            if self.mode == "replay":
+                print(f"⚠️  Cassette not found at {self.path}; every request will miss.")
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get("interactions", {})
+
+    def _save(self) -> None:
+        """Atomically write interactions to disk (caller holds the lock)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {"version": CASSETTE_VERSION, "interactions": self.interactions},
+                f, indent=2, ensure_ascii=False, sort_keys=True
+            )
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def build_request(
+        provider: str,
+        model: str,
+        system_instruction: str,
+        prompt: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Normalize the parts of a call that determine its response."""
+        return {
+            "provider": provider,
+            "model": model,
+            "system_instruction": system_instruction,
+            "prompt": prompt,
+            "params": params or {},
+        }
+
+    @staticmethod
+    def request_key(request: Dict[str, Any]) -> str:
+        """Stable hash of a normalized request."""
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def replay(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a recorded response, sleeping for the scaled recorded latency.
+
+        Args:
+            request: Normalized request from build_request()
+
+        Returns:
+            Interaction dict ('response', 'usage', 'latency'), or None when the
+            request should go to the real API
+
+        Raises:
+            CassetteMissError: In replay mode when the request was never recorded
+        """
+        if self.mode == "record":
+            return None
+
+        key = self.request_key(request)
+        with self._lock:
+            interaction = self.interactions.get(key)
+
+        if interaction is None:
+            if self.mode == "replay":
+                raise CassetteMissError(
+                    f"No recorded response for {request['provider']}:{request['model']} "
+                    f"request {key[:12]} in {self.path}"
+                )
+            return None
+
+        if self.latency_scale > 0:
+            time.sleep(interaction.get("latency", 0.0) * self.latency_scale)
+        return interaction
+
+    def record(
+        self,
+        request: Dict[str, Any],
+        response: Any,
+        usage: Optional[Dict[str, int]] = None,
+        latency: float = 0.0
+    ) -> None:
+        """
+        Store a real response for later replay.
+
+        Args:
+            request: Normalized request from build_request()
+            response: Response payload returned to the caller
+            usage: Token usage reported by the provider
+            latency: Observed wall-clock latency in seconds
+        """
+        if self.mode == "replay":
+            return
+
+        key = self.request_key(request)
+        with self._lock:
+            self.interactions[key] = {
+                "request": request,
+                "response": response,
+                "usage": usage or {},
+                "latency": round(latency, 4),
+                "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            self._save()
@@ -0,0 +1,173 @@
+"""
+LLM Metrics Collector
+Role: Record per-route latency and token usage for every LLM call so model routing can be tuned with data.
+"""
+
+import threading
+from typing import Dict, Any, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Compute a percentile using linear interpolation.
+
+    Args:
+        values: Sample values (need not be sorted)
+        pct: Percentile in the range 0-100
+
+    Returns:
+        The interpolated percentile, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (pct / 100) * (len(ordered) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class LLMMetrics:
+    """
+    Thread-safe collector of per-route LLM call statistics.
+    A "route" is the agent name the call was made for (e.g. 'job_analyzer').
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def _route(self, route: str, provider: str, model: str) -> Dict[str, Any]:
+        """Get or create the stats bucket for a route (caller holds the lock)."""
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = {
+                "provider": provider,
+                "model": model,
+                "calls": 0,
+                "errors": 0,
+                "latencies": [],
+                "cache_hit_latencies": [],
+                "cache_miss_latencies": [],
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cache_hit_tokens": 0,
+                "cache_miss_tokens": 0,
+            }
+            self._routes[route] = stats
+        return stats
+
+    def record(
+        self,
+        route: str,
+        provider: str,
+        model: str,
+        latency: float,
+        usage: Optional[Dict[str, int]] = None,
+        error: bool = False
+    ) -> None:
+        """
+        Record a single LLM call.
+
+        Args:
+            route: Agent/route name
+            provider: Provider name ('deepseek', 'gemini')
+            model: Model name used for the call
+            latency: Wall-clock seconds spent in the call
+            usage: Token usage dict with 'prompt_tokens' / 'completion_tokens' and,
+                when the provider reports them, 'cache_hit_tokens' / 'cache_miss_tokens'
+            error: Whether the call failed
+        """
+        usage = usage or {}
+        with self._lock:
+            stats = self._route(route, provider, model)
+            stats["calls"] += 1
+            stats["latencies"].append(latency)
+            if error:
+                stats["errors"] += 1
+            stats["prompt_tokens"] += usage.get("prompt_tokens", 0) or 0
+            stats["completion_tokens"] += usage.get("completion_tokens", 0) or 0
+
+            # Split latencies by prefix-cache outcome to measure the savings
+            cache_hit = usage.get("cache_hit_tokens", 0) or 0
+            stats["cache_hit_tokens"] += cache_hit
+            stats["cache_miss_tokens"] += usage.get("cache_miss_tokens", 0) or 0
+            if not error and usage:
+                bucket = "cache_hit_latencies" if cache_hit else "cache_miss_latencies"
+                stats[bucket].append(latency)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize the recorded calls per route.
+
+        Returns:
+            Dictionary keyed by route with call counts, latency percentiles and token totals
+        """
+        with self._lock:
+            snapshot = {
+                route: dict(
+                    stats,
+                    latencies=list(stats["latencies"]),
+                    cache_hit_latencies=list(stats["cache_hit_latencies"]),
+                    cache_miss_latencies=list(stats["cache_miss_latencies"])
+                )
+                for route, stats in self._routes.items()
+            }
+
+        report = {}
+        for route, stats in snapshot.items():
+            latencies = stats["latencies"]
+            calls = stats["calls"]
+            hit_latencies = stats["cache_hit_latencies"]
+            miss_latencies = stats["cache_miss_latencies"]
+            report[route] = {
+                "provider": stats["provider"],
+                "model": stats["model"],
+                "calls": calls,
+                "errors": stats["errors"],
+                "latency_avg": round(sum(latencies) / calls, 3) if calls else 0.0,
+                "latency_p50": round(percentile(latencies, 50), 3),
+                "latency_p95": round(percentile(latencies, 95), 3),
+                "prompt_tokens": stats["prompt_tokens"],
+                "completion_tokens": stats["completion_tokens"],
+                "completion_tokens_per_second": round(
+                    stats["completion_tokens"] / sum(latencies), 1
+                ) if sum(latencies) > 0 else 0.0,
+                "cache_hit_tokens": stats["cache_hit_tokens"],
+                "cache_miss_tokens": stats["cache_miss_tokens"],
+                "cache_hit_rate": round(
+                    stats["cache_hit_tokens"] / stats["prompt_tokens"], 3
+                ) if stats["prompt_tokens"] else 0.0,
+                "latency_avg_cache_hit": round(
+                    sum(hit_latencies) / len(hit_latencies), 3
+                ) if hit_latencies else None,
+                "latency_avg_cache_miss": round(
+                    sum(miss_latencies) / len(miss_latencies), 3
+                ) if miss_latencies else None,
+            }
+        return report
+
+    def reset(self) -> None:
+        """Discard all recorded calls."""
+        with self._lock:
+            self._routes.clear()
+
+    def print_report(self) -> None:
+        """Print a formatted per-route metrics report."""
+        report = self.summary()
+        if not report:
+            return
+
+        print("\n" + "=" * 60)
+        print("📈 LLM ROUTE METRICS")
+        print("=" * 60)
+        for route, stats in report.items():
+            print(f"\n🛣️  {route} → {stats['provider']}:{stats['model']}")
+            print(f"   Calls: {stats['calls']} (errors: {stats['errors']})")
+            print(f"   Latency: avg {stats['latency_avg']}s | p50 {stats['latency_p50']}s | p95 {stats['latency_p95']}s")
+            print(f"   Tokens: {stats['prompt_tokens']} in / {stats['completion_tokens']} out")
+            print(f"   Prefix cache: {stats['cache_hit_rate'] * 100:.1f}% of prompt tokens "
+                  f"(avg latency hit {stats['latency_avg_cache_hit']}s / miss {stats['latency_avg_cache_miss']}s)")
+        print("\n" + "=" * 60)
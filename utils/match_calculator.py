@@ -3,17 +3,34 @@ Match Score Calculator Utility
 Role: Calculate how well a candidate profile matches a job description.
 """
 
-from typing import Dict, Any, List, Set
-import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from utils.profile_index import ProfileIndex, TermSet
+from utils.skill_taxonomy import get_taxonomy
+
 
 class MatchCalculator:
     """
     Calculates match scores between candidate profiles and job requirements.
     """
+
+    # Job term sets remembered to tell first-time scoring from re-scoring
+    scored_terms_size = 64
     
-    def __init__(self):
-        """Initialize the match calculator."""
-        pass
+    def __init__(self, similarity_threshold: float = 0.5):
+        """
+        Initialize the match calculator.
+
+        Args:
+            similarity_threshold: Minimum token Jaccard similarity for a partial
+                                  (non-exact) match to count, e.g. 'machine learning'
+                                  vs 'machine learning engineering' = 0.67
+        """
+        self.similarity_threshold = similarity_threshold
+        self._scored_terms: "OrderedDict[tuple, None]" = OrderedDict()
+        self._scored_terms_lock = threading.Lock()
     
     def calculate_match_score(
         self, 
@@ -31,27 +48,14 @@ class MatchCalculator:
             Dictionary with match scores and detailed breakdown
         """
         # Extract data
-        required_skills = set(
-            skill.lower() 
-            for skill in job_analysis.get('requirements', {}).get('must_have_skills', [])
-        )
-        nice_to_have_skills = set(
-            skill.lower() 
-            for skill in job_analysis.get('requirements', {}).get('nice_to_have_skills', [])
-        )
-        ats_keywords = set(
-            keyword.lower() 
-            for keyword in job_analysis.get('keywords', {}).get('ats_keywords', [])
-        )
-        
-        # Extract candidate skills
-        candidate_skills = self._extract_candidate_skills(profile)
-        candidate_keywords = self._extract_keywords_from_profile(profile)
+        required_skills, nice_to_have_skills, ats_keywords = self.extract_job_requirements(job_analysis)
         
-        # Calculate matches
-        required_matches = self._count_matches(required_skills, candidate_skills)
-        nice_to_have_matches = self._count_matches(nice_to_have_skills, candidate_skills)
-        keyword_matches = self._count_matches(ats_keywords, candidate_keywords)
+        # Calculate matches (re-scoring against the same job only re-matches changed sections)
+        matched_required = self._match_terms(profile, 'skills', required_skills)
+        matched_nice_to_have = self._match_terms(profile, 'skills', nice_to_have_skills)
+        required_matches = len(matched_required)
+        nice_to_have_matches = len(matched_nice_to_have)
+        keyword_matches = len(self._match_terms(profile, 'keywords', ats_keywords))
         
         # Calculate scores
         required_score = (
@@ -70,9 +74,9 @@ class MatchCalculator:
         # Overall score (weighted)
         overall_score = min(100, required_score + nice_to_have_score + keyword_score)
         
-        # Missing skills
-        missing_required = required_skills - candidate_skills
-        missing_nice_to_have = nice_to_have_skills - candidate_skills
+        # Missing skills (consistent with the fuzzy matching used for the scores)
+        missing_required = required_skills - matched_required
+        missing_nice_to_have = nice_to_have_skills - matched_nice_to_have
         
         return {
             'overall_score': round(overall_score, 1),
@@ -94,64 +98,122 @@ class MatchCalculator:
             )
         }
     
+    def missing_terms(self, profile: Dict[str, Any], job_analysis: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        Job terms the profile does not cover, per category (sorted, not truncated).
+        
+        Args:
+            profile: Candidate profile or customized CV
+            job_analysis: Analyzed job requirements
+            
+        Returns:
+            {'required': [...], 'nice_to_have': [...], 'keywords': [...]}
+        """
+        required_skills, nice_to_have_skills, ats_keywords = self.extract_job_requirements(job_analysis)
+        return {
+            'required': sorted(required_skills - self._match_terms(profile, 'skills', required_skills)),
+            'nice_to_have': sorted(nice_to_have_skills - self._match_terms(profile, 'skills', nice_to_have_skills)),
+            'keywords': sorted(ats_keywords - self._match_terms(profile, 'keywords', ats_keywords)),
+        }
+    
+    @staticmethod
+    def extract_job_requirements(job_analysis: Dict[str, Any]) -> Tuple[Set[str], Set[str], Set[str]]:
+        """
+        Normalized (must-have skills, nice-to-have skills, ATS keywords) of a job analysis:
+        lower-cased, with known aliases mapped to their canonical skill ("k8s" -> "kubernetes").
+        """
+        normalize = get_taxonomy().normalize
+        requirements = job_analysis.get('requirements', {})
+        required_skills = set(normalize(skill) for skill in requirements.get('must_have_skills', []))
+        nice_to_have_skills = set(normalize(skill) for skill in requirements.get('nice_to_have_skills', []))
+        ats_keywords = set(
+            normalize(keyword) 
+            for keyword in job_analysis.get('keywords', {}).get('ats_keywords', [])
+        )
+        return required_skills, nice_to_have_skills, ats_keywords
+    
+    def rank_jobs(
+        self,
+        profile: Dict[str, Any],
+        job_analyses: List[Dict[str, Any]],
+        top_n: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Score one profile against many analyzed jobs in one vectorized pass.
+        
+        Args:
+            profile: Candidate's master profile
+            job_analyses: Analyzed job requirements to rank
+            top_n: Only return the best N jobs
+            
+        Returns:
+            Jobs ranked best first, each with 'job_index', 'role_info' and the
+            calculate_match_score breakdown
+        """
+        # Imported lazily so single-pair scoring does not need NumPy
+        from utils.batch_matcher import JobRanker
+        return JobRanker(job_analyses, self).rank(profile, top_n)
+    
+    def build_candidate_ranker(self, profiles: Dict[str, Dict[str, Any]]) -> Any:
+        """
+        Index a corpus of profiles for "top N candidates for this job" queries.
+        
+        Args:
+            profiles: {candidate_id: profile}
+            
+        Returns:
+            CandidateRanker; update it with add_profile()/remove_profile() and
+            query it with rank(job_analysis, top_n)
+        """
+        from utils.batch_matcher import CandidateRanker
+        return CandidateRanker.from_profiles(profiles, self)
+    
     def _extract_candidate_skills(self, profile: Dict[str, Any]) -> Set[str]:
         """Extract all skills from candidate profile."""
-        skills_set = set()
-        
-        # From skills section
-        skills_data = profile.get('skills', {})
-        if isinstance(skills_data, dict):
-            for category, skill_list in skills_data.items():
-                if isinstance(skill_list, list):
-                    skills_set.update(skill.lower() for skill in skill_list)
-        elif isinstance(skills_data, list):
-            skills_set.update(skill.lower() for skill in skills_data)
-        
-        # From experience descriptions
-        for exp in profile.get('experience', []):
-            responsibilities = exp.get('responsibilities', []) + exp.get('achievements', [])
-            for resp in responsibilities:
-                # Extract potential skills (simple keyword extraction)
-                words = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', resp)
-                skills_set.update(word.lower() for word in words if len(word) > 3)
-        
-        return skills_set
+        return ProfileIndex.extract_candidate_skills(profile)
     
     def _extract_keywords_from_profile(self, profile: Dict[str, Any]) -> Set[str]:
         """Extract keywords from profile text."""
-        keywords = set()
-        
-        # From summary
-        summary = profile.get('summary', '')
-        keywords.update(word.lower() for word in summary.split() if len(word) > 4)
-        
-        # From experience
-        for exp in profile.get('experience', []):
-            text = ' '.join(exp.get('responsibilities', []) + exp.get('achievements', []))
-            keywords.update(word.lower() for word in text.split() if len(word) > 4)
-        
-        return keywords
+        return ProfileIndex.extract_keywords(profile)
     
-    def _count_matches(self, required: Set[str], candidate: Set[str]) -> int:
-        """Count how many required items match candidate items (fuzzy matching)."""
-        matches = 0
-        
-        for req_item in required:
-            # Exact match
-            if req_item in candidate:
-                matches += 1
-                continue
-            
-            # Partial match (word-level)
-            req_words = set(req_item.split())
-            for cand_item in candidate:
-                cand_words = set(cand_item.split())
-                # If significant overlap
-                if req_words & cand_words:
-                    matches += 1
-                    break
-        
-        return matches
+    def _match_terms(self, profile: Dict[str, Any], kind: str, required: Set[str]) -> Set[str]:
+        """
+        Required items matched by the profile (exact or fuzzy).
+
+        The first scoring against a set of job terms does one prefix-filtered lookup per
+        term in the profile's union TokenIndex. Later scorings against the same terms
+        (e.g. the ATS optimizer re-scoring an edited CV) union the memoized per-section
+        matches instead, so only sections whose content changed are matched again.
+
+        Args:
+            profile: Candidate profile or customized CV
+            kind: 'skills' or 'keywords'
+            required: Lower-cased job terms
+        """
+        if not self._seen_before(kind, required):
+            index = ProfileIndex.for_profile(profile)
+            token_index = index.skills_index if kind == 'skills' else index.keywords_index
+            return {term for term in required if token_index.matches(term, self.similarity_threshold)}
+
+        terms = TermSet(required)
+        matched: Set[str] = set()
+        for section in ProfileIndex.sections_for(profile):
+            if len(matched) == len(terms.terms):
+                break
+            matched.update(section.find_matches(kind, terms, self.similarity_threshold))
+        return matched
+
+    def _seen_before(self, kind: str, required: Set[str]) -> bool:
+        """Whether these job terms were scored before (records them if not)."""
+        key = (kind, frozenset(required))
+        with self._scored_terms_lock:
+            if key in self._scored_terms:
+                self._scored_terms.move_to_end(key)
+                return True
+            self._scored_terms[key] = None
+            while len(self._scored_terms) > self.scored_terms_size:
+                self._scored_terms.popitem(last=False)
+            return False
     
     def _generate_recommendations(
         self, 
@@ -0,0 +1,162 @@
+"""
+Model Router
+Role: Map each agent to an LLM provider, model and output-token budget, configurable by environment.
+"""
+
+import os
+from typing import Dict, Any, List, Optional
+from utils.llm_cassette import LLMCassette
+from utils.llm_metrics import LLMMetrics
+
+# Default routing table. Structured extraction gets a tighter output budget than writing tasks;
+# every route can be pointed at a cheaper/faster model via environment variables.
+DEFAULT_ROUTES: Dict[str, Dict[str, Any]] = {
+    "job_analyzer": {"provider": "deepseek", "model": "deepseek-chat", "max_tokens": 1500},
+    "linkedin_scraper": {"provider": "deepseek", "model": "deepseek-chat", "max_tokens": 3000},
+    "cv_customizer": {"provider": "deepseek", "model": "deepseek-chat", "max_tokens": 4000},
+    "cover_letter_generator": {"provider": "deepseek", "model": "deepseek-chat", "max_tokens": 1200},
+    "ats_optimizer": {"provider": "deepseek", "model": "deepseek-chat", "max_tokens": 800},
+    "application_writer": {"provider": "deepseek", "model": "deepseek-chat", "max_tokens": 5200},
+}
+
+# Environment variable holding the API key for each provider
+PROVIDER_API_KEYS = {
+    "deepseek": "DEEPSEEK_API_KEY",
+    "gemini": "GOOGLE_API_KEY",
+}
+
+
+class ModelRouter:
+    """
+    Hands out one LLM client per agent according to a routing table.
+
+    Each route can be overridden with environment variables named after the agent, e.g.:
+        JOB_ANALYZER_PROVIDER=gemini
+        JOB_ANALYZER_MODEL=gemini-1.5-flash
+        JOB_ANALYZER_MAX_TOKENS=1024
+    """
+
+    def __init__(
+        self,
+        api_keys: Dict[str, Optional[str]],
+        routes: Optional[Dict[str, Dict[str, Any]]] = None,
+        metrics: Optional[LLMMetrics] = None,
+        cassette: Optional[LLMCassette] = None
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            api_keys: API key per provider name
+            routes: Routing table (agent -> provider/model/max_tokens); defaults to DEFAULT_ROUTES
+            metrics: Shared metrics collector (a new one is created if omitted)
+            cassette: Optional record/replay cassette shared by every client
+        """
+        self.api_keys = api_keys
+        self.routes = {name: dict(route) for name, route in (routes or DEFAULT_ROUTES).items()}
+        self.metrics = metrics or LLMMetrics()
+        self.cassette = cassette
+        self._clients: Dict[str, Any] = {}
+
+    @classmethod
+    def from_env(cls, metrics: Optional[LLMMetrics] = None) -> "ModelRouter":
+        """
+        Build a router from the default table plus environment overrides.
+        A record/replay cassette is attached when LLM_CASSETTE is set.
+
+        Args:
+            metrics: Optional shared metrics collector
+
+        Returns:
+            Configured ModelRouter
+        """
+        routes = {}
+        for agent, route in DEFAULT_ROUTES.items():
+            prefix = agent.upper()
+            route = dict(route)
+            route["provider"] = os.getenv(f"{prefix}_PROVIDER", route["provider"]).lower()
+            route["model"] = os.getenv(f"{prefix}_MODEL", route["model"])
+            max_tokens = os.getenv(f"{prefix}_MAX_TOKENS")
+            if max_tokens:
+                route["max_tokens"] = int(max_tokens)
+            routes[agent] = route
+
+        api_keys = {provider: os.getenv(env_var) for provider, env_var in PROVIDER_API_KEYS.items()}
+        return cls(api_keys, routes, metrics, LLMCassette.from_env())
+
+    @property
+    def is_offline(self) -> bool:
+        """True when all responses are replayed from a cassette and no API keys are needed."""
+        return self.cassette is not None and self.cassette.is_offline
+
+    def missing_api_keys(self) -> List[str]:
+        """
+        Environment variables of the API keys the routing table needs but were not provided.
+        Only providers that some route uses are checked; nothing is missing when replaying offline.
+
+        Returns:
+            Variable names, e.g. ['GOOGLE_API_KEY'] when every route points at Gemini without a key
+        """
+        if self.is_offline:
+            return []
+        providers = {route["provider"] for route in self.routes.values()}
+        return [
+            env_var for provider, env_var in PROVIDER_API_KEYS.items()
+            if provider in providers and not self.api_keys.get(provider)
+        ]
+
+    def get_route(self, agent: str) -> Dict[str, Any]:
+        """Return the route for an agent, falling back to the default DeepSeek route."""
+        return self.routes.get(
+            agent,
+            {"provider": "deepseek", "model": "deepseek-chat", "max_tokens": None}
+        )
+
+    def get_client(self, agent: str) -> Any:
+        """
+        Get (or lazily create) the LLM client for an agent.
+
+        Args:
+            agent: Agent/route name, e.g. 'job_analyzer'
+
+        Returns:
+            A DeepSeekClient or GeminiClient configured for the route
+        """
+        if agent not in self._clients:
+            self._clients[agent] = self._create_client(agent, self.get_route(agent))
+        return self._clients[agent]
+
+    def _create_client(self, agent: str, route: Dict[str, Any]) -> Any:
+        """Instantiate the provider client for a route."""
+        provider = route["provider"]
+        if provider not in PROVIDER_API_KEYS:
+            raise ValueError(f"Unknown LLM provider '{provider}' for route '{agent}'")
+
+        api_key = self.api_keys.get(provider)
+        if not api_key and self.is_offline:
+            api_key = "cassette-replay"
+        if not api_key:
+            raise ValueError(f"{PROVIDER_API_KEYS[provider]} not found in environment variables (needed by '{agent}')")
+
+        kwargs = {
+            "api_key": api_key,
+            "model_name": route["model"],
+            "max_tokens": route.get("max_tokens"),
+            "route_name": agent,
+            "metrics": self.metrics,
+            "cassette": self.cassette,
+        }
+        if provider == "gemini":
+            # Optional dependency: only import the Gemini SDK when a route uses it
+            from utils.gemini_client import GeminiClient
+            return GeminiClient(**kwargs)
+
+        from utils.deepseek_client import DeepSeekClient
+        return DeepSeekClient(**kwargs)
+
+    def describe(self) -> Dict[str, str]:
+        """Human-readable summary of the routing table."""
+        return {
+            agent: f"{route['provider']}:{route['model']} (max_tokens={route.get('max_tokens')})"
+            for agent, route in self.routes.items()
+        }
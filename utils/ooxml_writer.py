@@ -0,0 +1,282 @@
+"""
+OOXML Document Writer
+Role: Fast rendering backend that writes the WordprocessingML body of CVs and cover letters straight
+into the DOCX zip stream, reusing every other part of the pre-styled template verbatim.
+"""
+
+import io
+import os
+import re
+import threading
+import zipfile
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+
+from utils.document_builder import (
+    CV_SECTION_TITLES, DEFAULT_FONT_NAME, DEFAULT_FONT_SIZE, MAX_CACHED_TEMPLATES,
+    DocumentBuilder, DocumentTemplate, OutputTarget, describe_target, get_template, iter_stream_lines
+)
+
+DOCUMENT_PART = "word/document.xml"
+
+# Characters lxml refuses to serialize (python-docx raises ValueError for them as well)
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+_RUN_BREAKS = re.compile(r"([\t\r\n])")
+
+# Run and paragraph properties emitted by DocumentBuilder, in schema order
+_NAME_RPR = '<w:b/><w:color w:val="000000"/><w:sz w:val="40"/>'
+_CONTACT_RPR = '<w:sz w:val="20"/>'
+_SECTION_TITLE_RPR = '<w:rFonts w:ascii="{font}" w:hAnsi="{font}"/><w:b/><w:sz w:val="24"/><w:u w:val="single"/>'
+_BOLD_RPR = '<w:b/>'
+_ITALIC_RPR = '<w:i/>'
+_CENTER_PPR = '<w:jc w:val="center"/>'
+_ROLE_TITLE_PPR = '<w:spacing w:after="40"/>'
+_LETTER_PPR = '<w:spacing w:after="240"/>'
+
+
+def _run_content(text: str) -> str:
+    """Run children for a text, translating tabs and line breaks like python-docx."""
+    if _INVALID_XML_CHARS.search(text):
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+    content = []
+    for piece in _RUN_BREAKS.split(text):
+        if piece == "\t":
+            content.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            content.append("<w:br/>")
+        elif piece:
+            space = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ''
+            content.append(f"<w:t{space}>{escape(piece)}</w:t>")
+    return "".join(content)
+
+
+def _run(text: Optional[str], rpr: str = "") -> str:
+    """A <w:r> element; empty text gives a run without content, as Paragraph.add_run does."""
+    props = f"<w:rPr>{rpr}</w:rPr>" if rpr else ""
+    content = _run_content(text) if text else ""
+    if not props and not content:
+        return "<w:r/>"
+    return f"<w:r>{props}{content}</w:r>"
+
+
+def _paragraph(runs: str = "", ppr: str = "") -> str:
+    """A <w:p> element."""
+    props = f"<w:pPr>{ppr}</w:pPr>" if ppr else ""
+    if not props and not runs:
+        return "<w:p/>"
+    return f"<w:p>{props}{runs}</w:p>"
+
+
+def _text_paragraph(text: Optional[str], ppr: str = "") -> str:
+    """A paragraph as Document.add_paragraph(text) builds it (no run for empty text)."""
+    return _paragraph(_run(text) if text else "", ppr)
+
+
+class OOXMLPackage:
+    """
+    The styled template split for direct writing: a zip holding every part except the
+    document body (compressed once), plus the body's opening and closing XML.
+    """
+
+    def __init__(self, template: DocumentTemplate):
+        """
+        Args:
+            template: Styled base document to take the static parts from
+        """
+        saved = io.BytesIO()
+        template.document.save(saved)
+        base = io.BytesIO()
+        with zipfile.ZipFile(saved) as source, zipfile.ZipFile(base, 'w', zipfile.ZIP_DEFLATED) as target:
+            document_xml = source.read(DOCUMENT_PART).decode('utf-8')
+            for info in source.infolist():
+                if info.filename != DOCUMENT_PART:
+                    target.writestr(info, source.read(info.filename))
+        self.base_zip = base.getvalue()
+
+        body_start = document_xml.index("<w:body>") + len("<w:body>")
+        body_end = document_xml.index("<w:sectPr")
+        if document_xml[body_start:body_end]:
+            raise ValueError("The document template must have an empty body")
+        self.document_head = document_xml[:body_start].encode('utf-8')
+        self.document_tail = document_xml[body_end:].encode('utf-8')
+        self.bullet_style_id = template.bullet_style_id
+
+
+_packages: Dict[Tuple[str, float], OOXMLPackage] = {}
+_package_lock = threading.Lock()
+
+
+def get_package(font_name: str = DEFAULT_FONT_NAME, font_size: float = DEFAULT_FONT_SIZE) -> OOXMLPackage:
+    """Process-wide split template for a body font, built on first use."""
+    key = (font_name, font_size)
+    package = _packages.get(key)
+    if package is None:
+        with _package_lock:
+            package = _packages.get(key)
+            if package is None:
+                package = OOXMLPackage(get_template(font_name, font_size))
+                if len(_packages) >= MAX_CACHED_TEMPLATES:
+                    del _packages[next(iter(_packages))]
+                _packages[key] = package
+    return package
+
+
+class OOXMLDocumentBuilder(DocumentBuilder):
+    """
+    DocumentBuilder that skips the python-docx object model.
+
+    Paragraphs are generated as WordprocessingML strings and written into the
+    document part of the zip as they are produced; the other template parts are copied
+    already compressed. The document XML matches what DocumentBuilder writes.
+    """
+
+    def create_cv(self, cv_data: Dict[str, Any], output_path: OutputTarget):
+        """
+        Generate a CV document from structured data.
+
+        Args:
+            cv_data: Dictionary containing 'personal_info', 'experience', 'education', 'skills'
+            output_path: File path or binary stream (e.g. io.BytesIO) to save the DOCX
+        """
+        try:
+            self._write(output_path, self._cv_paragraphs(cv_data, self._package()))
+            print(f"✅ Document saved to: {describe_target(output_path)}")
+
+        except Exception as e:
+            print(f"❌ Failed to create document: {e}")
+            raise
+
+    def create_cover_letter(
+        self,
+        letter_body: Union[str, List[str]],
+        profile: Dict[str, Any],
+        output_path: OutputTarget,
+        variant: int = 0
+    ):
+        """
+        Generate a Cover Letter document.
+
+        Args:
+            letter_body: The text content of the letter, or all generated variants
+            profile: Candidate profile (for header)
+            output_path: File path or binary stream to save
+            variant: Which variant to render when letter_body is a list
+        """
+        letter_body = self._select_variant(letter_body, variant)
+        try:
+            self._write(output_path, self._letter_paragraphs(profile, letter_body.split('\n')))
+            print(f"✅ Cover Letter saved to: {describe_target(output_path)}")
+
+        except Exception as e:
+            print(f"❌ Failed to create cover letter: {e}")
+            raise
+
+    def create_cover_letter_streaming(
+        self,
+        chunks: Iterable[str],
+        profile: Dict[str, Any],
+        output_path: OutputTarget
+    ) -> str:
+        """
+        Generate a Cover Letter document from a streamed response, writing each
+        paragraph into the zip as soon as its line break arrives.
+
+        Returns:
+            The full letter text
+        """
+        try:
+            parts: List[str] = []
+            self._write(output_path, self._letter_paragraphs(profile, iter_stream_lines(chunks, parts)))
+            print(f"✅ Cover Letter saved to: {describe_target(output_path)}")
+            return "".join(parts)
+
+        except Exception as e:
+            print(f"❌ Failed to create cover letter: {e}")
+            raise
+
+    def _write(self, output_path: OutputTarget, paragraphs: Iterable[str]) -> None:
+        """Write the template's static parts, then stream the document part into the zip (seekable streams only)."""
+        if isinstance(output_path, str):
+            # Written beside the target and moved into place only once complete, so a failed
+            # render (e.g. a broken stream) leaves no truncated document behind
+            tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'w+b') as f:
+                    self._write(f, paragraphs)
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            return
+        package = self._package()
+        output_path.write(package.base_zip)
+        with zipfile.ZipFile(output_path, 'a', zipfile.ZIP_DEFLATED) as archive:
+            with archive.open(DOCUMENT_PART, 'w') as part:
+                part.write(package.document_head)
+                for paragraph in paragraphs:
+                    part.write(paragraph.encode('utf-8'))
+                part.write(package.document_tail)
+
+    def _package(self) -> OOXMLPackage:
+        """Split template for this builder's body font."""
+        return get_package(self.font_name, self.font_size)
+
+    def _header(self, info: Dict[str, str]) -> Iterator[str]:
+        """Personal info header"""
+        yield _paragraph(_run(info.get('name', 'Candidate Name'), _NAME_RPR), _CENTER_PPR)
+
+        contact_parts = [info[key] for key in ('email', 'phone', 'linkedin', 'location') if info.get(key)]
+        if contact_parts:
+            yield _paragraph(_run(" | ".join(contact_parts), _CONTACT_RPR), _CENTER_PPR)
+
+    def _cv_paragraphs(self, cv_data: Dict[str, Any], package: OOXMLPackage) -> Iterator[str]:
+        """CV body in the same order and shape as DocumentBuilder.create_cv"""
+        yield from self._header(cv_data.get('personal_info', {}))
+
+        title_rpr = _SECTION_TITLE_RPR.format(font=escape(self.font_name, {'"': "&quot;"}))
+        for section in self.section_order:
+            if section not in cv_data:
+                continue
+            yield _paragraph(_run(CV_SECTION_TITLES[section], title_rpr))
+            content = cv_data[section]
+
+            if section == "summary":
+                yield _text_paragraph(content)
+
+            elif section == "skills":
+                if isinstance(content, list):
+                    yield _text_paragraph(", ".join(content))
+                elif isinstance(content, dict):
+                    for category, items in content.items():
+                        yield _paragraph(_run(f"{category}: ", _BOLD_RPR) + _run(", ".join(items)))
+
+            elif section == "experience":
+                bullet_ppr = f'<w:pStyle w:val="{package.bullet_style_id}"/>'
+                for role in content:
+                    location = role.get('location', '')
+                    yield _paragraph(_run(role.get('company', ''), _BOLD_RPR) + (_run(f" — {location}") if location else ""))
+
+                    dates = role.get('dates', '')
+                    yield _paragraph(
+                        _run(role.get('title', ''), _ITALIC_RPR) + (_run(f" | {dates}") if dates else ""),
+                        _ROLE_TITLE_PPR
+                    )
+                    for item in role.get('achievements', role.get('responsibilities', [])):
+                        yield _text_paragraph(item, bullet_ppr)
+
+            elif section == "education":
+                for edu in content:
+                    dates = edu.get('dates', '')
+                    yield _paragraph(
+                        _run(edu.get('school', ''), _BOLD_RPR) + _run(f" — {edu.get('degree', '')}")
+                        + (_run(f" ({dates})") if dates else "")
+                    )
+
+    def _letter_paragraphs(self, profile: Dict[str, Any], lines: Iterable[str]) -> Iterator[str]:
+        """Cover letter body in the same shape as DocumentBuilder.create_cover_letter"""
+        yield from self._header(profile.get('personal_info', {}))
+        yield _paragraph()
+        for line in lines:
+            if line.strip():
+                yield _text_paragraph(line.strip(), _LETTER_PPR)
@@ -3,7 +3,9 @@ Profile Deduplicator
 Removes duplicate entries and prevents repetition in CV generation
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional
+
+from utils.profile_index import ProfileIndex
 
 class ProfileDeduplicator:
     """
@@ -11,12 +13,14 @@ class ProfileDeduplicator:
     """
     
     @staticmethod
-    def deduplicate_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    def deduplicate_profile(profile: Dict[str, Any], index: Optional[ProfileIndex] = None) -> Dict[str, Any]:
         """
         Remove duplicate entries from profile.
         
         Args:
             profile: Profile dictionary
+            index: ProfileIndex of this profile; its precomputed dedupe keys are
+                   reused instead of being rebuilt
             
         Returns:
             Deduplicated profile
@@ -26,42 +30,46 @@ class ProfileDeduplicator:
         # Deduplicate experience
         if 'experience' in deduplicated:
             deduplicated['experience'] = ProfileDeduplicator._deduplicate_experience(
-                deduplicated['experience']
+                deduplicated['experience'],
+                index.experience_keys if index else None
             )
         
         # Deduplicate education
         if 'education' in deduplicated:
             deduplicated['education'] = ProfileDeduplicator._deduplicate_education(
-                deduplicated['education']
+                deduplicated['education'],
+                index.education_keys if index else None
             )
         
         # Deduplicate skills
         if 'skills' in deduplicated:
             deduplicated['skills'] = ProfileDeduplicator._deduplicate_skills(
-                deduplicated['skills']
+                deduplicated['skills'],
+                index.skill_keys if index else None
             )
         
         # Deduplicate projects
         if 'projects' in deduplicated:
             deduplicated['projects'] = ProfileDeduplicator._deduplicate_projects(
-                deduplicated['projects']
+                deduplicated['projects'],
+                index.project_keys if index else None
             )
         
         return deduplicated
     
     @staticmethod
-    def _deduplicate_experience(experience_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _deduplicate_experience(
+        experience_list: List[Dict[str, Any]],
+        keys: Optional[Iterable[tuple]] = None
+    ) -> List[Dict[str, Any]]:
         """Remove duplicate work experiences"""
         seen = set()
         unique_experiences = []
+        if keys is None:
+            keys = map(ProfileIndex.experience_key, experience_list)
         
-        for exp in experience_list:
-            # Create a unique key from company + title + dates
-            key = (
-                exp.get('company', '').lower().strip(),
-                exp.get('title', '').lower().strip(),
-                exp.get('dates', '').strip()
-            )
+        for exp, key in zip(experience_list, keys):
+            # Key: company + title + dates
             
             if key not in seen and key[0] and key[1]:  # Must have company and title
                 seen.add(key)
@@ -70,18 +78,18 @@ class ProfileDeduplicator:
         return unique_experiences
     
     @staticmethod
-    def _deduplicate_education(education_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _deduplicate_education(
+        education_list: List[Dict[str, Any]],
+        keys: Optional[Iterable[tuple]] = None
+    ) -> List[Dict[str, Any]]:
         """Remove duplicate education entries"""
         seen = set()
         unique_education = []
+        if keys is None:
+            keys = map(ProfileIndex.education_key, education_list)
         
-        for edu in education_list:
-            # Create a unique key from school + degree + dates
-            key = (
-                edu.get('school', '').lower().strip(),
-                edu.get('degree', '').lower().strip(),
-                edu.get('dates', '').strip()
-            )
+        for edu, key in zip(education_list, keys):
+            # Key: school + degree + dates
             
             if key not in seen and key[0] and key[1]:  # Must have school and degree
                 seen.add(key)
@@ -90,17 +98,21 @@ class ProfileDeduplicator:
         return unique_education
     
     @staticmethod
-    def _deduplicate_skills(skills: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    def _deduplicate_skills(
+        skills: Dict[str, List[str]],
+        keys: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, List[str]]:
         """Remove duplicate skills within each category"""
         deduplicated = {}
+        keys = keys or {}
         
         for category, skill_list in skills.items():
             if isinstance(skill_list, list):
                 # Remove duplicates while preserving order
                 seen = set()
                 unique_skills = []
-                for skill in skill_list:
-                    skill_lower = skill.lower().strip()
+                skill_keys = keys.get(category) or [skill.lower().strip() for skill in skill_list]
+                for skill, skill_lower in zip(skill_list, skill_keys):
                     if skill_lower and skill_lower not in seen:
                         seen.add(skill_lower)
                         unique_skills.append(skill)
@@ -111,14 +123,18 @@ class ProfileDeduplicator:
         return deduplicated
     
     @staticmethod
-    def _deduplicate_projects(projects_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _deduplicate_projects(
+        projects_list: List[Dict[str, Any]],
+        keys: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
         """Remove duplicate projects"""
         seen = set()
         unique_projects = []
+        if keys is None:
+            keys = map(ProfileIndex.project_key, projects_list)
         
-        for proj in projects_list:
-            # Create a unique key from project name
-            key = proj.get('name', '').lower().strip()
+        for proj, key in zip(projects_list, keys):
+            # Key: project name
             
             if key and key not in seen:
                 seen.add(key)
@@ -0,0 +1,460 @@
+"""
+Profile Index
+Role: Precompile everything the local components derive from a profile (skills, keywords, token
+indexes, RAG snippets, dedupe keys) once per profile content and share it across requests.
+"""
+
+import hashlib
+import json
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Set, Iterable, Tuple
+
+from utils.skill_taxonomy import get_taxonomy
+
+# Index format version; bump when the derived data changes shape
+PROFILE_INDEX_VERSION = 1
+
+CAPITALIZED_PHRASE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
+
+class TokenIndex:
+    """
+    Inverted index from token to candidate items, built once per profile so that
+    fuzzy lookups only touch items sharing a (rare) token with the query.
+    """
+
+    def __init__(self, items: Iterable[str]):
+        self.items: Set[str] = set(items)
+        self.item_tokens: Dict[str, frozenset] = {}
+        self.postings: Dict[str, List[str]] = {}
+        for item in self.items:
+            self._index_item(item)
+
+    def _index_item(self, item: str) -> None:
+        tokens = frozenset(item.split())
+        self.item_tokens[item] = tokens
+        for token in tokens:
+            bucket = self.postings.get(token)
+            if bucket is None:
+                self.postings[token] = [item]
+            else:
+                bucket.append(item)
+
+    def add(self, item: str) -> None:
+        """Index one more item (no-op if already present)."""
+        if item not in self.items:
+            self.items.add(item)
+            self._index_item(item)
+
+    def _prefix_tokens(self, query_tokens: frozenset, threshold: float) -> List[str]:
+        """The query's (|q| - ceil(t*|q|) + 1) rarest tokens; any match shares at least one."""
+        size = len(query_tokens)
+        min_overlap = math.ceil(threshold * size)
+        return sorted(query_tokens, key=lambda t: len(self.postings.get(t, ())))[:size - min_overlap + 1]
+
+    def matches(self, query: str, threshold: float) -> bool:
+        """
+        Check whether any indexed item has token Jaccard similarity >= threshold with the query.
+
+        Uses prefix filtering: an item reaching the threshold must share at least one
+        of the query's (|q| - ceil(t*|q|) + 1) rarest tokens, so only their postings
+        are scanned and verified.
+
+        Args:
+            query: Lower-cased skill/keyword
+            threshold: Minimum Jaccard similarity in (0, 1]
+
+        Returns:
+            True for an exact or sufficiently similar match
+        """
+        if query in self.items:
+            return True
+        query_tokens = frozenset(query.split())
+        if not query_tokens:
+            return False
+
+        size = len(query_tokens)
+        seen: Set[str] = set()
+        for token in self._prefix_tokens(query_tokens, threshold):
+            for item in self.postings.get(token, ()):
+                if item in seen:
+                    continue
+                seen.add(item)
+                item_tokens = self.item_tokens[item]
+                overlap = len(query_tokens & item_tokens)
+                if overlap / (size + len(item_tokens) - overlap) >= threshold:
+                    return True
+        return False
+
+    def matching_items(self, query: str, threshold: float) -> Set[str]:
+        """
+        All indexed items that match the query under the same rules as matches().
+
+        Args:
+            query: Lower-cased skill/keyword
+            threshold: Minimum Jaccard similarity in (0, 1]
+
+        Returns:
+            Exact and sufficiently similar items
+        """
+        found: Set[str] = {query} if query in self.items else set()
+        query_tokens = frozenset(query.split())
+        if not query_tokens:
+            return found
+
+        size = len(query_tokens)
+        seen: Set[str] = set()
+        for token in self._prefix_tokens(query_tokens, threshold):
+            for item in self.postings.get(token, ()):
+                if item in seen:
+                    continue
+                seen.add(item)
+                item_tokens = self.item_tokens[item]
+                overlap = len(query_tokens & item_tokens)
+                if overlap / (size + len(item_tokens) - overlap) >= threshold:
+                    found.add(item)
+        return found
+
+
+class TermSet:
+    """
+    Job-side terms (skills or ATS keywords) with a token -> terms map, built once
+    per scoring call so each profile section only verifies terms it shares a token with.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms = frozenset(terms)
+        self.by_token: Dict[str, List[str]] = {}
+        for term in self.terms:
+            for token in set(term.split()):
+                self.by_token.setdefault(token, []).append(term)
+
+
+class SectionIndex:
+    """
+    Skills and keywords contributed by one profile section (summary, skills, or a
+    single experience entry), cached by section content. Matches against job terms
+    are memoized, so re-scoring a profile where only one section changed only
+    re-tokenizes and re-matches that section.
+    """
+
+    match_cache_size = 16
+
+    def __init__(self, skills: Iterable[str], keywords: Iterable[str]):
+        self.skills = frozenset(skills)
+        self.keywords = frozenset(keywords)
+        self.indexes = {
+            'skills': TokenIndex(self.skills),
+            'keywords': TokenIndex(self.keywords),
+        }
+        self._matches: "OrderedDict[tuple, frozenset]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def find_matches(self, kind: str, terms: TermSet, threshold: float) -> frozenset:
+        """
+        Job terms matched by this section (exact or fuzzy, same rules as TokenIndex.matches).
+
+        Args:
+            kind: 'skills' or 'keywords'
+            terms: Job terms to match
+            threshold: Minimum Jaccard similarity
+
+        Returns:
+            Matched terms
+        """
+        key = (kind, terms.terms, threshold)
+        with self._lock:
+            matched = self._matches.get(key)
+            if matched is not None:
+                self._matches.move_to_end(key)
+                return matched
+
+        index = self.indexes[kind]
+        found = set(terms.terms & index.items)
+        # Only terms sharing a token with this section can reach the threshold; sections
+        # are small, so candidates are verified directly against the shared postings
+        pairs: Dict[str, Set[str]] = {}
+        for token in terms.by_token.keys() & index.postings.keys():
+            for term in terms.by_token[token]:
+                if term not in found:
+                    pairs.setdefault(term, set()).update(index.postings[token])
+        for term, items in pairs.items():
+            term_tokens = frozenset(term.split())
+            size = len(term_tokens)
+            for item in items:
+                item_tokens = index.item_tokens[item]
+                overlap = len(term_tokens & item_tokens)
+                if overlap / (size + len(item_tokens) - overlap) >= threshold:
+                    found.add(term)
+                    break
+        matched = frozenset(found)
+
+        with self._lock:
+            self._matches[key] = matched
+            while len(self._matches) > self.match_cache_size:
+                self._matches.popitem(last=False)
+        return matched
+
+
+class ProfileIndex:
+    """
+    Read-only, precomputed view of a profile used by MatchCalculator, RAGEngine
+    and ProfileDeduplicator. Obtain instances through ProfileIndex.for_profile()
+    so identical profile content is only indexed once per process.
+    """
+
+    _cache: "OrderedDict[str, ProfileIndex]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    cache_size = 64
+
+    _section_cache: "OrderedDict[tuple, SectionIndex]" = OrderedDict()
+    _section_cache_lock = threading.Lock()
+    section_cache_size = 4096
+
+    def __init__(self, profile: Dict[str, Any], content_hash: str = None):
+        """
+        Build the index.
+
+        Args:
+            profile: Profile dictionary (master profile or customized CV)
+            content_hash: Precomputed hash of the profile content (computed if omitted)
+        """
+        self.content_hash = content_hash or self.hash_profile(profile)
+
+        # Matching (unions of the cached per-section token sets)
+        self.sections = self.sections_for(profile)
+        self.candidate_skills = set().union(*(section.skills for section in self.sections))
+        self.candidate_keywords = set().union(*(section.keywords for section in self.sections))
+        self.skills_index = TokenIndex(self.candidate_skills)
+        self.keywords_index = TokenIndex(self.candidate_keywords)
+
+        # Retrieval
+        self.snippets = self.build_snippets(profile)
+        self.snippet_texts = [snippet["content"].lower() for snippet in self.snippets]
+        taxonomy = get_taxonomy()
+        self.snippet_skills = [
+            frozenset(skill.lower() for skill in taxonomy.extract(snippet["content"]))
+            for snippet in self.snippets
+        ]
+
+        # Deduplication (aligned with the corresponding profile lists)
+        self.experience_keys = [self.experience_key(exp) for exp in profile.get('experience', []) or []]
+        self.education_keys = [self.education_key(edu) for edu in profile.get('education', []) or []]
+        self.project_keys = [self.project_key(proj) for proj in profile.get('projects', []) or []]
+        self.skill_keys = self.build_skill_keys(profile.get('skills', {}))
+
+    @staticmethod
+    def hash_profile(profile: Dict[str, Any]) -> str:
+        """Stable content hash of a profile (key order independent)."""
+        payload = json.dumps(profile, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(f"{PROFILE_INDEX_VERSION}:{payload}".encode('utf-8')).hexdigest()
+
+    @classmethod
+    def for_profile(cls, profile: Dict[str, Any]) -> "ProfileIndex":
+        """
+        Return the cached index for this profile content, building it on first use.
+
+        Args:
+            profile: Profile dictionary
+
+        Returns:
+            Shared ProfileIndex (treat as read-only)
+        """
+        content_hash = cls.hash_profile(profile)
+        with cls._cache_lock:
+            index = cls._cache.get(content_hash)
+            if index is not None:
+                cls._cache.move_to_end(content_hash)
+                return index
+
+        # Build outside the lock; a concurrent duplicate build is harmless
+        index = cls(profile, content_hash)
+        with cls._cache_lock:
+            cls._cache[content_hash] = index
+            while len(cls._cache) > cls.cache_size:
+                cls._cache.popitem(last=False)
+        return index
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached indexes."""
+        with cls._cache_lock:
+            cls._cache.clear()
+        with cls._section_cache_lock:
+            cls._section_cache.clear()
+
+    @staticmethod
+    def _role_items(exp: Dict[str, Any]) -> List[str]:
+        """Responsibilities and achievements of a role (tolerates nulls)."""
+        return (exp.get('responsibilities') or []) + (exp.get('achievements') or [])
+
+    @staticmethod
+    def _section_entries(profile: Dict[str, Any]) -> List[Tuple[str, Any]]:
+        """(kind, content) of every section that contributes skills or keywords."""
+        entries: List[Tuple[str, Any]] = [
+            ('summary', profile.get('summary', '') or ''),
+            ('skills', profile.get('skills', {})),
+        ]
+        for exp in profile.get('experience', []) or []:
+            entries.append(('experience', ProfileIndex._role_items(exp)))
+        return entries
+
+    @staticmethod
+    def section_terms(kind: str, content: Any) -> Tuple[Set[str], Set[str]]:
+        """
+        (skills, keywords) contributed by one section.
+
+        Args:
+            kind: 'summary', 'skills' or 'experience'
+            content: Summary text, skills dict/list, or a role's responsibilities + achievements
+        """
+        skills_set: Set[str] = set()
+        keywords: Set[str] = set()
+        taxonomy = get_taxonomy()
+
+        if kind == 'skills':
+            # Skills section (aliases mapped to their canonical skill)
+            if isinstance(content, dict):
+                for category, skill_list in content.items():
+                    if isinstance(skill_list, list):
+                        skills_set.update(taxonomy.normalize(skill) for skill in skill_list)
+            elif isinstance(content, list):
+                skills_set.update(taxonomy.normalize(skill) for skill in content)
+
+        elif kind == 'summary':
+            keywords.update(word.lower() for word in content.split() if len(word) > 4)
+            keywords.update(skill.lower() for skill in taxonomy.extract(content))
+
+        elif kind == 'experience':
+            for resp in content:
+                # Extract potential skills (simple keyword extraction)
+                words = CAPITALIZED_PHRASE.findall(resp)
+                skills_set.update(taxonomy.normalize(word) for word in words if len(word) > 3)
+                # Known skills, including lower-case and abbreviated mentions ("k8s")
+                known = [skill.lower() for skill in taxonomy.extract(resp)]
+                skills_set.update(known)
+                keywords.update(known)
+                keywords.update(word.lower() for word in resp.split() if len(word) > 4)
+
+        return skills_set, keywords
+
+    @staticmethod
+    def _section_key(kind: str, content: Any) -> tuple:
+        """Cache key for a section; summaries and bullet lists are keyed by their strings directly."""
+        if kind == 'summary':
+            return (kind, content)
+        if kind == 'experience':
+            return (kind,) + tuple(content)
+        return (kind, json.dumps(content, sort_keys=True, separators=(',', ':'), default=str))
+
+    @classmethod
+    def sections_for(cls, profile: Dict[str, Any]) -> List[SectionIndex]:
+        """
+        Cached SectionIndex for every section of a profile. Sections are keyed by
+        content, so a customized CV reuses the entries it shares with the master profile.
+
+        Args:
+            profile: Profile dictionary
+
+        Returns:
+            Shared SectionIndex objects (treat as read-only)
+        """
+        sections = []
+        for kind, content in cls._section_entries(profile):
+            key = cls._section_key(kind, content)
+            with cls._section_cache_lock:
+                section = cls._section_cache.get(key)
+                if section is not None:
+                    cls._section_cache.move_to_end(key)
+            if section is None:
+                section = SectionIndex(*cls.section_terms(kind, content))
+                with cls._section_cache_lock:
+                    cls._section_cache[key] = section
+                    while len(cls._section_cache) > cls.section_cache_size:
+                        cls._section_cache.popitem(last=False)
+            sections.append(section)
+        return sections
+
+    @staticmethod
+    def extract_candidate_skills(profile: Dict[str, Any]) -> Set[str]:
+        """Extract all skills from candidate profile."""
+        skills_set = set()
+        for kind, content in ProfileIndex._section_entries(profile):
+            skills_set.update(ProfileIndex.section_terms(kind, content)[0])
+        return skills_set
+
+    @staticmethod
+    def extract_keywords(profile: Dict[str, Any]) -> Set[str]:
+        """Extract keywords from profile text."""
+        keywords = set()
+        for kind, content in ProfileIndex._section_entries(profile):
+            keywords.update(ProfileIndex.section_terms(kind, content)[1])
+        return keywords
+
+    @staticmethod
+    def build_snippets(profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Break the profile into discrete experience/project snippets for retrieval."""
+        snippets = []
+
+        # 1. Standardize Experience Snippets
+        for role in profile.get('experience', []) or []:
+            company = role.get('company', 'Unknown')
+            title = role.get('title', 'Position')
+
+            # Create a snippet for each achievement to allow granular retrieval
+            for ach in role.get('achievements', role.get('responsibilities', [])) or []:
+                snippets.append({
+                    "content": ach,
+                    "metadata": {
+                        "type": "experience",
+                        "company": company,
+                        "title": title,
+                        "dates": role.get('dates', '')
+                    }
+                })
+
+        # 2. Project Snippets
+        for project in profile.get('projects', []) or []:
+            snippets.append({
+                "content": f"Project {project.get('name')}: {project.get('description')}",
+                "metadata": {"type": "project", "name": project.get('name')}
+            })
+
+        return snippets
+
+    @staticmethod
+    def experience_key(exp: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Unique key from company + title + dates."""
+        return (
+            (exp.get('company') or '').lower().strip(),
+            (exp.get('title') or '').lower().strip(),
+            (exp.get('dates') or '').strip()
+        )
+
+    @staticmethod
+    def education_key(edu: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Unique key from school + degree + dates."""
+        return (
+            (edu.get('school') or '').lower().strip(),
+            (edu.get('degree') or '').lower().strip(),
+            (edu.get('dates') or '').strip()
+        )
+
+    @staticmethod
+    def build_skill_keys(skills: Any) -> Dict[str, List[str]]:
+        """Normalized skill names per category (categorized skills only)."""
+        if not isinstance(skills, dict):
+            return {}
+        return {
+            category: [skill.lower().strip() for skill in skill_list]
+            for category, skill_list in skills.items()
+            if isinstance(skill_list, list)
+        }
+
+    @staticmethod
+    def project_key(proj: Dict[str, Any]) -> str:
+        """Unique key from project name."""
+        return (proj.get('name') or '').lower().strip()
@@ -5,7 +5,10 @@ Role: Store and retrieve relevant "experience snippets" to improve LLM precision
 
 import json
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from utils.profile_index import ProfileIndex
+from utils.skill_taxonomy import get_taxonomy
 
 class RAGEngine:
     """
@@ -13,63 +16,73 @@ class RAGEngine:
     searchable snippets and retrieves the most relevant ones.
     """
 
-    def __init__(self, profile_path: str = "data/master_profile.json"):
+    def __init__(self, profile_path: str = "data/master_profile.json", profile: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            profile_path: Profile JSON to load when no profile dict is given
+            profile: Already-loaded profile (skips reading profile_path)
+        """
         self.profile_path = profile_path
+        self.index: Optional[ProfileIndex] = None
         self.snippets = []
-        self._initialize_snippets()
+        self._initialize_snippets(profile)
 
-    def _initialize_snippets(self):
-        """Parse the profile into discrete experience snippets."""
+    def _initialize_snippets(self, profile: Optional[Dict[str, Any]] = None):
+        """Parse the profile into discrete experience snippets (shared via ProfileIndex)."""
         try:
-            with open(self.profile_path, 'r', encoding='utf-8') as f:
-                profile = json.load(f)
-            
-            # 1. Standardize Experience Snippets
-            for role in profile.get('experience', []):
-                company = role.get('company', 'Unknown')
-                title = role.get('title', 'Position')
-                
-                # Create a snippet for each achievement to allow granular retrieval
-                for ach in role.get('achievements', role.get('responsibilities', [])):
-                    self.snippets.append({
-                        "content": ach,
-                        "metadata": {
-                            "type": "experience",
-                            "company": company,
-                            "title": title,
-                            "dates": role.get('dates', '')
-                        }
-                    })
+            if profile is None:
+                with open(self.profile_path, 'r', encoding='utf-8') as f:
+                    profile = json.load(f)
             
-            # 2. Project Snippets
-            for project in profile.get('projects', []):
-                self.snippets.append({
-                    "content": f"Project {project.get('name')}: {project.get('description')}",
-                    "metadata": {"type": "project", "name": project.get('name')}
-                })
+            self.index = ProfileIndex.for_profile(profile)
+            self.snippets = self.index.snippets
                 
             print(f"📊 RAG: Initialized with {len(self.snippets)} experience snippets.")
             
         except Exception as e:
             print(f"⚠️ RAG Initialization failed: {e}")
 
-    def retrieve_relevant_experience(self, job_keywords: List[str], top_k: int = 15) -> List[Dict[str, Any]]:
+    def retrieve_relevant_experience(
+        self,
+        job_keywords: List[str],
+        top_k: int = 15,
+        profile: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Retrieve segments that match high-priority job keywords.
         Uses a frequency-based scoring (BM25 variant logic) for precision.
+
+        Args:
+            job_keywords: ATS keywords from the job analysis
+            top_k: Maximum number of snippets to return
+            profile: Score this profile instead of the one loaded at init
+                     (its index is cached per profile content)
         """
+        index = ProfileIndex.for_profile(profile) if profile is not None else self.index
+        if index is None:
+            return []
+
+        # Lower-case and compile each keyword once per call, not once per snippet.
+        # Known skills also carry their canonical form so aliases ("k8s") hit "Kubernetes".
+        taxonomy = get_taxonomy()
+        patterns = []
+        for kw in job_keywords:
+            kw_lower = kw.lower()
+            canonical = taxonomy.normalize(kw) if taxonomy.category(kw) else None
+            patterns.append((kw_lower, re.compile(rf'\b{re.escape(kw_lower)}\b'), canonical))
+
         scored_snippets = []
         
-        for snippet in self.snippets:
+        for snippet, content_lower, snippet_skills in zip(index.snippets, index.snippet_texts, index.snippet_skills):
             score = 0
-            content_lower = snippet['content'].lower()
             
-            for kw in job_keywords:
-                # Weighted score: exact matches in snippets are high value
-                if re.search(rf'\b{re.escape(kw.lower())}\b', content_lower):
+            for kw_lower, pattern, canonical in patterns:
+                # Weighted score: exact matches in snippets are high value.
+                # A word-boundary match implies a substring match, so check that first.
+                if canonical and canonical in snippet_skills:
                     score += 2
-                elif kw.lower() in content_lower:
-                    score += 1
+                elif kw_lower in content_lower:
+                    score += 2 if pattern.search(content_lower) else 1
             
             if score > 0:
                 scored_snippets.append((score, snippet))
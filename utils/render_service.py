@@ -0,0 +1,234 @@
+"""
+Render Service
+Role: Run CPU-bound DOCX rendering in a pool of pre-warmed worker processes, so batch runs and busy
+servers render in parallel instead of serializing behind the GIL on the request threads.
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Union
+
+from utils.document_builder import DocumentBuilder, RENDERERS, get_template
+
+# Job kinds a worker understands
+RENDER_JOBS = ("cv", "cover_letter")
+
+# Builder of the current worker process, created by _init_worker
+_worker_builder: Optional[DocumentBuilder] = None
+
+
+class RenderServiceBusy(RuntimeError):
+    """Raised when a job cannot be queued because the pool is saturated."""
+
+
+def _init_worker(renderer: str) -> None:
+    """Worker initializer: build the renderer and load its template before the first job."""
+    global _worker_builder
+    # Per-document log lines would interleave across workers; failures still reach the caller
+    sys.stdout = open(os.devnull, 'w')
+    if renderer == "ooxml":
+        from utils.ooxml_writer import OOXMLDocumentBuilder, get_package
+        _worker_builder = OOXMLDocumentBuilder()
+        get_package()
+    else:
+        _worker_builder = DocumentBuilder()
+        get_template()
+
+
+def _render_job(kind: str, payload: Dict[str, Any]) -> bytes:
+    """Render one document in a worker and return the DOCX bytes."""
+    if kind == "cv":
+        return _worker_builder.render_cv(payload["cv_data"])
+    if kind == "cover_letter":
+        return _worker_builder.render_cover_letter(payload["letter_body"], payload["profile"], payload.get("variant", 0))
+    raise ValueError(f"Unknown render job '{kind}' (expected one of {', '.join(RENDER_JOBS)})")
+
+
+def _worker_pid() -> int:
+    """Warm-up task: reports which worker ran it."""
+    return os.getpid()
+
+
+class RenderService:
+    """
+    Process pool for create_cv / create_cover_letter jobs.
+
+    Payloads are plain dicts (the same data DocumentBuilder takes) and results are DOCX
+    bytes, so nothing but JSON-like data crosses the process boundary. At most
+    max_pending jobs are queued or running; submit() waits for a slot for up to
+    `timeout` seconds and then raises RenderServiceBusy. If a worker dies and breaks
+    the pool, the next submit() replaces it with a fresh, warmed pool.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        renderer: Optional[str] = None,
+        timeout: Optional[float] = 30.0,
+        warm: bool = True
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            workers: Worker processes (default: CPU count)
+            max_pending: Jobs queued or running at once (default: 4 per worker)
+            renderer: 'docx' or 'ooxml' (default: DOCUMENT_RENDERER or 'docx')
+            timeout: Seconds submit() waits for a free slot (None waits forever, 0 fails fast)
+            warm: Start every worker and load its template now rather than on the first jobs
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.renderer = (renderer or os.getenv("DOCUMENT_RENDERER", "docx")).lower()
+        if self.renderer not in RENDERERS:
+            raise ValueError(f"Unknown document renderer '{self.renderer}' (expected one of {', '.join(RENDERERS)})")
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.pool_restarts = 0
+        self._pool_lock = threading.Lock()
+        self._pool = self._new_pool()
+        if warm:
+            self.warm()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        """Worker pool with the configured renderer."""
+        # 'spawn' keeps workers independent of the server's threads and behaves the same on every OS
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.renderer,)
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional["RenderService"]:
+        """
+        Build a service from RENDER_WORKERS and RENDER_MAX_PENDING.
+
+        Returns:
+            Configured service, or None when RENDER_WORKERS is unset or 0 (render in-process)
+        """
+        workers = int(os.getenv("RENDER_WORKERS", "0"))
+        if workers <= 0:
+            return None
+        max_pending = int(os.getenv("RENDER_MAX_PENDING", "0")) or None
+        return cls(workers=workers, max_pending=max_pending)
+
+    def warm(self) -> List[int]:
+        """
+        Start the workers (each loads its template in the initializer).
+
+        Returns:
+            PIDs of the workers that answered
+        """
+        futures = [self._pool.submit(_worker_pid) for _ in range(self.workers)]
+        return sorted({future.result() for future in futures})
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> "Future[bytes]":
+        """
+        Queue a render job.
+
+        Args:
+            kind: 'cv' ({"cv_data"}) or 'cover_letter' ({"letter_body", "profile", "variant"})
+            payload: Job data
+
+        Returns:
+            Future resolving to the DOCX bytes
+
+        Raises:
+            RenderServiceBusy: If no slot frees up within the timeout
+        """
+        if kind not in RENDER_JOBS:
+            raise ValueError(f"Unknown render job '{kind}' (expected one of {', '.join(RENDER_JOBS)})")
+        if self.timeout is None:
+            acquired = self._slots.acquire()
+        else:
+            acquired = self._slots.acquire(timeout=self.timeout)
+        if not acquired:
+            with self._lock:
+                self.rejected += 1
+            raise RenderServiceBusy(f"Render pool saturated ({self.max_pending} jobs pending)")
+
+        try:
+            pool = self._pool
+            try:
+                future = pool.submit(_render_job, kind, payload)
+            except BrokenProcessPool:
+                self._replace_pool(pool)
+                future = self._pool.submit(_render_job, kind, payload)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.submitted += 1
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Swap a broken pool for a warmed new one (once, however many submitters noticed)."""
+        with self._pool_lock:
+            if self._pool is not broken:
+                return
+            print("⚠️  Render worker died; restarting the render pool...")
+            broken.shutdown(wait=False)
+            self._pool = self._new_pool()
+            self.warm()
+            with self._lock:
+                self.pool_restarts += 1
+
+    def _job_done(self, future: Future) -> None:
+        """Free the job's slot and count the outcome."""
+        self._slots.release()
+        with self._lock:
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def render_cv(self, cv_data: Dict[str, Any]) -> bytes:
+        """Render a CV in the pool (same contract as DocumentBuilder.render_cv)."""
+        return self.submit("cv", {"cv_data": cv_data}).result()
+
+    def render_cover_letter(
+        self,
+        letter_body: Union[str, List[str]],
+        profile: Dict[str, Any],
+        variant: int = 0
+    ) -> bytes:
+        """Render a cover letter in the pool (same contract as DocumentBuilder.render_cover_letter)."""
+        return self.submit("cover_letter", {"letter_body": letter_body, "profile": profile, "variant": variant}).result()
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counters for metrics endpoints."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "renderer": self.renderer,
+                "max_pending": self.max_pending,
+                "pending": self.submitted - self.completed - self.failed,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "pool_restarts": self.pool_restarts,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes."""
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self) -> "RenderService":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
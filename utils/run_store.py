@@ -0,0 +1,246 @@
+"""
+Run Store
+Role: Persist the intermediate results of every application run (job analysis, customized CV, cover
+letters, match data) keyed by run ID, so documents can be re-rendered with other layout options or
+formats in milliseconds instead of re-running the LLM pipeline.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from utils.document_builder import DocumentBuilder
+
+RUN_RECORD_VERSION = 1
+
+# Documents a run can be re-rendered into
+RUN_DOCUMENTS = ("cv", "cover_letter")
+
+_RUN_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Retention defaults: records hold the full candidate profile, so they do not live forever
+DEFAULT_MAX_RUNS = 200
+DEFAULT_RUN_TTL_SECONDS = 7 * 24 * 3600
+
+
+def new_run_id() -> str:
+    """Random ID for a new run."""
+    return uuid.uuid4().hex[:12]
+
+
+class RunStore:
+    """
+    One JSON file per run in a directory.
+
+    Records are written atomically, so a concurrent reader sees either the previous
+    record or the complete new one. Runs older than ttl_seconds are no longer
+    loaded, and every save deletes expired runs and the oldest ones beyond max_runs.
+    """
+
+    def __init__(
+        self,
+        directory: str = "output/runs",
+        max_runs: int = DEFAULT_MAX_RUNS,
+        ttl_seconds: float = DEFAULT_RUN_TTL_SECONDS
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Where run records are written
+            max_runs: Runs kept on disk (0 = no limit)
+            ttl_seconds: Age after which a run is deleted (0 = never)
+        """
+        if max_runs < 0 or ttl_seconds < 0:
+            raise ValueError("max_runs and ttl_seconds must not be negative")
+        self.directory = directory
+        self.max_runs = max_runs
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls, default_directory: Optional[str] = None) -> Optional["RunStore"]:
+        """
+        Build a store from RUN_STORE_DIR, RUN_STORE_MAX_RUNS and RUN_STORE_TTL_SECONDS.
+
+        Args:
+            default_directory: Directory used when RUN_STORE_DIR is unset (the CLI passes
+                               output/runs; the servers keep runs only when it is set)
+
+        Returns:
+            Configured store, or None when no directory is configured
+        """
+        directory = os.getenv("RUN_STORE_DIR", default_directory or "")
+        if not directory:
+            return None
+        return cls(
+            directory,
+            max_runs=int(os.getenv("RUN_STORE_MAX_RUNS", str(DEFAULT_MAX_RUNS))),
+            ttl_seconds=float(os.getenv("RUN_STORE_TTL_SECONDS", str(DEFAULT_RUN_TTL_SECONDS)))
+        )
+
+    def _path(self, run_id: str) -> str:
+        """Record file of a run (rejects IDs that could escape the directory)."""
+        if not _RUN_ID.match(run_id):
+            raise ValueError(f"Invalid run ID '{run_id}'")
+        return os.path.join(self.directory, f"{run_id}.json")
+
+    def save(
+        self,
+        run_id: str,
+        profile: Dict[str, Any],
+        analysis: Dict[str, Any],
+        customized_cv: Dict[str, Any],
+        cover_letters: List[str],
+        match: Optional[Dict[str, Any]] = None,
+        file_stems: Optional[Dict[str, str]] = None,
+        source: str = "cli"
+    ) -> Dict[str, Any]:
+        """
+        Persist the intermediate results of a run.
+
+        Args:
+            run_id: Run identifier (letters, digits, '-' and '_')
+            profile: Candidate profile the run used (for the document headers)
+            analysis: Job analysis
+            customized_cv: Final CV data (after deduplication / ATS optimization)
+            cover_letters: All generated cover letter variants
+            match: Match data, e.g. {"profile": ..., "cv": ...}
+            file_stems: Download names without extension, e.g. {"cv": "CV_Acme_Engineer"}
+            source: What produced the run ('cli', 'flask', 'api')
+
+        Returns:
+            The stored record
+        """
+        path = self._path(run_id)
+        role_info = analysis.get('role_info', {})
+        record = {
+            "version": RUN_RECORD_VERSION,
+            "run_id": run_id,
+            "created_at": time.time(),
+            "source": source,
+            "role_title": role_info.get('title', 'Unknown Role'),
+            "company": role_info.get('company', 'Unknown Company'),
+            "file_stems": file_stems or {"cv": f"CV_{run_id}", "cover_letter": f"CL_{run_id}"},
+            "profile": profile,
+            "analysis": analysis,
+            "customized_cv": customized_cv,
+            "cover_letters": cover_letters,
+            "match": match or {},
+        }
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self._prune()
+        return record
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Stored record of a run, or None if it does not exist, expired or is from another version."""
+        path = self._path(run_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            print(f"⚠️  Run record at {path} is corrupt; ignoring it.")
+            return None
+        if record.get("version") != RUN_RECORD_VERSION or self._expired(record.get("created_at", 0), time.time()):
+            return None
+        return record
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        """Whether a run has outlived ttl_seconds."""
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def list_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Newest runs first, without their payloads.
+
+        Returns:
+            Dicts with run_id, created_at, source, role_title, company
+        """
+        summaries = []
+        for run_id in self._run_ids_oldest_first()[::-1][:limit]:
+            record = self.load(run_id)
+            if record is not None:
+                summaries.append({key: record[key] for key in ("run_id", "created_at", "source", "role_title", "company")})
+        return summaries
+
+    def delete(self, run_id: str) -> None:
+        """Remove a run (missing runs are ignored)."""
+        try:
+            os.remove(self._path(run_id))
+        except FileNotFoundError:
+            pass
+
+    def _run_entries_oldest_first(self) -> List[Tuple[float, str]]:
+        """(last write, run ID) of every stored run, oldest first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                entries.append((os.path.getmtime(os.path.join(self.directory, name)), name[:-len(".json")]))
+            except FileNotFoundError:
+                continue
+        return sorted(entries)
+
+    def _run_ids_oldest_first(self) -> List[str]:
+        """Stored run IDs ordered by last write."""
+        return [run_id for _, run_id in self._run_entries_oldest_first()]
+
+    def _prune(self) -> None:
+        """Delete expired runs and the oldest ones beyond max_runs."""
+        now = time.time()
+        with self._lock:
+            entries = self._run_entries_oldest_first()
+            live = [run_id for written, run_id in entries if not self._expired(written, now)]
+            stale = [run_id for written, run_id in entries if self._expired(written, now)]
+            if self.max_runs:
+                stale += live[:max(0, len(live) - self.max_runs)]
+            for run_id in stale:
+                self.delete(run_id)
+
+
+def render_run(
+    record: Dict[str, Any],
+    builder: DocumentBuilder,
+    documents: Iterable[str] = RUN_DOCUMENTS,
+    fmt: str = "docx",
+    variant: int = 0
+) -> Dict[str, Tuple[str, bytes]]:
+    """
+    Render a stored run's documents again (no LLM call).
+
+    Args:
+        record: Record returned by RunStore.load()
+        builder: DocumentBuilder carrying the layout options to apply
+        documents: Any of 'cv' and 'cover_letter'
+        fmt: Output format ('docx', 'txt', 'md')
+        variant: Cover letter variant to render
+
+    Returns:
+        Document -> (download filename, document bytes)
+    """
+    documents = list(documents)
+    unknown = [document for document in documents if document not in RUN_DOCUMENTS]
+    if unknown or not documents:
+        raise ValueError(f"Documents must be any of {', '.join(RUN_DOCUMENTS)} (got {', '.join(unknown) or 'none'})")
+
+    stems = record["file_stems"]
+    rendered = {}
+    if "cv" in documents:
+        rendered["cv"] = (f"{stems['cv']}.{fmt}", builder.render_cv(record["customized_cv"], fmt=fmt))
+    if "cover_letter" in documents:
+        suffix = f"_v{variant + 1}" if variant else ""
+        data = builder.render_cover_letter(record["cover_letters"], record["profile"], variant=variant, fmt=fmt)
+        rendered["cover_letter"] = (f"{stems['cover_letter']}{suffix}.{fmt}", data)
+    return rendered
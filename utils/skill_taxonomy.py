@@ -0,0 +1,203 @@
+"""
+Skill Taxonomy
+Role: Canonicalize skill names ("JS" -> "JavaScript", "k8s" -> "Kubernetes") and extract every known
+skill from free text in one linear pass with an Aho-Corasick automaton compiled once per process.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skill_taxonomy.json"
+)
+
+
+def _normalize_text(name: str) -> str:
+    """Lower-case and collapse whitespace."""
+    return " ".join(name.lower().split())
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher: finds all occurrences of all patterns in
+    O(len(text) + matches), independent of the number of patterns.
+    """
+
+    def __init__(self, patterns: Dict[str, Any]):
+        """
+        Args:
+            patterns: Pattern string -> payload returned with each match
+        """
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[Tuple[int, Any]]] = [[]]
+
+        # 1. Trie of all patterns
+        for pattern, payload in patterns.items():
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append((len(pattern), payload))
+
+        # 2. Failure links (breadth-first), inheriting the outputs of suffix states
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (start, end, payload) for every pattern occurrence in text."""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                end = position + 1
+                for length, payload in output[state]:
+                    yield end - length, end, payload
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills with aliases and categories.
+
+    Lookups (canonicalize/normalize/category) accept any alias; extract() finds
+    skills inside free text, respecting word boundaries and preferring the
+    longest match ("spring boot" over "spring").
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        """
+        Args:
+            entries: Items with 'canonical', 'category', 'aliases' and optional
+                     'exact_only' (aliases too ambiguous to match inside free text,
+                     e.g. "go", "r") and 'cased' (names that match inside free text
+                     only when written with this capitalization, e.g. "React", "Node")
+        """
+        self.canonical_names: Dict[str, str] = {}
+        self.categories: Dict[str, str] = {}
+        # Pattern -> (canonical, exact spelling required in the text or None)
+        patterns: Dict[str, Tuple[str, Optional[str]]] = {}
+
+        for entry in entries:
+            canonical = entry["canonical"]
+            self.categories[canonical] = entry.get("category", "")
+            exact_only = {_normalize_text(alias) for alias in entry.get("exact_only", [])}
+            cased = {_normalize_text(name): name for name in entry.get("cased", [])}
+            for name in [canonical] + entry.get("aliases", []) + entry.get("exact_only", []) + entry.get("cased", []):
+                key = _normalize_text(name)
+                self.canonical_names.setdefault(key, canonical)
+                if key not in exact_only:
+                    patterns.setdefault(key, (canonical, cased.get(key)))
+
+        self.automaton = AhoCorasick(patterns)
+        # The same bullets are scanned by matching, retrieval and snippet indexing
+        self._extract_cached = lru_cache(maxsize=8192)(self._extract)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_TAXONOMY_PATH) -> "SkillTaxonomy":
+        """Load a taxonomy JSON file ({"skills": [...]}); missing files give an empty taxonomy."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            print(f"⚠️ Skill taxonomy not found at {path}; skill aliases will not be normalized.")
+            return cls([])
+        return cls(data.get("skills", []))
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def canonicalize(self, name: str) -> str:
+        """Canonical display name for a skill (unknown skills are returned stripped)."""
+        return self.canonical_names.get(_normalize_text(name), name.strip())
+
+    def normalize(self, name: str) -> str:
+        """Lower-cased canonical form used as the matching key."""
+        key = _normalize_text(name)
+        canonical = self.canonical_names.get(key)
+        return canonical.lower() if canonical else key
+
+    def category(self, name: str) -> Optional[str]:
+        """Category of a skill or alias, if known."""
+        canonical = self.canonical_names.get(_normalize_text(name))
+        return self.categories.get(canonical) if canonical else None
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Find all known skills in a text.
+
+        Args:
+            text: Free text (job description, bullet, summary...)
+
+        Returns:
+            Canonical names in order of first appearance, without duplicates
+        """
+        return list(self._extract_cached(text))
+
+    def _extract(self, text: str) -> Tuple[str, ...]:
+        lowered = text.lower()
+        size = len(lowered)
+        # Lower-casing can change the length of some characters; cased names then never match
+        same_offsets = size == len(text)
+        candidates = []
+        for start, end, (canonical, spelling) in self.automaton.iter_matches(lowered):
+            # Whole-word matches only ("java" must not match inside "javascript")
+            if start > 0 and lowered[start - 1].isalnum():
+                continue
+            if end < size and lowered[end].isalnum():
+                continue
+            # "React" is the framework, "react quickly" is not
+            if spelling is not None and (not same_offsets or text[start:end] != spelling):
+                continue
+            candidates.append((start, -(end - start), end, canonical))
+
+        # Leftmost-longest, non-overlapping
+        candidates.sort()
+        found: List[str] = []
+        seen = set()
+        covered_until = 0
+        for start, _, end, canonical in candidates:
+            if start < covered_until:
+                continue
+            covered_until = end
+            if canonical not in seen:
+                seen.add(canonical)
+                found.append(canonical)
+        return tuple(found)
+
+
+_taxonomy: Optional[SkillTaxonomy] = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Process-wide taxonomy, compiled on first use (path overridable via SKILL_TAXONOMY_PATH)."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy.from_file(os.getenv("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH))
+    return _taxonomy
@@ -0,0 +1,60 @@
+"""
+Stage Timer Utility
+Role: Measure wall-clock time per pipeline stage and report process memory for load testing.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class StageTimer:
+    """
+    Collects per-stage durations for a single pipeline run.
+
+    Usage:
+        timer = StageTimer()
+        with timer.stage("analyze"):
+            ...
+        timer.as_dict()  # {"analyze": 1.234, "total": 1.240}
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block; repeated stages accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - start)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations in seconds, plus the total since the timer was created."""
+        result = {name: round(seconds, 4) for name, seconds in self.timings.items()}
+        result["total"] = round(time.perf_counter() - self._start, 4)
+        return result
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of the current process in MB.
+
+    Returns:
+        Peak RSS, or None where the platform does not expose it
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)